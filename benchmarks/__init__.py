@@ -0,0 +1,31 @@
+"""Extraction Benchmark Suite for the TNS E-Messaging System.
+
+Measures how the billing extraction pipeline scales with the number of customer boxes
+so that extraction engines and storage changes can be compared with numbers.
+
+Modules:
+    * workbook: Synthetic TNS-layout workbook generator (marker cells, offsets,
+      red/plain location borders, merged cells)
+    * extraction: Times the extraction stages per engine and records peak memory
+    * report: Stores runs as JSON baselines and compares two runs
+
+Usage (from the repository root):
+    $ python -m benchmarks run --sizes 100 1000 10000 100000 --label current
+    $ python -m benchmarks run --sizes 100 1000 10000 --engines xml --label xml
+    $ python -m benchmarks compare baseline xml
+
+Generated workbooks are kept in benchmarks/workbooks/ (not versioned) and reused
+between runs; results are written to benchmarks/results/<label>.json. The stored
+baseline.json was recorded on the tree of the first commit (openpyxl only, extract
+as it was then) with this generator.
+"""
+
+import os
+import sys
+
+# The application modules live in scripts/ and import each other by bare name
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"
+)
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
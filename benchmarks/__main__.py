@@ -0,0 +1,62 @@
+"""Command-line entry point: python -m benchmarks {run,compare,format}."""
+
+from .extraction import ENGINES, runBenchmarks
+from .formatting import runFormatting
+from .report import compareRuns, runTable, saveRun
+from tabulate import tabulate
+import argparse
+
+
+def main():
+    """Parse arguments and run or compare benchmarks."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the extraction pipeline on synthetic TNS workbooks",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and store the results")
+    run.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000, 100000],
+        help="Numbers of customer boxes to benchmark",
+    )
+    run.add_argument(
+        "--engines",
+        nargs="+",
+        choices=ENGINES,
+        default=ENGINES,
+        help="Extraction engines to benchmark",
+    )
+    run.add_argument("--label", required=True, help="Name to store this run under")
+
+    compare = commands.add_parser("compare", help="Compare two stored runs")
+    compare.add_argument("baseline", help="Label of the reference run")
+    compare.add_argument("current", help="Label of the run to evaluate")
+
+    formatting = commands.add_parser(
+        "format", help="Micro-benchmark number formatting (locale vs locale-free)"
+    )
+    formatting.add_argument(
+        "--customers", type=int, default=10000, help="Simulated customers"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = runBenchmarks(args.sizes, args.engines)
+        print(runTable(results))
+        print(f"Results stored in {saveRun(args.label, results)}")
+
+    elif args.command == "compare":
+        print(compareRuns(args.baseline, args.current))
+
+    elif args.command == "format":
+        headers = ["Formatter", "Seconds", "µs per value"]
+        print(tabulate(runFormatting(args.customers), headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Extraction Pipeline Benchmarks.
+
+Times the stages of `main.py extract` on synthetic workbooks for each engine:
+
+    load:     envSetup() | streamSetup() | xmlSetup()
+    iterate:  iterateOnBoxes() | iterateOnRows()
+    active:   activeClients()
+    write:    savePeriod() (store + CSV append), as `extract` does, into a fresh
+              docs/results/ billing store and CSV
+
+Each (size, engine) case is run twice: once for wall time without instrumentation,
+then once under tracemalloc to record the peak traced memory of the whole pipeline
+(tracemalloc slows allocation-heavy code, so it never contributes to the timings).
+The extraction cache is bypassed because engines are called directly.
+"""
+
+from . import SCRIPTS_DIR  # noqa: F401 (puts scripts/ on sys.path)
+from .workbook import SHEET_NAME, cachedWorkbook
+from billing_store import savePeriod
+from data_extraction import envSetup, iterateOnBoxes, iterateOnRows, streamSetup
+from extracted_csv import activeClients
+from xml_extraction import xmlSetup
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+ENGINES = ["openpyxl", "stream", "xml"]
+STAGES = ["load", "iterate", "active", "write"]
+
+
+def runPipeline(sourcePath, engine):
+    """
+    Run the extraction pipeline once and time each stage.
+
+    Args:
+        sourcePath (str): Workbook to extract (absolute path)
+        engine (str): "openpyxl", "stream" or "xml"
+
+    Returns:
+        tuple[dict[str, float], int]: Seconds per stage and number of boxes
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    if engine == "openpyxl":
+        workSheet, sheetName = envSetup(sourcePath, SHEET_NAME)
+    else:
+        setup = xmlSetup if engine == "xml" else streamSetup
+        rowBuffer, boxes, sheetName = setup(sourcePath, SHEET_NAME)
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if engine == "openpyxl":
+        records = iterateOnBoxes(workSheet["A1"])
+    else:
+        records = iterateOnRows(rowBuffer, boxes)
+    timings["iterate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    active = activeClients(records)
+    timings["active"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence status prints
+        savePeriod(sheetName, active)
+    timings["write"] = time.perf_counter() - start
+
+    return timings, len(records)
+
+
+def benchmarkCase(boxes, engine):
+    """
+    Measure one workbook size with one engine.
+
+    Args:
+        boxes (int): Number of customer boxes in the synthetic workbook
+        engine (str): Extraction engine
+
+    Returns:
+        dict: {"boxes", "engine", "records", "stages", "seconds", "peakMiB"}
+    """
+    sourcePath = os.path.abspath(cachedWorkbook(boxes))
+    cwd = os.getcwd()
+
+    # The billing store and addRows() write to docs/results/ relative to the working
+    # directory
+    with tempfile.TemporaryDirectory() as workDir:
+        os.makedirs(os.path.join(workDir, "docs", "results"))
+        os.chdir(workDir)
+        try:
+            timings, records = runPipeline(sourcePath, engine)
+
+            # Start the memory pass from empty outputs, like the timed pass
+            for path in os.listdir(os.path.join("docs", "results")):
+                os.remove(os.path.join("docs", "results", path))
+            tracemalloc.start()
+            runPipeline(sourcePath, engine)
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "boxes": boxes,
+        "engine": engine,
+        "records": records,
+        "stages": {stage: round(timings[stage], 4) for stage in STAGES},
+        "seconds": round(sum(timings.values()), 4),
+        "peakMiB": round(peak / 2**20, 2),
+    }
+
+
+def runBenchmarks(sizes, engines=ENGINES):
+    """
+    Benchmark every size with every engine.
+
+    Args:
+        sizes (list[int]): Box counts (e.g. [100, 1000, 10000, 100000])
+        engines (list[str]): Engines to compare
+
+    Returns:
+        list[dict]: One benchmarkCase() result per (size, engine)
+    """
+    results = []
+    for boxes in sizes:
+        for engine in engines:
+            result = benchmarkCase(boxes, engine)
+            print(
+                f"{boxes:>7} boxes  {engine:<8} {result['seconds']:>9.3f}s "
+                f"{result['peakMiB']:>9.1f} MiB"
+            )
+            results.append(result)
+    return results
@@ -0,0 +1,103 @@
+"""Number Formatting Micro-Benchmark.
+
+Compares number_format.formatNumbers() with the previous locale-based implementation
+on a realistic mix of billing values (four numbers per customer, many repeats), cold
+(cache cleared) and warm (memo populated).
+
+The legacy implementation needs an en_GB-style locale. When en_GB.UTF-8 is not
+installed, en_US.UTF-8 (same grouping) is tried. If neither is available, only the
+new formatter is timed.
+"""
+
+from . import SCRIPTS_DIR  # noqa: F401 (puts scripts/ on sys.path)
+from number_format import formatNumbers
+import locale
+import random
+import time
+
+LEGACY_LOCALES = ["en_GB.UTF-8", "en_US.UTF-8"]
+
+
+def legacyFormatNumbers(num, localeName="en_GB.UTF-8"):
+    """The pre-number_format implementation, kept for comparison."""
+    locale.setlocale(locale.LC_ALL, localeName)
+    if isinstance(num, float):
+        return locale.format_string("%.1f", num, grouping=True)
+    else:
+        return locale.format_string("%d", num, grouping=True)
+
+
+def legacyLocale():
+    """First installed locale the legacy formatter can use, or None."""
+    for localeName in LEGACY_LOCALES:
+        try:
+            locale.setlocale(locale.LC_ALL, localeName)
+            return localeName
+        except locale.Error:
+            continue
+    return None
+
+
+def billingValues(customers, seed=7):
+    """
+    Generate the values formatted for a run of customers.
+
+    Args:
+        customers (int): Number of customers
+        seed (int): Random seed
+
+    Returns:
+        list[int | float]: Liters (float) plus net, adjustments and final (int)
+            for every customer
+    """
+    rng = random.Random(seed)
+    values = []
+    for _ in range(customers):
+        liters = round(rng.uniform(0, 40000), 1)
+        net = rng.choice([5000, 7500, 10000]) + rng.randrange(0, 20000, 100)
+        adjustments = rng.choice([0, 0, 0, -1500, 2500, rng.randrange(-5000, 5000)])
+        values.extend([liters, net, adjustments, net + adjustments])
+    return values
+
+
+def timeFormatter(formatter, values):
+    """Seconds to format every value once."""
+    start = time.perf_counter()
+    for value in values:
+        formatter(value)
+    return time.perf_counter() - start
+
+
+def runFormatting(customers=10000):
+    """
+    Time legacy and locale-free formatting and check that their outputs match.
+
+    Args:
+        customers (int): Number of simulated customers (4 values each)
+
+    Returns:
+        list[list]: Rows of [implementation, seconds, microseconds per value]
+    """
+    values = billingValues(customers)
+    rows = []
+
+    localeName = legacyLocale()
+    if localeName is not None:
+        legacy = [legacyFormatNumbers(value, localeName) for value in values]
+        mismatches = sum(
+            1 for value, text in zip(values, legacy) if formatNumbers(value) != text
+        )
+        print(f"Output mismatches against {localeName}: {mismatches}")
+        seconds = timeFormatter(lambda v: legacyFormatNumbers(v, localeName), values)
+        rows.append([f"locale ({localeName})", seconds])
+    else:
+        print("No en_GB/en_US locale installed: legacy formatter skipped")
+
+    formatNumbers.cache_clear()
+    rows.append(["number_format (cold)", timeFormatter(formatNumbers, values)])
+    rows.append(["number_format (warm)", timeFormatter(formatNumbers, values)])
+
+    return [
+        [name, round(seconds, 4), round(seconds / len(values) * 1e6, 3)]
+        for name, seconds in rows
+    ]
@@ -0,0 +1,132 @@
+"""Benchmark Result Storage and Comparison.
+
+Runs are stored as JSON under benchmarks/results/<label>.json:
+
+    {"label": "baseline", "created": "2026-01-30T10:00:00", "python": "3.12.1",
+     "results": [{"boxes": 1000, "engine": "xml", "stages": {...}, "seconds": 0.41,
+                  "peakMiB": 3.6, ...}, ...]}
+
+compareRuns() lines up cases present in both runs by (boxes, engine) and reports
+time and memory side by side with the speed-up and memory ratio. A baseline that
+measured a single engine (baseline.json: the original openpyxl pipeline) is the
+reference for every engine of the other run.
+"""
+
+from datetime import datetime
+from tabulate import tabulate
+import json
+import os
+import platform
+
+RESULTS_DIR = "benchmarks/results"
+
+
+def saveRun(label, results, directory=RESULTS_DIR):
+    """
+    Store benchmark results as a named run.
+
+    Args:
+        label (str): Run name, used as the file name
+        results (list[dict]): Output of a benchmark runner
+        directory (str): Results directory
+
+    Returns:
+        str: Path of the written JSON file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{label}.json")
+    run = {
+        "label": label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(path, "w") as runFile:
+        json.dump(run, runFile, indent=4)
+    return path
+
+
+def loadRun(label, directory=RESULTS_DIR):
+    """
+    Load a stored run by label.
+
+    Args:
+        label (str): Run name
+        directory (str): Results directory
+
+    Returns:
+        dict: Run in the saveRun() layout
+    """
+    with open(os.path.join(directory, f"{label}.json"), "r") as runFile:
+        return json.load(runFile)
+
+
+def compareRuns(baselineLabel, currentLabel, directory=RESULTS_DIR):
+    """
+    Build a comparison table between two stored runs.
+
+    Args:
+        baselineLabel (str): Reference run
+        currentLabel (str): Run being evaluated
+        directory (str): Results directory
+
+    Returns:
+        str: Grid table; speed-up > 1 and memory ratio < 1 mean the current
+            run is better
+    """
+    baseline = {
+        (case["boxes"], case["engine"]): case
+        for case in loadRun(baselineLabel, directory)["results"]
+    }
+    engines = {engine for _boxes, engine in baseline}
+    rows = []
+    for case in loadRun(currentLabel, directory)["results"]:
+        engine = next(iter(engines)) if len(engines) == 1 else case["engine"]
+        before = baseline.get((case["boxes"], engine))
+        if before is None:
+            continue
+        rows.append(
+            [
+                case["boxes"],
+                case["engine"],
+                before["seconds"],
+                case["seconds"],
+                round(before["seconds"] / case["seconds"], 2) if case["seconds"] else "-",
+                before["peakMiB"],
+                case["peakMiB"],
+                round(case["peakMiB"] / before["peakMiB"], 2) if before["peakMiB"] else "-",
+            ]
+        )
+
+    headers = [
+        "Boxes",
+        "Engine",
+        f"{baselineLabel} s",
+        f"{currentLabel} s",
+        "Speed-up",
+        f"{baselineLabel} MiB",
+        f"{currentLabel} MiB",
+        "Memory ratio",
+    ]
+    return tabulate(rows, headers, tablefmt="grid")
+
+
+def runTable(results):
+    """
+    Format the stage timings of a single run.
+
+    Args:
+        results (list[dict]): Output of a benchmark runner
+
+    Returns:
+        str: Grid table with one row per (size, engine)
+    """
+    stages = list(results[0]["stages"]) if results else []
+    rows = [
+        [case["boxes"], case["engine"], case["records"]]
+        + [case["stages"][stage] for stage in stages]
+        + [case["seconds"], case["peakMiB"]]
+        for case in results
+    ]
+    headers = ["Boxes", "Engine", "Records"] + [f"{s} s" for s in stages] + ["Total s", "Peak MiB"]
+    return tabulate(rows, headers, tablefmt="grid")
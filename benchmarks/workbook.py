@@ -0,0 +1,118 @@
+"""Synthetic TNS-Layout Workbook Generator.
+
+Builds workbooks that follow the customer box layout parsed by data_extraction:
+
+    Row +0  | colour cell (top border red = Chanika) | contact | . | comm app
+    Row +1  | "Name/Tel:" marker | customer name | . | fallback contact
+    Row +2  | . . . . reading date
+    Row +3  | merged label across the first three columns
+    Row +5  | . . . . liters used
+    Row +6  | . . . . net charge
+    Row +7  | . . . . adjustments
+    Row +11 | . final bill
+
+Boxes are laid out in bands of BOX_COLUMNS boxes side by side (6 columns apart, 12
+rows tall). Rows are streamed with a write-only workbook so 100k-box workbooks can be
+generated without holding every cell in memory. Values are drawn from a seeded RNG,
+so the same size always produces the same workbook.
+"""
+
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Side
+from openpyxl.worksheet.cell_range import CellRange
+import os
+import random
+
+BOX_COLUMNS = 3
+BOX_WIDTH = 6
+BOX_HEIGHT = 12
+SHEET_NAME = "January, 2026"
+
+
+def generateWorkbook(path, boxes, sheetName=SHEET_NAME, seed=0):
+    """
+    Write a workbook containing a given number of customer boxes.
+
+    Args:
+        path (str): Destination .xlsx path
+        boxes (int): Number of customer boxes to generate
+        sheetName (str): Worksheet title
+        seed (int): RNG seed for reproducible content
+
+    Returns:
+        str: The path written
+    """
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    workSheet = workbook.create_sheet(sheetName)
+
+    chanika = Border(top=Side(style="thin", color="FFC00000"))
+    lumo = Border(top=Side(style="thin", color="FF000000"))
+    width = BOX_COLUMNS * BOX_WIDTH
+
+    for band in range((boxes + BOX_COLUMNS - 1) // BOX_COLUMNS):
+
+        rows = [[None] * width for _ in range(BOX_HEIGHT)]
+        first = band * BOX_COLUMNS
+
+        for box in range(first, min(first + BOX_COLUMNS, boxes)):
+
+            col = (box - first) * BOX_WIDTH
+            hasContact = rng.random() < 0.85
+
+            colour = WriteOnlyCell(workSheet)
+            colour.border = chanika if rng.random() < 0.4 else lumo
+            rows[0][col] = colour
+            rows[0][col + 1] = f"07{rng.randint(10000000, 99999999)}" if hasContact else None
+            rows[0][col + 3] = "WhatsApp" if rng.random() < 0.3 else None
+
+            rows[1][col] = "Name/Tel:"
+            rows[1][col + 1] = f"Customer {box}" if rng.random() < 0.97 else None
+            if not hasContact:
+                rows[1][col + 3] = f"06{rng.randint(10000000, 99999999)}"
+
+            rows[2][col + 4] = datetime(2026, 1, rng.randint(1, 28))
+            rows[3][col] = "Readings"
+            rows[5][col + 4] = round(rng.uniform(0, 20000), rng.choice([0, 1]))
+            rows[6][col + 4] = rng.randint(0, 50000)
+            rows[7][col + 4] = rng.choice([rng.randint(-5000, 5000), None])
+            rows[11][col + 1] = rng.randint(0, 60000)
+
+            # Ranges never overlap, so skip MultiCellRange.add()'s linear overlap
+            # scan (quadratic over a 100k-box sheet)
+            top = band * BOX_HEIGHT + 4  # 1-based row of the merged label
+            workSheet.merged_cells.ranges.add(
+                CellRange(f"{_letter(col)}{top}:{_letter(col + 2)}{top}")
+            )
+
+        for row in rows:
+            workSheet.append(row)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def _letter(colIdx):
+    """Column letter of a 0-based column index (boxes never exceed column Z)."""
+    return chr(65 + colIdx)
+
+
+def cachedWorkbook(boxes, directory="benchmarks/workbooks"):
+    """
+    Return the path of a generated workbook, creating it on first use.
+
+    Args:
+        boxes (int): Number of customer boxes
+        directory (str): Where generated workbooks are kept
+
+    Returns:
+        str: Path to benchmarks/workbooks/tns_<boxes>.xlsx
+    """
+    path = os.path.join(directory, f"tns_{boxes}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating {boxes} boxes -> {path}")
+        generateWorkbook(path, boxes)
+    return path
@@ -0,0 +1,358 @@
+"""Concurrent SMS Sender with Token-Bucket Rate Limiting.
+
+The gateway and the carriers limit how fast one device may submit SMS. The original
+sender waited for each response and then slept one second, so throughput stayed below
+one message per second no matter what the gateway allowed. AsyncSender submits
+several messages at once and spaces their submissions with a token bucket. The
+configured rate is the real send rate, not a delay added on top of request latency.
+
+    send(message, recipients) --> wait for a free slot (concurrency)
+                              --> wait for a token (rate, burst)
+                              --> TextBeeClient.sendSms() on a worker thread
+
+Token Bucket:
+    The bucket holds up to burst tokens and refills at rate tokens per second. Every
+    recipient takes one token. With the defaults (rate=1, burst=1) messages start at
+    least one second apart, the same carrier-spam protection the old time.sleep(1)
+    gave, but a slow response no longer delays the next message. A request with more
+    recipients than the bucket holds waits for a full bucket and leaves it in debt,
+    so the next request waits until the extra recipients are paid for.
+
+Concurrency:
+    At most concurrency requests are open at a time. Requests run on threads over the
+    client's pooled session (requests is blocking), so the event loop only schedules
+    them. Results are consumed by the caller in submission order (see
+    main.sendQueue()), which keeps sent.json and the run checkpoint in queue order.
+
+Recipient Batching:
+    TextBee takes a recipients array. groupRecipients() merges queued messages with
+    an identical body (reminders, announcements) into one request per
+    RECIPIENT_BATCH recipients. Every customer of the request is recorded with the
+    shared smsBatchId, and delivery picks that customer's recipient out of the batch
+    (textbee.recipientMessage()). Personalised bills keep one request each. The rate
+    limit counts recipients, not requests: a 50-recipient request spends 50 tokens,
+    so batching saves requests but never sends faster than the configured rate.
+
+Adaptive Rate (AIMD):
+    AdaptiveRate tunes the bucket's rate between minRate and maxRate from the
+    gateway's answers. maxRate defaults to the starting rate, so by default the
+    sender only backs off and recovers; probing above the configured rate must be
+    asked for (`send --max-rate`), because a carrier's spam limit is usually only
+    visible once numbers are blocked:
+    * additive increase: every probeEvery healthy responses add rateStep msg/s
+    * multiplicative decrease: a 429 or 5xx halves the rate (backoffFactor) and a
+      response slower than latencyTarget cuts it by latencyFactor. Responses to
+      requests started before the last decrease belong to the same congestion
+      episode and do not cut the rate again.
+    * Retry-After: the bucket issues no tokens until the announced time
+    Throttled requests (429/5xx) are resubmitted by the caller's retry queue (see
+    retry_queue), so a rate-limit answer slows the run down instead of ending it.
+    The end-of-run summary() reports the final rate, backoff events and effective
+    throughput.
+"""
+
+from textbee import retryAfterSeconds
+import asyncio
+import requests
+import time
+
+SEND_RATE = 1.0  # Messages per second (sustained)
+SEND_BURST = 1  # Messages that may start back-to-back after an idle period
+SEND_CONCURRENCY = 4  # Requests open at the same time
+RECIPIENT_BATCH = 50  # Recipients per request for messages with identical bodies
+
+MIN_RATE = 0.2  # Lowest rate the controller backs off to (msg/s)
+RATE_STEP = 0.25  # Additive increase per probe (msg/s)
+PROBE_EVERY = 10  # Healthy responses between rate increases
+BACKOFF_FACTOR = 0.5  # Rate multiplier on 429/5xx
+LATENCY_FACTOR = 0.8  # Rate multiplier on a slow response
+LATENCY_TARGET = 3.0  # Seconds; slower responses count as congestion
+
+
+class TokenBucket:
+    """Asynchronous token bucket: rate tokens per second, at most burst stored."""
+
+    def __init__(self, rate=SEND_RATE, burst=SEND_BURST):
+        """
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity (starts full)
+
+        Raises:
+            ValueError: If rate is not positive or burst is below 1
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid token bucket rate={rate}, burst={burst}")
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.pausedUntil = 0.0  # Monotonic time before which no token is issued
+        self.lock = asyncio.Lock()  # Waiters are served first come, first served
+
+    def refill(self):
+        """Add the tokens earned since the last update (capped at burst)."""
+        now = time.monotonic()
+        earning = max(self.updated, self.pausedUntil)  # Nothing is earned while paused
+        if now > earning:
+            self.tokens = min(self.burst, self.tokens + (now - earning) * self.rate)
+        self.updated = now
+
+    def setRate(self, rate):
+        """Change the refill rate; tokens earned so far keep the old rate."""
+        self.refill()
+        self.rate = rate
+
+    def pause(self, seconds):
+        """
+        Issue no tokens for the next seconds (e.g. a gateway Retry-After).
+
+        Args:
+            seconds (float): Pause length
+
+        Returns:
+            None: The bucket keeps at most one token, so a single request may go
+                out when the pause ends but no burst follows it
+        """
+        self.refill()
+        self.tokens = min(self.tokens, 1.0)
+        self.pausedUntil = max(self.pausedUntil, time.monotonic() + seconds)
+
+    async def acquire(self, tokens=1):
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens (int): Tokens to take (one per recipient). More than burst waits
+                for a full bucket and leaves the bucket in debt.
+
+        Returns:
+            None
+        """
+        need = min(tokens, self.burst)
+        async with self.lock:
+            while True:
+                self.refill()
+                wait = self.pausedUntil - time.monotonic()
+                if wait <= 0 and self.tokens >= need:
+                    break
+                await asyncio.sleep(max(wait, (need - self.tokens) / self.rate))
+            self.tokens -= tokens
+
+
+class AdaptiveRate:
+    """AIMD controller for a TokenBucket's rate, driven by gateway responses."""
+
+    def __init__(
+        self,
+        bucket,
+        minRate=MIN_RATE,
+        maxRate=None,
+        rateStep=RATE_STEP,
+        probeEvery=PROBE_EVERY,
+        backoffFactor=BACKOFF_FACTOR,
+        latencyFactor=LATENCY_FACTOR,
+        latencyTarget=LATENCY_TARGET,
+    ):
+        """
+        Args:
+            bucket (TokenBucket): Bucket whose rate is controlled (its current
+                rate is the starting rate)
+            minRate (float): Lower rate bound (msg/s)
+            maxRate (float | None): Upper rate bound (msg/s); None keeps the
+                starting rate, so the controller backs off and recovers but never
+                sends faster than configured
+            rateStep (float): Additive increase per probe (msg/s)
+            probeEvery (int): Healthy responses between increases
+            backoffFactor (float): Rate multiplier on 429/5xx
+            latencyFactor (float): Rate multiplier on a slow response
+            latencyTarget (float): Response time (s) above which the gateway
+                counts as congested
+        """
+        self.bucket = bucket
+        self.minRate = min(minRate, bucket.rate)
+        self.maxRate = bucket.rate if maxRate is None else max(maxRate, bucket.rate)
+        self.rateStep = rateStep
+        self.probeEvery = probeEvery
+        self.backoffFactor = backoffFactor
+        self.latencyFactor = latencyFactor
+        self.latencyTarget = latencyTarget
+
+        self.startRate = self.peakRate = bucket.rate
+        self.healthyStreak = 0
+        self.lastDecrease = float("-inf")  # Monotonic time of the last cut
+        self.backoffs = 0  # Rate cuts
+        self.throttles = 0  # 429/5xx answers
+        self.pauses = 0  # Retry-After pauses honoured
+
+    def healthy(self, startedAt, latency):
+        """
+        Account a successful response; probe upward after a healthy streak.
+
+        Args:
+            startedAt (float): Monotonic time the request was submitted
+            latency (float): Seconds until the response arrived
+
+        Returns:
+            None
+        """
+        if latency > self.latencyTarget:
+            self.decrease(startedAt, self.latencyFactor)
+            return
+
+        self.healthyStreak += 1
+        if self.healthyStreak >= self.probeEvery:
+            self.healthyStreak = 0
+            self.bucket.setRate(min(self.maxRate, self.bucket.rate + self.rateStep))
+            self.peakRate = max(self.peakRate, self.bucket.rate)
+
+    def throttled(self, startedAt, retryAfter=None):
+        """
+        Account a 429/5xx answer: back off and honour Retry-After.
+
+        Args:
+            startedAt (float): Monotonic time the request was submitted
+            retryAfter (float | None): Seconds announced by the gateway
+
+        Returns:
+            None
+        """
+        self.throttles += 1
+        if retryAfter:
+            self.bucket.pause(retryAfter)
+            self.pauses += 1
+        self.decrease(startedAt, self.backoffFactor)
+
+    def decrease(self, startedAt, factor):
+        """Cut the rate once per congestion episode."""
+        self.healthyStreak = 0
+        if startedAt < self.lastDecrease:
+            return  # Submitted before the last cut: already reacted to
+        self.lastDecrease = time.monotonic()
+        self.bucket.setRate(max(self.minRate, self.bucket.rate * factor))
+        self.backoffs += 1
+
+
+class AsyncSender:
+    """Rate-limited, bounded-concurrency front end to a TextBeeClient."""
+
+    def __init__(
+        self,
+        client,
+        rate=SEND_RATE,
+        burst=SEND_BURST,
+        concurrency=SEND_CONCURRENCY,
+        maxRate=None,
+    ):
+        """
+        Args:
+            client (TextBeeClient): Gateway client (its pool should allow at
+                least concurrency connections)
+            rate (float): Starting messages per second
+            burst (int): Messages allowed back-to-back
+            concurrency (int): Maximum requests open at once
+            maxRate (float | None): Highest rate AdaptiveRate may probe up to
+                (the starting rate when None)
+        """
+        self.client = client
+        self.bucket = TokenBucket(rate, burst)
+        self.control = AdaptiveRate(self.bucket, maxRate=maxRate)
+        self.concurrency = concurrency
+        self.slots = asyncio.Semaphore(concurrency)
+        self.requests = 0  # Requests submitted, resubmissions included
+        self.started = time.monotonic()
+
+    async def send(self, message, recipients):
+        """
+        Submit one SMS once a slot and a token per recipient are available.
+
+        Args:
+            message (str): Message body
+            recipients (list[str]): Phone numbers
+
+        Returns:
+            requests.Response: Gateway response (see TextBeeClient.sendSms())
+
+        Raises:
+            requests.HTTPError: If the gateway answers with a 4xx/5xx status (a
+                429/5xx first slows the bucket down)
+            requests.Timeout: If the gateway does not answer in time
+        """
+        async with self.slots:
+            # One token per recipient; spaces submission starts, not completions
+            await self.bucket.acquire(len(recipients))
+            startedAt = time.monotonic()
+            self.requests += 1
+            try:
+                response = await asyncio.to_thread(self.client.sendSms, message, recipients)
+
+            except requests.HTTPError as Error:
+                status = getattr(Error.response, "status_code", None)
+                if isThrottle(status):
+                    self.control.throttled(startedAt, retryAfterSeconds(Error.response))
+                    print(
+                        f"Gateway answered {status}, backing off to "
+                        f"{self.bucket.rate:.2f} msg/s"
+                    )
+                raise
+
+            except requests.Timeout:
+                self.control.decrease(startedAt, self.control.backoffFactor)
+                raise
+
+            self.control.healthy(startedAt, time.monotonic() - startedAt)
+            return response
+
+    def summary(self, messages):
+        """
+        End-of-run rate statistics.
+
+        Args:
+            messages (int): Messages accepted during the run
+
+        Returns:
+            list[list]: ["Details", "Amount"] rows for tabulate()
+        """
+        elapsed = time.monotonic() - self.started
+        return [
+            ["Messages Sent", messages],
+            ["Requests", self.requests],
+            ["Elapsed Seconds", round(elapsed, 2)],
+            ["Effective msg/s", round(messages / elapsed, 2) if elapsed else 0],
+            ["Start Rate msg/s", round(self.control.startRate, 2)],
+            ["Peak Rate msg/s", round(self.control.peakRate, 2)],
+            ["Final Rate msg/s", round(self.bucket.rate, 2)],
+            ["Throttled (429/5xx)", self.control.throttles],
+            ["Backoff Events", self.control.backoffs],
+            ["Retry-After Pauses", self.control.pauses],
+        ]
+
+
+def isThrottle(status):
+    """Whether an HTTP status asks the sender to slow down (429 or 5xx)."""
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def groupRecipients(messages, size=RECIPIENT_BATCH):
+    """
+    Group queued messages with the same body into multi-recipient requests.
+
+    Args:
+        messages (list[tuple[str, dict]]): (queue key, {"Contact", "Body", ...})
+            pairs in queue order
+        size (int): Maximum recipients per request
+
+    Returns:
+        list[list[tuple[str, dict]]]: One list per request, ordered by the first
+            message of each group. All messages of a list share the same body.
+    """
+    openGroups = {}  # body -> group of that body still taking recipients
+    groups = []
+    for name, value in messages:
+        group = openGroups.get(value["Body"])
+        if group is None or len(group) >= size:
+            group = openGroups[value["Body"]] = []
+            groups.append(group)
+        group.append((name, value))
+    return groups
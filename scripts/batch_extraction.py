@@ -0,0 +1,204 @@
+"""Batch Extraction Module for Multi-Period Rebuilds.
+
+Runs the billing extraction non-interactively over many worksheets at once, for
+example to back-fill docs/results/ after a fix or to rebuild several billing periods.
+Each worksheet is extracted in its own worker process and written to its own CSV.
+
+Workflow:
+    1. Expand the source glob into workbook paths (e.g. "docs/source/*.xlsx")
+    2. List the requested sheets of each workbook (all sheets by default)
+    3. Extract every sheet in a process pool with the selected engine
+    4. Filter active clients, store them in the billing store and append new ones to
+       docs/results/<Sheet>.csv via billing_store.savePeriod()
+    5. Print a per-sheet timing report
+
+CSV Naming:
+    A sheet's CSV is named after the sheet, as in single-sheet extraction. When the
+    same sheet name occurs in more than one workbook, the workbook file name is
+    prefixed ("<Workbook> - <Sheet>") so workers never append to the same file.
+
+Engine Selection:
+    sheetRecords() is the single dispatch point for the openpyxl, stream and xml
+    engines (behind the extraction cache) and is shared with main.extractData().
+"""
+
+from billing_store import savePeriod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from data_extraction import envSetup, iterateOnBoxes, iterateOnRows, streamSetup
+from extracted_csv import activeClients
+from extraction_cache import cachedRecords
+from functools import partial
+from tabulate import tabulate
+from xml_extraction import sheetPaths, xmlSetup
+import glob
+import os
+import time
+import zipfile
+
+
+def sheetRecords(sourcePath, sheetName=None, engine="openpyxl", useCache=True):
+    """
+    Extract all billing records of one worksheet, consulting the extraction cache.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to extract. Prompted for when None.
+        engine (str): "openpyxl" (full load), "stream" (read-only row buffer)
+            or "xml" (raw sheet XML)
+        useCache (bool): Serve unchanged workbooks from the content-addressed
+            extraction cache instead of parsing them again
+
+    Returns:
+        tuple[list[CustomerRecord], str]: Extracted records and the worksheet name
+    """
+    if useCache:
+        return cachedRecords(sourcePath, sheetName, partial(engineRecords, engine=engine))
+    return engineRecords(sourcePath, sheetName, engine)
+
+
+def engineRecords(sourcePath, sheetName=None, engine="openpyxl"):
+    """
+    Extract all billing records of one worksheet with the chosen engine.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to extract. Prompted for when None.
+        engine (str): "openpyxl" (full load), "stream" (read-only row buffer)
+            or "xml" (raw sheet XML)
+
+    Returns:
+        tuple[list[CustomerRecord], str]: Extracted records and the worksheet name
+    """
+    if engine in ("stream", "xml"):
+        # Stream the worksheet once and extract boxes from the row buffer
+        setup = xmlSetup if engine == "xml" else streamSetup
+        rowBuffer, boxes, sheetName = setup(sourcePath, sheetName)
+        return iterateOnRows(rowBuffer, boxes), sheetName
+
+    # Initialize extraction context: load workbook and get target worksheet reference
+    workSheet, sheetName = envSetup(sourcePath, sheetName)
+    cell = workSheet["A1"]  # Start iteration from top-left cell
+    return iterateOnBoxes(cell), sheetName
+
+
+def extractSheet(sourcePath, sheetName, fileName, engine, useCache=True):
+    """
+    Extract one worksheet and write its active clients to CSV (worker task).
+
+    Args:
+        sourcePath (str): Workbook containing the sheet
+        sheetName (str): Worksheet to extract
+        fileName (str): CSV base name in docs/results/
+        engine (str): Extraction engine passed to sheetRecords()
+        useCache (bool): Allow serving the sheet from the extraction cache
+
+    Returns:
+        list: [workbook, sheet, csv name, boxes, active clients, seconds]
+    """
+    start = time.perf_counter()
+
+    customerInfo, _sheetName = sheetRecords(sourcePath, sheetName, engine, useCache)
+    activeInfo = activeClients(customerInfo)
+
+    savePeriod(fileName, activeInfo)
+
+    return [
+        os.path.basename(sourcePath),
+        sheetName,
+        fileName,
+        len(customerInfo),
+        len(activeInfo),
+        round(time.perf_counter() - start, 2),
+    ]
+
+
+def batchJobs(sourcePattern, sheets=None):
+    """
+    Plan the (workbook, sheet, CSV name) jobs of a batch run.
+
+    Args:
+        sourcePattern (str): Workbook path or glob pattern
+        sheets (list[str] | None): Sheet names to extract from every workbook.
+            None selects all sheets; names missing from a workbook are skipped.
+
+    Returns:
+        list[tuple[str, str, str]]: (sourcePath, sheetName, fileName) per sheet
+    """
+    plan = []
+    for sourcePath in sorted(glob.glob(sourcePattern)):
+        with zipfile.ZipFile(sourcePath) as archive:
+            available = list(sheetPaths(archive))
+        wanted = available if not sheets else [s for s in sheets if s in available]
+        plan.extend((sourcePath, sheetName) for sheetName in wanted)
+
+    # Prefix the workbook name only where sheet names collide across workbooks
+    counts = {}
+    for _sourcePath, sheetName in plan:
+        counts[sheetName] = counts.get(sheetName, 0) + 1
+
+    jobs = []
+    for sourcePath, sheetName in plan:
+        fileName = sheetName
+        if counts[sheetName] > 1:
+            stem = os.path.splitext(os.path.basename(sourcePath))[0]
+            fileName = f"{stem} - {sheetName}"
+        jobs.append((sourcePath, sheetName, fileName))
+
+    return jobs
+
+
+def batchExtract(
+    sourcePattern, sheets=None, engine="openpyxl", workers=None, useCache=True
+):
+    """
+    Extract many worksheets in parallel and report per-sheet timings.
+
+    Args:
+        sourcePattern (str): Workbook path or glob pattern (e.g. "docs/source/*.xlsx")
+        sheets (list[str] | None): Sheet names to extract (all sheets when None)
+        engine (str): Extraction engine for every sheet
+        workers (int | None): Process pool size (defaults to the CPU count)
+        useCache (bool): Serve unchanged sheets from the extraction cache
+
+    Returns:
+        None: Writes one CSV per sheet and prints the timing report
+
+    Note:
+        Worker failures follow the fail-fast convention: errorDisplay() exits the
+        worker and the SystemExit is re-raised here when its result is collected.
+    """
+    jobs = batchJobs(sourcePattern, sheets)
+    if not jobs:
+        print("Error: No matching workbook sheets found!")
+        return
+
+    start = time.perf_counter()
+    report = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(extractSheet, sourcePath, sheetName, fileName, engine, useCache)
+            for sourcePath, sheetName, fileName in jobs
+        ]
+        for future in as_completed(futures):
+            report.append(future.result())
+
+    report.sort(key=lambda row: (row[0], row[1]))
+    report.append(
+        [
+            "Total",
+            f"{len(report)} sheets",
+            "",
+            sum(row[3] for row in report),
+            sum(row[4] for row in report),
+            round(time.perf_counter() - start, 2),  # Wall time, not sum of workers
+        ]
+    )
+
+    headers = ["Workbook", "Sheet", "CSV", "Boxes", "Active", "Seconds"]
+    print(tabulate(report, headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+
+    batchExtract("docs/source/*.xlsx", engine="xml")
@@ -0,0 +1,432 @@
+"""SQLite Billing Store Module.
+
+Keeps every extracted billing period in one embedded SQLite database instead of
+rescanning per-period CSV files. Extraction writes each sheet in a single transaction,
+and display and fill query the store for the period they need.
+
+    extract/batch --savePeriod()--> docs/results/billing.db --periodRecords()--> display/fill
+                                            |
+                       importCsv() / exportCsv() bridge to docs/results/<Sheet>.csv
+
+Schema (table "billing", one row per customer per period):
+    period       Sheet/CSV name the record came from (e.g. "January, 2026")
+    date         Reading date as ISO 8601 text (CustomerRecord.pack() form)
+    name, contact, app, location, liters, net, adjustments, final
+
+Indexes:
+    * billing_period, billing_name, billing_contact, billing_location for lookups
+      within a period and across months (e.g. one customer's history)
+    * billing_record (UNIQUE over every column) makes deduplication an O(log n)
+      index probe: re-extracting a sheet inserts nothing twice
+
+CSV Bridge:
+    Billing CSVs remain the human-readable artifact. savePeriod() stores extracted
+    records and appends them to docs/results/<Sheet>.csv, deduplicated against the
+    CSV itself by its .idx index (csv_index), and then records the CSV's new size and
+    mtime so the next display or fill does not import it again. A deleted CSV is
+    rebuilt from the store (exportCsv()) before appending. Before a period is read
+    for display or fill, syncPeriod()
+    compares its CSV's size and mtime with those recorded at the last import
+    (table "sources"); a new or edited CSV replaces the period's records, so
+    corrections made in the CSV are what gets billed. Periods extracted before the
+    store existed are imported the same way on first use.
+
+Schema Version:
+    storeConnect() runs SCHEMA only when the database's PRAGMA user_version is below
+    SCHEMA_VERSION, so opening the store costs one pragma read instead of a
+    CREATE ... IF NOT EXISTS per table and index on every connection.
+
+Note:
+    Missing text fields are stored as "" (what the CSV round trip produces), because
+    SQLite treats NULLs as distinct in UNIQUE indexes and would never deduplicate them.
+"""
+
+from contextlib import closing
+from records import CustomerRecord
+from csv_index import fileStamp
+from extracted_csv import BILLING_HEADERS, addRows, fileCreation
+import csv
+import os
+import sqlite3
+
+STORE_PATH = "docs/results/billing.db"
+SCHEMA_VERSION = 2  # 1: billing table and indexes, 2: sources table
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS billing (
+    period TEXT NOT NULL,
+    date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    contact TEXT NOT NULL,
+    app TEXT NOT NULL,
+    location TEXT NOT NULL,
+    liters,
+    net INTEGER NOT NULL,
+    adjustments INTEGER NOT NULL,
+    final INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS billing_period ON billing (period);
+CREATE INDEX IF NOT EXISTS billing_name ON billing (name);
+CREATE INDEX IF NOT EXISTS billing_contact ON billing (contact);
+CREATE INDEX IF NOT EXISTS billing_location ON billing (location);
+CREATE UNIQUE INDEX IF NOT EXISTS billing_record ON billing (
+    period, date, name, contact, app, location, liters, net, adjustments, final
+);
+CREATE TABLE IF NOT EXISTS sources (
+    period TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL
+);
+"""  # liters is left untyped so int and float readings keep their CSV text form
+
+COLUMNS = "date, name, contact, app, location, liters, net, adjustments, final"
+
+
+def storeConnect(storePath=STORE_PATH):
+    """
+    Open the billing store, creating or upgrading the schema on first use.
+
+    Args:
+        storePath (str): SQLite database file
+
+    Returns:
+        sqlite3.Connection: Open connection (caller closes it)
+    """
+    os.makedirs(os.path.dirname(storePath) or ".", exist_ok=True)
+    connection = sqlite3.connect(storePath, timeout=30)  # Batch workers share the file
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version < SCHEMA_VERSION:
+        # Every statement is IF NOT EXISTS, so concurrent first connections are safe
+        connection.executescript(f"{SCHEMA}PRAGMA user_version = {SCHEMA_VERSION};")
+    return connection
+
+
+def storeValues(period, record):
+    """Row parameters for one record, with missing text fields stored as ""."""
+    return (period,) + tuple("" if value is None else value for value in record.pack())
+
+
+def storeRecords(period, records, storePath=STORE_PATH):
+    """
+    Store one period's records in a single transaction, skipping known records.
+
+    Args:
+        period (str): Billing period (sheet or CSV name)
+        records (list[CustomerRecord]): Records to store
+        storePath (str): SQLite database file
+
+    Returns:
+        list[CustomerRecord]: Records that were not already in the store
+    """
+    inserted = []
+    with closing(storeConnect(storePath)) as connection:
+        with connection:  # One transaction: all records or none
+            for record in records:
+                cursor = connection.execute(
+                    f"INSERT OR IGNORE INTO billing (period, {COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    storeValues(period, record),
+                )
+                if cursor.rowcount:
+                    inserted.append(record)
+    return inserted
+
+
+def periodRecords(period, storePath=STORE_PATH):
+    """
+    Fetch all records of one period in insertion (sheet) order.
+
+    Args:
+        period (str): Billing period
+        storePath (str): SQLite database file
+
+    Returns:
+        list[CustomerRecord]: Stored records (empty if the period is unknown)
+    """
+    with closing(storeConnect(storePath)) as connection:
+        rows = connection.execute(
+            f"SELECT {COLUMNS} FROM billing WHERE period = ? ORDER BY rowid",
+            (period,),
+        ).fetchall()
+    return [CustomerRecord.unpack(row) for row in rows]
+
+
+def iterPeriod(period, storePath=STORE_PATH, fetchSize=1000):
+    """
+    Stream one period's records in insertion order without materializing them.
+
+    Args:
+        period (str): Billing period
+        storePath (str): SQLite database file
+        fetchSize (int): Rows fetched from SQLite at a time
+
+    Yields:
+        CustomerRecord: Stored records, one at a time
+    """
+    with closing(storeConnect(storePath)) as connection:
+        cursor = connection.execute(
+            f"SELECT {COLUMNS} FROM billing WHERE period = ? ORDER BY rowid",
+            (period,),
+        )
+        while True:
+            rows = cursor.fetchmany(fetchSize)
+            if not rows:
+                break
+            for row in rows:
+                yield CustomerRecord.unpack(row)
+
+
+def periodSummary(period, storePath=STORE_PATH):
+    """
+    Aggregate one period's client counts and totals inside SQLite.
+
+    Args:
+        period (str): Billing period
+        storePath (str): SQLite database file
+
+    Returns:
+        dict: {"lumo", "chanika", "clients", "net", "adjustments", "final"}
+    """
+    with closing(storeConnect(storePath)) as connection:
+        row = connection.execute(
+            "SELECT "
+            "COUNT(CASE WHEN location = 'Lumo' THEN 1 END), "
+            "COUNT(CASE WHEN location != 'Lumo' THEN 1 END), "
+            "COUNT(*), "
+            "COALESCE(SUM(net), 0), COALESCE(SUM(adjustments), 0), "
+            "COALESCE(SUM(final), 0) "
+            "FROM billing WHERE period = ?",
+            (period,),
+        ).fetchone()
+    return dict(zip(["lumo", "chanika", "clients", "net", "adjustments", "final"], row))
+
+
+def customerHistory(name, storePath=STORE_PATH):
+    """
+    List one customer's records across all periods (uses billing_name).
+
+    Args:
+        name (str): Exact customer name
+        storePath (str): SQLite database file
+
+    Returns:
+        list[tuple[str, CustomerRecord]]: (period, record) ordered by reading date
+    """
+    with closing(storeConnect(storePath)) as connection:
+        rows = connection.execute(
+            f"SELECT period, {COLUMNS} FROM billing WHERE name = ? ORDER BY date",
+            (name,),
+        ).fetchall()
+    return [(row[0], CustomerRecord.unpack(row[1:])) for row in rows]
+
+
+def repeatedNames(period, storePath=STORE_PATH):
+    """
+    Names shared by several customers (different contacts) within one period.
+
+    Args:
+        period (str): Billing period
+        storePath (str): SQLite database file
+
+    Returns:
+        set[str]: Customer names that need the contact to tell customers apart
+    """
+    with closing(storeConnect(storePath)) as connection:
+        rows = connection.execute(
+            "SELECT name FROM billing WHERE period = ? "
+            "GROUP BY name HAVING COUNT(DISTINCT contact) > 1",
+            (period,),
+        ).fetchall()
+    return {row[0] for row in rows}
+
+
+def hasPeriod(period, storePath=STORE_PATH):
+    """Whether any record of the period is stored (uses billing_period)."""
+    with closing(storeConnect(storePath)) as connection:
+        row = connection.execute(
+            "SELECT 1 FROM billing WHERE period = ? LIMIT 1", (period,)
+        ).fetchone()
+    return row is not None
+
+
+def importCsv(csvPath, period=None, storePath=STORE_PATH):
+    """
+    Import a billing CSV into the store.
+
+    Args:
+        csvPath (str): Billing CSV with a BILLING_HEADERS header row
+        period (str | None): Period to store under (CSV file name when None)
+        storePath (str): SQLite database file
+
+    Returns:
+        int: Number of records newly stored
+    """
+    if period is None:
+        period = os.path.splitext(os.path.basename(csvPath))[0]
+
+    with open(csvPath, "r", newline="") as csvFile:
+        reader = csv.reader(csvFile)
+        next(reader)  # Discard header row
+        records = [CustomerRecord.fromRow(row) for row in reader]
+
+    return len(storeRecords(period, records, storePath))
+
+
+def exportCsv(period, csvPath, headers, storePath=STORE_PATH):
+    """
+    Write one stored period to a billing CSV, replacing the file.
+
+    Args:
+        period (str): Billing period
+        csvPath (str): Destination CSV path
+        headers (list[str]): Header row (BILLING_HEADERS)
+        storePath (str): SQLite database file
+
+    Returns:
+        int: Number of records written
+    """
+    records = periodRecords(period, storePath)
+    tempPath = f"{csvPath}.tmp"
+    with open(tempPath, "w", newline="") as csvFile:
+        writer = csv.writer(csvFile)
+        writer.writerow(headers)
+        writer.writerows(record.toRow() for record in records)
+    os.replace(tempPath, csvPath)
+    return len(records)
+
+
+def syncPeriod(period, csvPath=None, storePath=STORE_PATH):
+    """
+    Make the store's copy of a period match its billing CSV.
+
+    The CSV's size and mtime are compared with those recorded when the period was
+    last imported. When the period is missing or the CSV changed since (manual
+    corrections, an extraction appending new records), the period's records are
+    replaced by the CSV contents in one transaction. A missing CSV leaves a stored
+    period as it is.
+
+    Args:
+        period (str): Billing period
+        csvPath (str | None): The period's CSV (docs/results/<period>.csv when None)
+        storePath (str): SQLite database file
+
+    Returns:
+        int | None: Number of records imported, None when the store was current
+
+    Raises:
+        FileNotFoundError: If the period is neither stored nor available as CSV
+    """
+    csvPath = csvPath or f"docs/results/{period}.csv"
+    stamp = fileStamp(csvPath)
+    if stamp is None:
+        if hasPeriod(period, storePath):
+            return None
+        raise FileNotFoundError(f"No billing records or CSV for '{period}': {csvPath}")
+
+    with closing(storeConnect(storePath)) as connection:
+        row = connection.execute(
+            "SELECT size, mtime FROM sources WHERE period = ?", (period,)
+        ).fetchone()
+    if row == stamp:
+        return None
+
+    with open(csvPath, "r", newline="") as csvFile:
+        reader = csv.reader(csvFile)
+        next(reader)  # Discard header row
+        records = [CustomerRecord.fromRow(row) for row in reader]
+
+    with closing(storeConnect(storePath)) as connection:
+        with connection:  # Readers see either the old or the new period
+            connection.execute("DELETE FROM billing WHERE period = ?", (period,))
+            connection.executemany(
+                f"INSERT OR IGNORE INTO billing (period, {COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (storeValues(period, record) for record in records),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO sources (period, size, mtime) VALUES (?, ?, ?)",
+                (period, *stamp),
+            )
+    return len(records)
+
+
+def recordSource(period, csvPath, storePath=STORE_PATH):
+    """Mark a period's CSV, as it is on disk now, as matching the store."""
+    stamp = fileStamp(csvPath)
+    if stamp is None:
+        return
+    with closing(storeConnect(storePath)) as connection:
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sources (period, size, mtime) VALUES (?, ?, ?)",
+                (period, *stamp),
+            )
+
+
+def savePeriod(period, records, storePath=STORE_PATH):
+    """
+    Store extracted records and append them to the period's billing CSV.
+
+    Pending edits of an existing CSV are imported first (syncPeriod()), and a CSV
+    deleted since the last extraction is rebuilt from the store, so neither side
+    loses records. Every record is offered to addRows(), which skips those already
+    in the CSV; the CSV's resulting stamp is recorded so syncPeriod() does not
+    re-import the period afterwards.
+
+    Args:
+        period (str): Billing period (sheet name, CSV docs/results/<period>.csv)
+        records (list[CustomerRecord]): Active records of the sheet
+        storePath (str): SQLite database file
+
+    Returns:
+        list[CustomerRecord]: Records that were not already in the store
+    """
+    csvPath = f"docs/results/{period}.csv"
+    if fileStamp(csvPath) is not None:
+        syncPeriod(period, csvPath, storePath)
+    elif hasPeriod(period, storePath):
+        exportCsv(period, csvPath, BILLING_HEADERS, storePath)
+    else:
+        fileCreation(period, headers=BILLING_HEADERS)
+
+    stored = storeRecords(period, records, storePath)
+    addRows(period, records)  # The CSV's .idx index skips rows it already holds
+    recordSource(period, csvPath, storePath)
+    return stored
+
+
+def streamPeriod(period, csvPath=None, storePath=STORE_PATH):
+    """
+    Stream a period's records after syncing it with its CSV (see syncPeriod()).
+
+    Args:
+        period (str): Billing period
+        csvPath (str | None): The period's CSV (docs/results/<period>.csv when None)
+        storePath (str): SQLite database file
+
+    Returns:
+        Iterator[CustomerRecord]: Lazy iterPeriod() over the period
+
+    Raises:
+        FileNotFoundError: If the period is neither stored nor available as CSV
+    """
+    syncPeriod(period, csvPath, storePath)
+    return iterPeriod(period, storePath)
+
+
+def loadPeriod(period, csvPath=None, storePath=STORE_PATH):
+    """
+    Fetch a period's records after syncing it with its CSV (see syncPeriod()).
+
+    Args:
+        period (str): Billing period
+        csvPath (str | None): The period's CSV (docs/results/<period>.csv when None)
+        storePath (str): SQLite database file
+
+    Returns:
+        list[CustomerRecord]: The period's records
+
+    Raises:
+        FileNotFoundError: If the period is neither stored nor available as CSV
+    """
+    return list(streamPeriod(period, csvPath, storePath))
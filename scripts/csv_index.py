@@ -0,0 +1,156 @@
+"""Persistent Row-Digest Index for Result CSV Deduplication.
+
+addRows() must never append a record that is already in a docs/results/ CSV. Scanning
+and comparing the whole CSV on every append is O(existing x new), so each CSV gets a
+sidecar index of row digests instead and the CSV itself is never re-read:
+
+    docs/results/<Sheet>.csv       billing rows (append-only)
+    docs/results/<Sheet>.csv.idx   one digest per indexed row
+
+Index File Layout:
+    Line 1 is a fixed-width header that records which CSV state the index describes:
+
+        csv-size 00000000000000012345 mtime 00001767225600000000000
+
+    * csv-size: Byte size of the CSV when the index was last written
+    * mtime: The CSV's modification time in nanoseconds at that point
+
+    Every following line is the 16-hex-digit digest of one full CSV row.
+
+Consistency:
+    The CSV is appended first, then the new digests, then the header is rewritten in
+    place with the CSV's new size and mtime. If either differs from the CSV on disk
+    (an interrupted append, a manual edit even of the same length, a CSV written by
+    another tool), loadIndex() rebuilds the index from the CSV once.
+
+Process Cache:
+    The first loadIndex() of a CSV in a process reads its index; later calls reuse the
+    digest set kept in memory while the CSV and the index file are unchanged since
+    the last read or append. appendIndex() adds the new digests to that set, so a
+    run that appends to the same CSV many times (failed.csv during delivery) reads
+    the index once instead of once per append.
+
+Normalisation:
+    csv.writer writes None as an empty field, so None and "" digest identically and a
+    record with a missing contact still matches its own row read back from the CSV.
+"""
+
+import csv
+import hashlib
+import os
+
+HEADER_WIDTH = 20  # Digits reserved for the CSV size in the header line
+MTIME_WIDTH = 23  # Digits reserved for the CSV mtime (ns) in the header line
+
+_cache = {}  # CSV path -> (CSV stamp, index stamp, digest set)
+
+
+def fileStamp(path):
+    """(size, mtime in ns) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def rowDigest(row):
+    """
+    Digest one CSV row.
+
+    Args:
+        row (list): Row fields as written to or read from the CSV
+
+    Returns:
+        str: 16 hex digits identifying the row's content
+    """
+    text = "\x1f".join("" if field is None else str(field) for field in row)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def headerLine(csvStamp):
+    """Fixed-width header so it can be rewritten in place after each append."""
+    csvSize, csvMtime = csvStamp or (0, 0)
+    return f"csv-size {csvSize:0{HEADER_WIDTH}d} mtime {csvMtime:0{MTIME_WIDTH}d}\n"
+
+
+def rebuildIndex(filePath):
+    """
+    Rebuild a CSV's index from the CSV contents.
+
+    Args:
+        filePath (str): Path to the CSV file
+
+    Returns:
+        set[str]: Digests of every row in the CSV
+    """
+    digests = set()
+    if os.path.exists(filePath):
+        with open(filePath, "r", newline="") as csvFile:
+            for row in csv.reader(csvFile):
+                digests.add(rowDigest(row))
+
+    csvStamp = fileStamp(filePath)
+    tempPath = f"{filePath}.idx.tmp"
+    with open(tempPath, "w") as indexFile:
+        indexFile.write(headerLine(csvStamp))
+        indexFile.writelines(f"{digest}\n" for digest in digests)
+    os.replace(tempPath, f"{filePath}.idx")
+
+    _cache[filePath] = (csvStamp, fileStamp(f"{filePath}.idx"), digests)
+    return digests
+
+
+def loadIndex(filePath):
+    """
+    Load the digests of a CSV, rebuilding the index if it is missing or stale.
+
+    Args:
+        filePath (str): Path to the CSV file
+
+    Returns:
+        set[str]: Digests of every row in the CSV. The set is shared with the
+            process cache and must not be modified by the caller.
+    """
+    csvStamp = fileStamp(filePath)
+    cached = _cache.get(filePath)
+    if cached is not None and cached[:2] == (csvStamp, fileStamp(f"{filePath}.idx")):
+        return cached[2]  # Nothing changed since this process last read or appended
+
+    try:
+        with open(f"{filePath}.idx", "r") as indexFile:
+            if indexFile.readline() != headerLine(csvStamp):
+                return rebuildIndex(filePath)  # Out of sync with the CSV
+            digests = {line.rstrip("\n") for line in indexFile}
+
+    except FileNotFoundError:
+        return rebuildIndex(filePath)
+
+    _cache[filePath] = (csvStamp, fileStamp(f"{filePath}.idx"), digests)
+    return digests
+
+
+def appendIndex(filePath, digests):
+    """
+    Record digests of rows just appended to the CSV and mark the index in sync.
+
+    Args:
+        filePath (str): Path to the CSV file (already appended and closed)
+        digests (list[str]): Digests of the appended rows
+
+    Returns:
+        None: Appends to <filePath>.idx, rewrites its header and adds the digests
+            to the process cache
+    """
+    csvStamp = fileStamp(filePath)
+    with open(f"{filePath}.idx", "r+") as indexFile:
+        indexFile.seek(0, os.SEEK_END)
+        indexFile.writelines(f"{digest}\n" for digest in digests)
+        indexFile.flush()
+        indexFile.seek(0)
+        indexFile.write(headerLine(csvStamp))  # Commit point
+
+    cached = _cache.get(filePath)
+    if cached is not None:
+        cached[2].update(digests)
+        _cache[filePath] = (csvStamp, fileStamp(f"{filePath}.idx"), cached[2])
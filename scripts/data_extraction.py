@@ -6,8 +6,8 @@ is organized in a grid of structured "boxes" spanning multiple cells.
 
 Extraction Workflow:
     1. Load openpyxl workbook and locate target worksheet
-    2. Iterate through predefined grid pattern (3 columns × ~910 rows)
-    3. Identify customer boxes via "Name/Tel:" marker cells
+    2. Index every "Name/Tel:" marker cell in one pass over the used range
+    3. Visit customer boxes box column by box column
     4. Extract multi-cell data using relative offset navigation
     5. Determine service location via cell border color analysis
     6. Return structured list of billing records
@@ -20,7 +20,18 @@ Data Elements Extracted:
     * Water usage volume (liters)
     * Current charges, adjustments, and final bill amounts
 
+Extraction Engines:
+    * openpyxl (default): envSetup() + iterateOnBoxes() on a fully loaded workbook
+    * stream: streamSetup() + iterateOnRows() read the sheet once in read-only mode
+      into a compact row buffer and apply the same offsets to that buffer
+    * xml: xml_extraction.xmlSetup() parses the sheet XML straight from the .xlsx
+      zip without openpyxl and feeds the same iterateOnRows()
+
+    All engines resolve location through locationTable(), a per-workbook map from
+    cell style ID to location, instead of inspecting border objects per box.
+
 Technical Notes:
+    - Records are records.CustomerRecord objects with native field types
     - Uses openpyxl's cell offset navigation for relative positioning
     - Handles merged cells gracefully during iteration
     - Provides default values for None/missing data
@@ -30,23 +41,26 @@ Technical Notes:
 from miscallenous import *
 from datetime import datetime
 from extracted_csv import *
+from records import CustomerRecord
 import openpyxl
 
 
-def envSetup(sourcePath):
+def envSetup(sourcePath, sheetName=None):
     """
     Initialize Excel workbook environment and retrieve target worksheet.
 
-    Prompts user for exact worksheet name (case-sensitive) and loads the worksheet
-    using openpyxl with data_only=True to resolve formulas to their calculated values.
+    Prompts user for exact worksheet name (case-sensitive) unless one is given, and
+    loads the worksheet using openpyxl with data_only=True to resolve formulas to their
+    calculated values.
 
     Args:
         sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to load. Prompted for when None.
 
     Returns:
         tuple[Worksheet, str]: Two-element tuple containing:
             - workSheet: openpyxl Worksheet object for data access
-            - sheetName: User-provided worksheet name for filenaming
+            - sheetName: Worksheet name for filenaming
 
     Raises:
         openpyxl.utils.exceptions.InvalidFileException: If file is not valid Excel format
@@ -60,7 +74,8 @@ def envSetup(sourcePath):
     try:
 
         workbook = openpyxl.load_workbook(sourcePath, data_only=True)
-        sheetName = input("Exact name of the sheet: ")
+        if sheetName is None:
+            sheetName = input("Exact name of the sheet: ")
         workSheet = workbook[sheetName]
         return (
             workSheet,
@@ -71,7 +86,212 @@ def envSetup(sourcePath):
         errorDisplay(Error)
 
 
-def extractFromBox(cell):
+def colourLocation(rgb):
+    """
+    Map a box's top border colour to its service location.
+
+    Args:
+        rgb (str | None): ARGB hex colour of the colour cell's top border
+
+    Returns:
+        str: "Chanika" for red (FFC00000), "Lumo" for any other colour or none
+    """
+    # Location logic: Red border (FFC00000) indicates Chanika, absence indicates Lumo
+    return "Chanika" if rgb == "FFC00000" else "Lumo"  # Hex color code for Chanika-red
+
+
+def borderStyleLocation(border):
+    """
+    Determine service location from an openpyxl Border object.
+
+    Args:
+        border (openpyxl.styles.Border | None): Border of the box's colour cell
+
+    Returns:
+        str: "Chanika" or "Lumo" as decided by colourLocation()
+    """
+    topColor = border.top.color if border is not None and border.top is not None else None
+    return colourLocation(topColor.rgb if topColor else None)
+
+
+def borderLocation(cell):
+    """
+    Determine service location from the top border colour of a box's colour cell.
+
+    Args:
+        cell (openpyxl.cell.Cell | ReadOnlyCell | None): Cell directly above the
+            "Name/Tel:" marker. None or empty read-only cells count as unbordered.
+
+    Returns:
+        str: "Chanika" for a red (FFC00000) top border, "Lumo" otherwise
+    """
+    return borderStyleLocation(getattr(cell, "border", None))
+
+
+def locationTable(workbook):
+    """
+    Precompute service location for every cell style ID of a workbook.
+
+    Built once per loaded workbook so that per-box location detection becomes an
+    integer lookup instead of constructing StyleArray/Border proxy objects for
+    each colour cell. Style IDs are indices into the workbook's cellXfs list
+    (the "s" attribute of a <c> element), which is what read-only cells carry
+    and what the raw XML reader sees, so one table serves every engine.
+
+    Args:
+        workbook (openpyxl.Workbook): Loaded workbook (normal or read-only)
+
+    Returns:
+        list[str]: locations[styleId] -> "Chanika" or "Lumo"
+
+    Note:
+        openpyxl exposes the parsed style collections only as private attributes
+        (_borders, _cell_styles); they are read here and nowhere else.
+    """
+    borderLocations = [borderStyleLocation(border) for border in workbook._borders]
+    return [borderLocations[style.borderId] for style in workbook._cell_styles]
+
+
+def styleLocation(styleId, locations):
+    """
+    Look up a style ID in a locationTable(), treating unknown IDs as unbordered.
+
+    Args:
+        styleId (int | None): cellXfs index of the colour cell (None if no cell)
+        locations (list[str]): Table produced by locationTable()
+
+    Returns:
+        str: "Chanika" or "Lumo"
+    """
+    if styleId is None or not 0 <= styleId < len(locations):
+        return "Lumo"
+    return locations[styleId]
+
+
+def rowMarkers(values):
+    """
+    Find box markers in a single row of cell values.
+
+    Args:
+        values (tuple): Cell values of one worksheet row
+
+    Returns:
+        list[int]: 0-based column indices of cells containing "Name/Tel:"
+    """
+    return [
+        colIdx
+        for colIdx, value in enumerate(values)
+        if isinstance(value, str) and "Name/Tel:" in value  # Case-sensitive marker
+    ]
+
+
+def markerIndex(rows):
+    """
+    Build an index of every customer box marker in one pass over the used range.
+
+    Args:
+        rows (Iterable[tuple]): Cell values row by row (e.g. iter_rows(values_only=True))
+
+    Returns:
+        list[tuple[int, int]]: 0-based (row, column) of each "Name/Tel:" marker,
+            ordered column-major so records keep the box-column-by-box-column
+            order of the original grid scan
+    """
+    index = [
+        (rowIdx, colIdx)
+        for rowIdx, values in enumerate(rows)
+        for colIdx in rowMarkers(values)
+    ]
+    index.sort(key=lambda marker: (marker[1], marker[0]))
+    return index
+
+
+def boxAmounts(readingDate, literUsed, netCharge, adjustments, finalBill):
+    """
+    Normalize the period-specific values of a box (reading date and amounts).
+
+    These are the cells that move every billing period; boxRecord() applies the
+    same rules, and incremental extraction calls this alone for boxes whose
+    customer details are unchanged.
+
+    Args:
+        readingDate (datetime | str | None): Raw reading date cell value
+        literUsed, netCharge, adjustments, finalBill (int | float | None):
+            Usage and billing amounts
+
+    Returns:
+        tuple: (date at day precision, liters rounded to one decimal place,
+            net, adjustments and final as int)
+    """
+
+    def noneReturn(value, exceptionValue):
+        """Provide fallback value when cell data is None or missing."""
+        return exceptionValue if value is None else value
+
+    # Reject string values (formula errors), then apply default date for missing values
+    if isinstance(readingDate, str):
+        readingDate = None
+    readingDate = noneReturn(readingDate, datetime(2000, 1, 1))
+
+    return (
+        datetime(readingDate.year, readingDate.month, readingDate.day),  # Day precision
+        round(noneReturn(literUsed, 0), 1),  # CSV: "123.5"
+        int(noneReturn(netCharge, 0)),  # CSV: "5000"
+        int(noneReturn(adjustments, 0)),  # CSV: "1200"
+        int(noneReturn(finalBill, 0)),  # CSV: "6200"
+    )
+
+
+def boxRecord(
+    readingDate,
+    name,
+    contact,
+    commApp,
+    location,
+    literUsed,
+    netCharge,
+    adjustments,
+    finalBill,
+):
+    """
+    Normalize raw box values into the standard 9-field billing record.
+
+    Shared by every extraction engine so that the openpyxl cell path and the
+    streaming row-buffer path apply identical defaults and formatting.
+
+    Args:
+        readingDate (datetime | str | None): Raw reading date cell value
+        name (str | None): Customer name
+        contact (str | int | None): Local phone number (already resolved to the
+            primary or fallback contact cell)
+        commApp (str | None): Communication preference
+        location (str): "Lumo" or "Chanika"
+        literUsed, netCharge, adjustments, finalBill (int | float | None):
+            Usage and billing amounts
+
+    Returns:
+        CustomerRecord: Typed record (date at day precision, liters rounded to one
+            decimal place, amounts as int; see boxAmounts())
+    """
+    date, liters, net, adjusted, final = boxAmounts(
+        readingDate, literUsed, netCharge, adjustments, finalBill
+    )
+
+    # Compile all extracted data into a typed record
+    return CustomerRecord(
+        date,
+        name,
+        localToInt(contact),  # Transform to E.164 format (+255...), owner fallback
+        "s m s" if commApp is None else commApp,  # Default to SMS if not specified
+        location,
+        liters,
+        net,
+        adjusted,
+        final,
+    )
+
+
+def extractFromBox(cell, locations=None):
     """
     Extract complete billing record from a single customer data box in Excel worksheet.
 
@@ -93,11 +313,14 @@ def extractFromBox(cell):
     Args:
         cell (openpyxl.cell.Cell): Reference cell marking start of customer box
             (typically contains "Name/Tel:" text)
+        locations (list[str] | None): Optional locationTable() of the workbook.
+            When given, location is resolved from the colour cell's style ID;
+            otherwise its border object is inspected directly.
 
     Returns:
-        list[str]: Nine-element billing record:
-            [date, name, contact, comm_app, location, liters, net_charge, adjustments, final_bill]
-            All values formatted as strings for CSV compatibility
+        CustomerRecord: Typed billing record (date, name, contact, app, location,
+            liters, net, adjustments, final); converted to text only when
+            written to CSV
 
     Notes:
         - None values are replaced with safe defaults (empty strings, zeros, or owner contact)
@@ -109,126 +332,214 @@ def extractFromBox(cell):
         """Navigate to cell at specified row/column offset from current position."""
         return cell.offset(row=row, column=col)
 
-    def noneReturn(value, exceptionValue):
-        """Provide fallback value when cell data is None or missing."""
-        return exceptionValue if value is None else value
+    # Extract customer phone number (with fallback location)
+    comm = jumpTo(-1, 1).value
+    if comm is None:
+        comm = jumpTo(0, 3).value  # Alternative contact cell position
 
-    # Extract and validate reading date (offset: 1 down, 4 right)
-    readingDate = jumpTo(1, 4)
-    if isinstance(readingDate.value, str):  # Reject string values (formula errors)
-        readingDate.value = None
+    # Determine service location from the cell carrying the location border
+    colorBox = jumpTo(-1, 0)
+    if locations is None:
+        location = borderLocation(colorBox)
+    else:
+        location = styleLocation(colorBox.style_id, locations)
 
-    # Apply default date for missing values, then format as DD-Mon-YYYY
-    readingDate.value = noneReturn(readingDate.value, datetime(2000, 1, 1))
-    dateStr = readingDate.value.strftime("%d-%b-%Y")
+    return boxRecord(
+        jumpTo(1, 4).value,  # Reading date
+        jumpTo(0, 1).value,  # Customer name
+        comm,
+        jumpTo(-1, 3).value,  # Communication preference cell
+        location,
+        jumpTo(4, 4).value,  # Water consumption in liters
+        jumpTo(5, 4).value,  # Current period charges
+        jumpTo(6, 4).value,  # Previous period balance/adjustments
+        jumpTo(10, 1).value,  # Grand total (charges + adjustments)
+    )
 
-    # Extract customer name and phone number (with fallback location)
-    name = jumpTo(0, 1)
-    comm = jumpTo(-1, 1)
-    if comm.value is None:
-        comm = jumpTo(0, 3)  # Alternative contact cell position
 
-    comm.value = localToInt(comm.value)  # Transform to E.164 format (+255...)
+def streamSetup(sourcePath, sheetName=None):
+    """
+    Stream the target worksheet once into a compact row buffer.
 
-    # Determine service location by analyzing cell border formatting
-    commApp = jumpTo(-1, 3)  # Communication preference cell
-    colorBox = jumpTo(-1, 0)  # Cell containing location-indicating border
-    topColor = colorBox.border.top.color if colorBox.border.top is not None else None
+    Streaming alternative to envSetup(): the workbook is opened with read_only=True
+    so openpyxl parses the sheet XML lazily instead of materializing every cell and
+    style object. The sheet is walked exactly once; each row is reduced to a tuple
+    of plain values and every "Name/Tel:" marker is recorded together with its
+    location while the row above it (the colour cell row) is still at hand.
 
-    # Location logic: Red border (FFC00000) indicates Chanika, absence indicates Lumo
-    if topColor and topColor.rgb == "FFC00000":  # Hex color code for Chanika-red
-        location = "Chanika"
-    else:
-        location = "Lumo"
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to stream. Prompted for when None.
 
-    # Extract water usage and current billing amounts
-    literUsed = jumpTo(4, 4)  # Water consumption in liters
-    netCharge = jumpTo(5, 4)  # Current period charges
+    Returns:
+        tuple[list[tuple], list[tuple[int, int, str]], str]: Three-element tuple:
+            - rowBuffer: Cell values per row, 0-based (rowBuffer[0][0] is A1)
+            - boxes: (row, column, location) of every marker, ordered box column
+              by box column like iterateOnBoxes()
+            - sheetName: Worksheet name for filenaming
 
-    # Extract historical debts and compute total amount due
-    adjustments = jumpTo(6, 4)  # Previous period balance/adjustments
-    finalBill = jumpTo(10, 1)  # Grand total (charges + adjustments)
+    Note:
+        Read-only rows are ragged (they end at the last populated cell), so
+        lookups into the buffer must be bounds-checked.
+    """
+    try:
 
-    # Compile all extracted data into standardized list format
-    return [
-        dateStr,
-        name.value,
-        comm.value,  # Defaults to owner's number if customer number unavailable
-        noneReturn(
-            commApp.value, "s m s"
-        ),  # Default to SMS if preference not specified
-        location,
-        str(round(noneReturn(literUsed.value, 0), 1)),  # Format: "123.5"
-        str(int(noneReturn(netCharge.value, 0))),  # Format: "5000"
-        str(int(noneReturn(adjustments.value, 0))),  # Format: "1200"
-        str(int(noneReturn(finalBill.value, 0))),  # Format: "6200"
-    ]
+        workbook = openpyxl.load_workbook(sourcePath, read_only=True, data_only=True)
+        if sheetName is None:
+            sheetName = input("Exact name of the sheet: ")
+        workSheet = workbook[sheetName]
+        locations = locationTable(workbook)  # Style ID -> location, per workbook
 
+        rowBuffer = []
+        boxes = []
+        previousRow = ()  # Cells of the row above, kept for style lookups
 
-def iterateOnBoxes(cell):
+        for rowIdx, row in enumerate(workSheet.iter_rows()):
+
+            values = tuple(cell.value for cell in row)
+
+            for colIdx in rowMarkers(values):
+                colorBox = previousRow[colIdx] if colIdx < len(previousRow) else None
+                # Empty read-only cells carry no style ID
+                styleId = getattr(colorBox, "_style_id", None)
+                boxes.append((rowIdx, colIdx, styleLocation(styleId, locations)))
+
+            rowBuffer.append(values)
+            previousRow = row
+
+        workbook.close()  # Read-only workbooks keep the archive open until closed
+
+        boxes.sort(key=lambda box: (box[1], box[0]))  # Column-major, like the grid scan
+        return (
+            rowBuffer,
+            boxes,
+            sheetName,
+        )
+
+    except Exception as Error:
+        errorDisplay(Error)
+
+
+def rowBoxValues(rowBuffer, rowIdx, colIdx, location):
+    """
+    Read the raw cell values of one box from a row buffer.
+
+    Uses the extractFromBox() offsets and returns the values in boxRecord()
+    argument order, before any defaults or formatting are applied. Incremental
+    extraction fingerprints these raw values to detect changed boxes.
+
+    Args:
+        rowBuffer (list[tuple]): Row values produced by streamSetup()
+        rowIdx (int): 0-based row of the "Name/Tel:" marker
+        colIdx (int): 0-based column of the "Name/Tel:" marker
+        location (str): Location resolved while streaming ("Lumo" or "Chanika")
+
+    Returns:
+        tuple: (readingDate, name, contact, commApp, location, literUsed,
+            netCharge, adjustments, finalBill)
     """
-    Systematically scan worksheet grid to locate and extract all customer data boxes.
 
-    Implements nested iteration pattern to traverse TNS Water Services' standardized
-    worksheet layout. Customer boxes are arranged in 3 columns with approximately
-    910 rows per column. Each box is identified by the presence of "Name/Tel:" text
-    in a marker cell.
+    def valueAt(row, col):
+        """Read value at offset from marker, None outside the buffer."""
+        r, c = rowIdx + row, colIdx + col
+        if 0 <= r < len(rowBuffer) and 0 <= c < len(rowBuffer[r]):
+            return rowBuffer[r][c]
+        return None
+
+    comm = valueAt(-1, 1)
+    if comm is None:
+        comm = valueAt(0, 3)  # Alternative contact cell position
+
+    return (
+        valueAt(1, 4),
+        valueAt(0, 1),
+        comm,
+        valueAt(-1, 3),
+        location,
+        valueAt(4, 4),
+        valueAt(5, 4),
+        valueAt(6, 4),
+        valueAt(10, 1),
+    )
 
-    Grid Structure:
-        - Columns: 3 (each box is 6 cells wide, so offsets are 0, 6, 12)
-        - Rows: ~910 per column (exact count may vary by billing period)
-        - Box Marker: Cell containing string "Name/Tel:"
+
+def extractFromRows(rowBuffer, rowIdx, colIdx, location):
+    """
+    Extract a billing record from a row buffer using extractFromBox() offsets.
 
     Args:
-        cell (openpyxl.cell.Cell): Starting position for iteration (typically A1)
+        rowBuffer (list[tuple]): Row values produced by streamSetup()
+        rowIdx (int): 0-based row of the "Name/Tel:" marker
+        colIdx (int): 0-based column of the "Name/Tel:" marker
+        location (str): Location resolved while streaming ("Lumo" or "Chanika")
 
     Returns:
-        list[list[str]]: Collection of billing records, where each record is a
-            9-element list returned by extractFromBox()
+        CustomerRecord: Billing record identical to extractFromBox()
+    """
+    return boxRecord(*rowBoxValues(rowBuffer, rowIdx, colIdx, location))
 
-    Algorithm:
-        1. For each column (0, 1, 2):
-           - For each row (0 to 909):
-             * Skip MergedCell instances
-             * Check if cell contains "Name/Tel:" marker
-             * If marker found, extract full box data
-             * Advance to next row using offset navigation
-           - Advance to next column (offset by 6 cells)
-        2. Return accumulated customer records
 
-    Performance Note:
-        Iterates through ~2,730 cells per worksheet. Merged cells are skipped
-        to avoid duplicate processing.
+def iterateOnRows(rowBuffer, boxes):
+    """
+    Extract every customer box located by streamSetup().
+
+    Args:
+        rowBuffer (list[tuple]): Row values produced by streamSetup()
+        boxes (list[tuple[int, int, str]]): Marker positions and locations
+
+    Returns:
+        list[CustomerRecord]: Billing records in the same order as iterateOnBoxes()
     """
-    startCell = cell
-    col = 0
-    customerInfo = []
     try:
-        # Outer loop: traverse 3 horizontal columns of customer boxes
-        while col < 3:  # Column indices: 0, 1, 2
 
-            rows = 0  # Row counter for vertical traversal
+        return [
+            extractFromRows(rowBuffer, rowIdx, colIdx, location)
+            for rowIdx, colIdx, location in boxes
+        ]
+
+    except Exception as Error:
+        errorDisplay(Error)
+
 
-            # Inner loop: scan vertically through all rows in current column
-            while rows < 910:
+def iterateOnBoxes(cell):
+    """
+    Locate and extract all customer data boxes on the worksheet.
 
-                if type(cell).__name__ == "MergedCell":  # Skip merged cell ranges
-                    rows += 1
+    Box discovery is delegated to markerIndex(), which scans the sheet's real used
+    range once (from the given start cell to the last populated row and column).
+    extractFromBox() then runs only on the marker coordinates found, so the
+    number of box columns and rows is no longer fixed by the layout.
 
-                # Detect customer box start via "Name/Tel:" identifier string
-                if (
-                    isinstance(cell.value, str) and "Name/Tel:" in cell.value
-                ):  # Case-sensitive marker detection
-                    customerInfo.append(extractFromBox(cell))
+    Args:
+        cell (openpyxl.cell.Cell): Starting position for iteration (typically A1)
 
-                # Reset to column start and advance one row down
-                cell = startCell
-                cell = cell.offset(
-                    row=rows, column=(6 * col)
-                )  # Each box spans 6 columns
-                rows += 1
+    Returns:
+        list[CustomerRecord]: Collection of billing records returned by
+            extractFromBox()
+
+    Algorithm:
+        1. Stream cell values of the used range below/right of the start cell
+        2. Index every "Name/Tel:" marker coordinate (single pass)
+        3. Extract each box in column-major order (box column by box column)
+        4. Return accumulated customer records
+
+    Performance Note:
+        Each used cell is inspected once as a plain value; merged cells read as
+        None and can never be mistaken for markers. Only marker cells are
+        resolved back to openpyxl Cell objects.
+    """
+    workSheet = cell.parent
+    customerInfo = []
+    try:
+        locations = locationTable(workSheet.parent)  # Style ID -> location, per workbook
+        rows = workSheet.iter_rows(
+            min_row=cell.row, min_col=cell.column, values_only=True
+        )
 
-            col += 1
+        # Marker coordinates are relative to the start cell
+        for rowIdx, colIdx in markerIndex(rows):
+            marker = cell.offset(row=rowIdx, column=colIdx)
+            customerInfo.append(extractFromBox(marker, locations))
 
         return customerInfo
 
@@ -1,7 +1,22 @@
+from csv_index import appendIndex, loadIndex, rowDigest
 from miscallenous import errorDisplay
+from records import CustomerRecord
 import os
 import csv
 
+# Column layout of every billing CSV in docs/results/
+BILLING_HEADERS = [
+    "Reading Date",
+    "Customer Name",
+    "Contacts",
+    "Communication App",
+    "Location",
+    "Liters Used",
+    "Net Charge",
+    "Adjustments",
+    "Final Bill",
+]
+
 
 def fileCreation(fileName, headers):
     """
@@ -34,16 +49,18 @@ def addRows(fileName, info):
     """
     Append new customer records to CSV file with automatic duplicate prevention.
 
-    Implements safe append operation that prevents duplicate entries by comparing
-    new records against existing CSV content before writing.
+    Implements safe append operation that prevents duplicate entries by checking
+    new records against the CSV's sidecar digest index (see csv_index) before
+    writing, so the cost is proportional to the new records only.
 
     Args:
         fileName (str): Base name of CSV file without extension (e.g., "January, 2026")
-        info (list[list[str]]): Customer billing records to append. Each record is
-            a list matching CSV column structure (9 elements)
+        info (list[CustomerRecord] | list[list[str]]): Records to append. Billing
+            records are converted to CSV text here via CustomerRecord.toRow();
+            plain lists (e.g. failed.csv rows) are written as given
 
     Returns:
-        None: Modifies CSV file in docs/results/ directory
+        None: Modifies CSV file and its .idx index in docs/results/ directory
 
     Side Effects:
         Prints status message:
@@ -51,28 +68,36 @@ def addRows(fileName, info):
         - "No new data!" if all records already exist (duplicates filtered)
 
     Behavior:
-        1. Opens CSV in append mode
-        2. Filters info through nonRecInput() to remove duplicates
-        3. Writes only new records
+        1. Filters info through nonRecInput() to remove duplicates
+        2. Appends only new records to the CSV
+        3. Records their digests in the index
         4. Reports operation outcome
     """
     filePath = f"docs/results/{fileName}.csv"
 
     try:
 
-        with open(filePath, "a", newline="") as csvFile:
+        # CSV boundary: typed records become text exactly once, here
+        rows = [
+            record.toRow() if isinstance(record, CustomerRecord) else record
+            for record in info
+        ]
+
+        # Filter out duplicates before writing
+        data, digests = nonRecInput(filePath, rows)  # Returns only new records
 
-            writer = csv.writer(csvFile)
+        if len(data) > 0:
 
-            # Filter out duplicates before writing
-            data = nonRecInput(filePath, info)  # Returns only new records
-            writer.writerows(data)
+            with open(filePath, "a", newline="") as csvFile:
+
+                writer = csv.writer(csvFile)
+                writer.writerows(data)
 
-            if len(data) > 0:
-                print(f"{fileName} updated✅")
+            appendIndex(filePath, digests)  # After the CSV, so a crash forces a rebuild
+            print(f"{fileName} updated✅")
 
-            else:
-                print("No new data!")
+        else:
+            print("No new data!")
 
     except Exception as Error:
         errorDisplay(Error)
@@ -92,12 +117,10 @@ def activeClients(data):
         * Bills ≤ 50 TZS: Below minimum billing threshold (administrative cutoff)
 
     Args:
-        data (list[list[str]]): Raw customer records from Excel extraction.
-            Expected structure: [date, name, contact, app, location, liters,
-                                net_charge, adjustments, final_bill]
+        data (list[CustomerRecord]): Raw customer records from Excel extraction
 
     Returns:
-        list[list[str]]: Filtered records containing only active, billable customers
+        list[CustomerRecord]: Filtered records containing only active, billable customers
 
     Business Logic:
         Minimum billing threshold of 50 TZS filters out:
@@ -112,13 +135,11 @@ def activeClients(data):
 
         actvClients = []
 
-        for rows in data:
+        for record in data:
             # Apply filtering criteria: non-null name AND bill exceeds minimum threshold
-            if (
-                rows[1] is not None and int(rows[8]) > 50
-            ):  # rows[1]=name, rows[8]=final_bill
+            if record.name is not None and record.final > 50:
 
-                actvClients.append(rows)
+                actvClients.append(record)
 
         return actvClients
 
@@ -130,50 +151,45 @@ def nonRecInput(filePath, data):
     """
     Implement deduplication by filtering records that already exist in CSV file.
 
-    Performs complete record comparison (all columns) to identify duplicates,
-    ensuring idempotent append operations where re-running extraction with same
-    data won't create duplicate CSV entries.
+    Looks each record's digest up in the CSV's persistent index, ensuring idempotent
+    append operations where re-running extraction with same data won't create
+    duplicate CSV entries.
 
     Args:
         filePath (str): Path to CSV file for duplicate checking
         data (list[list[str]]): New records to validate against existing content
 
     Returns:
-        list[list[str]]: Subset of data containing only records not present in CSV
+        tuple[list[list[str]], list[str]]: Records not present in the CSV (nor
+            repeated earlier in data) and their digests, for appendIndex()
 
     Algorithm:
-        1. Load all existing rows from CSV into memory (presList)
-        2. Compare each new record against existing rows
-        3. Include record in output only if exact match not found
+        1. Load the digest set from <filePath>.idx (cached per process, rebuilt
+           from the CSV if the index is missing or out of sync)
+        2. Digest each new record (None and "" compare equal, as csv writes them)
+        3. Include record in output only if its digest is unseen
         4. Return filtered list for safe appending
 
-    Comparison Logic:
-        Uses Python list equality (==) which compares all elements in order.
-        Two records are considered duplicates if ALL columns match exactly.
-
-    Performance Consideration:
-        O(n*m) complexity where n=new records, m=existing records.
-        Acceptable for typical dataset sizes (hundreds of records).
-        For large datasets, consider hash-based deduplication.
+    Performance:
+        O(n) set lookups for n new records; the index is read once per process
+        and the CSV only when the index has to be rebuilt.
     """
     try:
 
-        with open(filePath, "r", newline="") as csvFile:
-
-            reader = csv.reader(csvFile)
-
-            # Load complete existing dataset into memory for comparison
-            presList = []
-            for rows in reader:
-                presList.append(rows)
+        presDigests = loadIndex(filePath)  # Shared cache: only appendIndex() adds to it
 
-            # Filter: retain only records absent from existing dataset
-            updList = []
-            for line in data:
-                if line not in presList:  # Full record comparison (all columns)
-                    updList.append(line)
+        # Filter: retain only records absent from existing dataset
+        updList = []
+        newDigests = []
+        seen = set()  # Repeats within data
+        for line in data:
+            digest = rowDigest(line)
+            if digest not in presDigests and digest not in seen:
+                seen.add(digest)
+                updList.append(line)
+                newDigests.append(digest)
 
-            return updList
+        return updList, newDigests
 
     except Exception as Error:
         errorDisplay(Error)
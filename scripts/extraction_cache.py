@@ -0,0 +1,187 @@
+"""Content-Addressed Cache for Extracted Billing Records.
+
+Avoids reloading and reparsing an unchanged workbook when extraction is re-run (for
+example after fixing something downstream). Extracted records are stored on disk under
+a key derived from what actually determines them:
+
+    * SHA-256 of the workbook file contents (renames/touches don't invalidate)
+    * Worksheet name
+    * EXTRACTOR_VERSION (bump whenever extraction output changes)
+    * marshal format version of the running interpreter
+
+Engines are deliberately not part of the key: the openpyxl, stream and xml engines
+produce identical records, so a hit from one serves all of them.
+
+Storage Format:
+    docs/cache/extraction/<key>.bin containing zlib-compressed marshal data of
+    CustomerRecord.pack() tuples. Files are written to a temporary name and renamed into place so an
+    interrupted run never leaves a truncated entry behind.
+
+Usage:
+    batch_extraction.sheetRecords() consults the cache by default, so both the
+    extract and batch commands benefit; pass --no-cache to force a fresh parse.
+
+Eviction:
+    Total cache size is bounded by CACHE_LIMIT bytes. Entries are evicted least
+    recently used first (a hit refreshes the entry's modification time).
+"""
+
+from records import CustomerRecord
+import hashlib
+import marshal
+import os
+import zlib
+
+CACHE_DIR = "docs/cache/extraction"
+CACHE_LIMIT = 64 * 2**20  # 64 MiB across all cached sheets
+EXTRACTOR_VERSION = 2
+
+
+def workbookHash(sourcePath):
+    """
+    Compute the SHA-256 digest of a workbook's contents.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file
+
+    Returns:
+        str: Hex digest, read in 1 MiB chunks to keep memory flat
+    """
+    digest = hashlib.sha256()
+    with open(sourcePath, "rb") as workbook:
+        for chunk in iter(lambda: workbook.read(2**20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cacheKey(contentHash, sheetName):
+    """
+    Derive the cache entry name for one worksheet of one workbook version.
+
+    Args:
+        contentHash (str): workbookHash() of the source file
+        sheetName (str): Worksheet name
+
+    Returns:
+        str: Hex key used as the cache file name
+    """
+    parts = [contentHash, sheetName, str(EXTRACTOR_VERSION), str(marshal.version)]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def cacheRead(key):
+    """
+    Load cached records for a key, refreshing its LRU position.
+
+    Args:
+        key (str): Entry name from cacheKey()
+
+    Returns:
+        list[CustomerRecord] | None: Cached records, or None on a miss. Unreadable
+            entries are removed and reported as a miss.
+    """
+    entryPath = os.path.join(CACHE_DIR, f"{key}.bin")
+    try:
+        with open(entryPath, "rb") as entry:
+            records = marshal.loads(zlib.decompress(entry.read()))
+        os.utime(entryPath)  # Mark as recently used
+        return [CustomerRecord.unpack(record) for record in records]
+
+    except FileNotFoundError:
+        return None
+
+    except (EOFError, ValueError, TypeError, zlib.error):
+        os.remove(entryPath)  # Corrupt entry: drop it and re-extract
+        return None
+
+
+def cacheWrite(key, records):
+    """
+    Atomically store records under a key, then enforce the size limit.
+
+    Args:
+        key (str): Entry name from cacheKey()
+        records (list[CustomerRecord]): Extracted billing records
+
+    Returns:
+        None: Creates docs/cache/extraction/<key>.bin
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entryPath = os.path.join(CACHE_DIR, f"{key}.bin")
+    tempPath = f"{entryPath}.{os.getpid()}.tmp"
+
+    payload = zlib.compress(marshal.dumps([record.pack() for record in records]))
+    with open(tempPath, "wb") as entry:
+        entry.write(payload)
+    os.replace(tempPath, entryPath)
+
+    evictEntries(CACHE_LIMIT)
+
+
+def evictEntries(limit):
+    """
+    Delete least recently used entries until the cache fits within limit bytes.
+
+    Args:
+        limit (int): Maximum total size of cache entries in bytes
+
+    Returns:
+        int: Number of entries removed
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".bin"):
+            stat = os.stat(os.path.join(CACHE_DIR, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    entries.sort()  # Oldest first
+    total = sum(size for _mtime, size, _name in entries)
+    removed = 0
+    for _mtime, size, name in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+        except FileNotFoundError:  # Already evicted by a concurrent batch worker
+            pass
+        total -= size
+
+    return removed
+
+
+def cachedRecords(sourcePath, sheetName, extract):
+    """
+    Return a worksheet's records from cache, extracting them only on a miss.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to extract. Prompted for when None,
+            since the name is part of the cache key.
+        extract (Callable[[str, str], tuple[list[CustomerRecord], str]]): Extraction
+            run on a miss, e.g. batch_extraction.engineRecords with an engine bound
+
+    Returns:
+        tuple[list[CustomerRecord], str]: Records and worksheet name
+    """
+    if sheetName is None:
+        sheetName = input("Exact name of the sheet: ")
+
+    key = cacheKey(workbookHash(sourcePath), sheetName)
+    records = cacheRead(key)
+
+    if records is None:
+        records, sheetName = extract(sourcePath, sheetName)
+        cacheWrite(key, records)
+    else:
+        print(f"Loaded '{sheetName}' from extraction cache✅")
+
+    return records, sheetName
+
+
+if __name__ == "__main__":
+
+    print(f"Removed {evictEntries(0)} cached sheets")  # Clear the whole cache
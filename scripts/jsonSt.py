@@ -5,13 +5,13 @@ Manages three primary storage files with distinct lifecycle stages:
 
 1. data.json (Message Queue)
    - Prepared messages awaiting transmission
-   - Structure: {"Customer Name": {"Contact": "+255...", "Body": "..."}, ...}
+   - Structure: {"Customer Name": {"Name": "...", "Contact": "+255...", "Body": "..."}, ...}
    - Populated by: tempFilling()
    - Consumed by: sendMessage()
 
 2. sent.json (Transmission Log)
    - Successfully transmitted messages with batch tracking
-   - Structure: {"Customer Name": {"smsBatchId": "...", "Contact": "...", "Status": 201}, ...}
+   - Structure: {"Customer Name": {"smsBatchId": "...", "Name": "...", "Contact": "...", "Status": 201}, ...}
    - Populated by: sendMessage()
    - Consumed by: deliveryMessage()
 
@@ -20,21 +20,251 @@ Manages three primary storage files with distinct lifecycle stages:
    - Structure: {"Customer Name": {"type": "sms", "status": "delivered"}, ...}
    - Populated by: deliveryMessage()
 
+Keys are queue keys: the customer name, or "Name (contact)" when several customers
+of a period share a name (see membership.queueKey()).
+
 Operations:
     * jsonCreate(): Safe file initialization (skip if exists)
-    * getJsonData(): Load and parse JSON file to dict
-    * addJsonData(): Insert/update key-value pair
+    * getJsonData(): Load snapshot and replay journal into a dict
+    * addJsonData(): Insert/update key-value pair (one journal append)
+    * addJsonBatch(): Insert/update many pairs (one journal write)
+    * removeJsonData(): Delete one key (one journal append)
     * delJsonData(): Remove successfully sent messages from queue
+    * jsonCompact(): Fold the journal into the snapshot
     * jsonToCsv(): Export delivered messages to CSV format
-
-Thread Safety: Not thread-safe. Sequential execution assumed.
+    * Store: In-memory view of one file with batched write-behind flushes
+
+Journal Storage:
+    Each store is a JSON snapshot (<name>.json, the layout above) plus an
+    append-only journal (<name>.json.jsonl) with one update per line:
+
+        {"set": "John Doe", "value": {"Contact": "+255...", "Body": "..."}}
+        {"del": "John Doe"}
+
+    Updates append a single line instead of rewriting the whole file, so sending a
+    batch of n messages costs O(n) small writes rather than O(n^2) rewrites. Reads
+    replay the journal over the snapshot. Once the journal outgrows COMPACT_BYTES
+    it is folded into the snapshot (temp file + rename) and truncated; replaying
+    set/del is idempotent, so a crash between those two steps loses nothing.
+
+Locking:
+    Appends, reads, compaction and snapshot writes hold an exclusive fcntl.flock on
+    the store's lock file (storeLock()), so no process appends a line between a
+    compaction's read and its truncate, and no reader pairs an old snapshot with an
+    already truncated journal. The send queue stores (data.json, sent.json,
+    leases.json, dead_letter.json) share json_storage/queue.lock with
+    message_queue.MessageQueue, so a worker's claim or ack and every write to those
+    files are serialised; other stores use <name>.json.lock. The lock is
+    re-entrant within a process, so journaled functions can be called inside
+    MessageQueue.locked().
+
+Recovery:
+    A final line without a newline is ignored by every read. Only a reader holding
+    the store lock truncates it away: writers append under the lock, so at that
+    point the line can only be left by a process killed mid-append, never by an
+    append still in progress. Corruption anywhere else is reported as an error.
+
+Write-Behind Store:
+    Single-writer loops that touch a store many times (delivery) open it once:
+
+        with Store("json_storage/delivery.json") as delivery:
+            delivery["John Doe"] = {"type": "sms", "status": "delivered"}
+
+    Reads are served from memory. Mutations are buffered and flushed as a whole new
+    snapshot (temp file + fsync + rename, then the journal is cleared) every
+    flushEvery mutations, every flushSeconds, and on exit, so a crash never leaves
+    a half-written file behind and loses at most the unflushed batch.
+
+    A flush replaces the file with the Store's in-memory copy (under the store lock,
+    but from data read when the block was entered), so a Store must not share a
+    file with other writers. In particular it must never open the send queue
+    files: MessageQueue workers update those concurrently, and a flush would drop
+    their journal entries. Store refuses those files.
+
+Thread Safety: Not thread-safe. Processes coordinate through the store locks; the
+lock depth is tracked per process, not per thread.
 """
 
 from miscallenous import errorDisplay
 from extracted_csv import fileCreation
+from contextlib import contextmanager
 import csv
+import fcntl
 import json
 import os
+import time
+
+COMPACT_BYTES = 256 * 2**10  # Journal size that triggers compaction
+QUEUE_FILES = ("data.json", "sent.json", "leases.json", "dead_letter.json")
+QUEUE_LOCK = "queue.lock"  # Lock file shared by QUEUE_FILES and MessageQueue
+
+_locksHeld = {}  # Lock file path -> nesting depth held by this process
+
+
+def journalPath(storagePath):
+    """Path of the append-only journal belonging to a JSON snapshot."""
+    return f"{storagePath}.jsonl"
+
+
+def lockPath(storagePath):
+    """Lock file of a store: queue.lock for QUEUE_FILES, else <name>.json.lock."""
+    directory, name = os.path.split(os.path.abspath(storagePath))
+    if name in QUEUE_FILES:
+        return os.path.join(directory, QUEUE_LOCK)
+    return os.path.join(directory, f"{name}.lock")
+
+
+@contextmanager
+def storeLock(storagePath):
+    """
+    Hold a store's exclusive OS lock for the duration of the block.
+
+    Re-entrant within a process: nested calls for stores sharing a lock file (e.g.
+    addJsonData() inside MessageQueue.locked()) do not lock again.
+
+    Args:
+        storagePath (str): Path to the JSON snapshot (or any file of its lock group)
+
+    Yields:
+        None
+    """
+    path = lockPath(storagePath)
+    if _locksHeld.get(path):
+        _locksHeld[path] += 1
+        try:
+            yield
+        finally:
+            _locksHeld[path] -= 1
+        return
+
+    with open(path, "a") as lockFile:
+        fcntl.flock(lockFile, fcntl.LOCK_EX)  # Blocks until other processes finish
+        _locksHeld[path] = 1
+        try:
+            yield
+        finally:
+            _locksHeld[path] = 0
+            fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+
+def lockHeld(storagePath):
+    """Whether this process holds the store's lock."""
+    return bool(_locksHeld.get(lockPath(storagePath)))
+
+
+def readJournal(storagePath):
+    """
+    Read all journal entries, ignoring a torn final line.
+
+    Args:
+        storagePath (str): Path to the JSON snapshot
+
+    Returns:
+        list[dict]: Journal entries in append order ([] if no journal exists).
+            With the store lock held, a torn final line is also truncated away.
+
+    Raises:
+        json.JSONDecodeError: If a complete (newline-terminated) line is corrupt
+    """
+    try:
+        with open(journalPath(storagePath), "rb") as journal:
+            content = journal.read()
+    except FileNotFoundError:
+        return []
+
+    complete = content.rfind(b"\n") + 1  # Bytes up to the last full line
+    if complete < len(content) and lockHeld(storagePath):
+        # No append runs under our lock: the partial line is from a crashed writer.
+        # Drop it so later appends stay parseable
+        with open(journalPath(storagePath), "r+b") as journal:
+            journal.truncate(complete)
+
+    return [json.loads(line) for line in content[:complete].splitlines() if line]
+
+
+def appendJournal(storagePath, *entries):
+    """
+    Append updates to the journal in one write, compacting when it grows too large.
+
+    Args:
+        storagePath (str): Path to the JSON snapshot
+        *entries (dict): {"set": key, "value": value} or {"del": key} updates
+
+    Returns:
+        None: Appends and compacts under the store lock
+    """
+    with storeLock(storagePath):
+        with open(journalPath(storagePath), "a+b") as journal:
+            if journal.tell() > 0:
+                journal.seek(-1, os.SEEK_END)
+                if journal.read(1) != b"\n":  # Torn line from an earlier crash
+                    readJournal(storagePath)  # Truncates it (lock held) before appending
+                    journal.seek(0, os.SEEK_END)
+
+            journal.write(
+                b"".join(json.dumps(entry).encode("utf-8") + b"\n" for entry in entries)
+            )
+            size = journal.tell()
+
+        if size > COMPACT_BYTES:
+            jsonCompact(storagePath)
+
+
+def writeSnapshot(storagePath, presentData):
+    """
+    Atomically replace the JSON snapshot and clear its journal.
+
+    Args:
+        storagePath (str): Path to the JSON snapshot
+        presentData (dict): Complete store contents
+
+    Returns:
+        None: The snapshot is either the old or the new file, never a partial one
+    """
+    with storeLock(storagePath):
+        tempPath = f"{storagePath}.tmp"
+        with open(tempPath, "w") as store:
+            json.dump(presentData, store, indent=4)
+            store.flush()
+            os.fsync(store.fileno())  # Data on disk before the rename publishes it
+        os.replace(tempPath, storagePath)  # Snapshot now includes every entry
+
+        # Persist the rename itself
+        directory = os.open(os.path.dirname(storagePath) or ".", os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+        if os.path.exists(journalPath(storagePath)):
+            open(journalPath(storagePath), "w").close()  # Replay is idempotent if skipped
+
+
+def jsonCompact(storagePath):
+    """
+    Fold the journal into the JSON snapshot and truncate the journal.
+
+    Args:
+        storagePath (str): Path to the JSON snapshot
+
+    Returns:
+        int: Number of journal entries folded in
+
+    Note:
+        Read, snapshot and truncate run under the store lock, so no line appended
+        by another process in between is lost.
+    """
+    try:
+        with storeLock(storagePath):
+            entries = readJournal(storagePath)
+            if not entries:
+                return 0
+
+            writeSnapshot(storagePath, getJsonData(storagePath))
+            return len(entries)
+
+    except Exception as Error:
+        errorDisplay(Error)
 
 
 def jsonCreate(storagePath):
@@ -74,17 +304,17 @@ def jsonCreate(storagePath):
 
 def getJsonData(storagePath):
     """
-    Load and parse JSON file contents into Python dictionary.
+    Load the JSON snapshot and replay its journal into a Python dictionary.
 
     Args:
         storagePath (str): Path to JSON file to read
 
     Returns:
-        dict: Parsed JSON data structure. Returns empty dict {} if file is empty.
+        dict: Current contents (snapshot plus journaled updates)
 
     Raises:
         FileNotFoundError: If specified path doesn't exist
-        json.JSONDecodeError: If file contains malformed JSON syntax
+        json.JSONDecodeError: If snapshot or a complete journal line is malformed
         PermissionError: If process lacks read permissions
 
     Usage:
@@ -92,12 +322,20 @@ def getJsonData(storagePath):
         >>> print(data.keys())  # Access customer names
     """
     try:
-        # Load and return JSON data from file
-        with open(storagePath, "r") as store:
+        # Load the snapshot, then apply journaled updates in order. The lock keeps a
+        # compaction from swapping the snapshot between the two reads
+        with storeLock(storagePath):
+            with open(storagePath, "r") as store:
+
+                presentData = json.load(store)
 
-            presentData = json.load(store)
+            for entry in readJournal(storagePath):
+                if "set" in entry:
+                    presentData[entry["set"]] = entry["value"]
+                else:
+                    presentData.pop(entry["del"], None)
 
-            return presentData
+        return presentData
 
     except Exception as Error:
         errorDisplay(Error)
@@ -107,10 +345,8 @@ def addJsonData(storagePath, key, value):
     """
     Insert or update key-value pair in JSON storage file.
 
-    Implements atomic update pattern:
-    1. Load existing JSON data
-    2. Modify in-memory dictionary
-    3. Write complete dictionary back to file
+    Appends a single {"set": key, "value": value} line to the store's journal;
+    the snapshot is only rewritten by compaction.
 
     Args:
         storagePath (str): Path to JSON file to modify
@@ -118,22 +354,53 @@ def addJsonData(storagePath, key, value):
         value (Any): Value to associate with key (typically dict with Contact/Body or status info)
 
     Returns:
-        None: Modifies file in-place with pretty-printed JSON (indent=4)
+        None: Appends to <storagePath>.jsonl
 
-    Warning:
-        Not atomic at filesystem level. Concurrent writes may cause data loss.
-        Ensure sequential execution in production.
+    Note:
+        The append holds the store lock (storeLock()); a read-modify-write spanning
+        several calls needs the caller to hold it too (e.g. MessageQueue.locked()).
 
     Example:
         >>> addJsonData("data.json", "John Doe", {"Contact": "+255...", "Body": "..."})
     """
     try:
-        # Load existing data, add new entry, and save back
-        presentData = getJsonData(storagePath)
-        with open(storagePath, "w") as store:
+        appendJournal(storagePath, {"set": key, "value": value})
 
-            presentData[key] = value
-            json.dump(presentData, store, indent=4)
+    except Exception as Error:
+        errorDisplay(Error)
+
+
+def addJsonBatch(storagePath, items):
+    """
+    Insert or update many key-value pairs with a single journal write.
+
+    Args:
+        storagePath (str): Path to JSON file to modify
+        items (Iterable[tuple[str, Any]]): (key, value) pairs in order
+
+    Returns:
+        None: Appends one line per pair to <storagePath>.jsonl in one write
+    """
+    try:
+        appendJournal(storagePath, *({"set": key, "value": value} for key, value in items))
+
+    except Exception as Error:
+        errorDisplay(Error)
+
+
+def removeJsonData(storagePath, key):
+    """
+    Delete a key from JSON storage (no-op if absent).
+
+    Args:
+        storagePath (str): Path to JSON file to modify
+        key (str): Dictionary key to remove (typically customer name)
+
+    Returns:
+        None: Appends a {"del": key} line to <storagePath>.jsonl
+    """
+    try:
+        appendJournal(storagePath, {"del": key})
 
     except Exception as Error:
         errorDisplay(Error)
@@ -150,47 +417,143 @@ def delJsonData(checkPath, deletePath):
     1. Load sent messages from checkPath (sent.json)
     2. Load pending messages from deletePath (data.json)
     3. Identify messages with Status=201 AND present in pending queue
-    4. Delete matched entries from pending queue
-    5. Write cleaned queue back to deletePath
+    4. Journal a deletion for each matched entry
 
     Args:
         checkPath (str): Path to sent message log (e.g., "json_storage/sent.json")
         deletePath (str): Path to message queue (e.g., "json_storage/data.json")
 
     Returns:
-        None: Modifies deletePath file in-place, removing successfully sent entries
+        None: Appends deletions of successfully sent entries to deletePath's journal
 
     Status Code Reference:
         * 201: Message successfully accepted by TextBee API (safe to delete)
         * Other: Retain in queue for potential retry
     """
     try:
-        # Load both storage files for cross-reference
-        sentData = getJsonData(checkPath)  # Transmission log
-        presentData = getJsonData(deletePath)  # Message queue
-        presentNames = list(presentData.keys())
-        sentNames = list(sentData.keys())
+        with storeLock(deletePath):  # queue.lock for data.json: senders wait
+            # Load both storage files for cross-reference
+            sentData = getJsonData(checkPath)  # Transmission log
+            presentData = getJsonData(deletePath)  # Message queue
 
-        # Identify and remove successfully transmitted messages
-        for i in range(len(sentNames)):
+            # Identify and remove successfully transmitted messages
+            for sentName in sentData:
 
-            sentName = sentNames[i]
+                # Deletion criteria: HTTP 201 status AND still present in queue
+                if (
+                    sentData[sentName]["Status"] == 201 and sentName in presentData
+                ):  # 201 = "Created" (successful API acceptance)
 
-            # Deletion criteria: HTTP 201 status AND still present in queue
-            if (
-                sentData[sentName]["Status"] == 201 and sentName in presentNames
-            ):  # 201 = "Created" (successful API acceptance)
-
-                del presentData[sentName]  # Remove from queue to prevent resending
-
-        with open(deletePath, "w") as file:
-
-            json.dump(presentData, file, indent=4)
+                    removeJsonData(deletePath, sentName)  # Prevent resending
 
     except Exception as Error:
         errorDisplay(Error)
 
 
+class Store:
+    """In-memory view of one JSON store with write-behind, atomic flushes."""
+
+    QUEUE_FILES = QUEUE_FILES  # Written concurrently by send workers
+
+    def __init__(self, storagePath, flushEvery=50, flushSeconds=5.0):
+        """
+        Args:
+            storagePath (str): Path to the JSON snapshot (created if missing). The
+                file must have no other writer while the Store is open.
+            flushEvery (int): Flush after this many buffered mutations
+            flushSeconds (float): Flush when the oldest buffered mutation is
+                this many seconds old (checked on each mutation)
+
+        Raises:
+            ValueError: If storagePath is one of the send queue files, which
+                MessageQueue workers write concurrently
+        """
+        if os.path.basename(storagePath) in self.QUEUE_FILES:
+            raise ValueError(
+                f"{storagePath} is shared by MessageQueue workers; "
+                "use MessageQueue or the journaled functions instead of Store"
+            )
+
+        self.storagePath = storagePath
+        self.flushEvery = flushEvery
+        self.flushSeconds = flushSeconds
+        self.data = {}
+        self.pending = 0  # Mutations not yet on disk
+        self.dirtySince = None
+
+    def __enter__(self):
+        jsonCreate(self.storagePath)
+        self.data = getJsonData(self.storagePath)  # Parsed once for the whole block
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.flush()  # Also on errors: keep what was done before the failure
+        return False
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.mutated()
+
+    def __delitem__(self, key):
+        del self.data[key]
+        self.mutated()
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        """Value for key, or default if absent."""
+        return self.data.get(key, default)
+
+    def keys(self):
+        """Keys in insertion order."""
+        return self.data.keys()
+
+    def items(self):
+        """(key, value) pairs in insertion order."""
+        return self.data.items()
+
+    def discard(self, key):
+        """Delete key if present (no-op otherwise)."""
+        if key in self.data:
+            del self[key]
+
+    def mutated(self):
+        """Count a buffered mutation and flush when a threshold is reached."""
+        self.pending += 1
+        if self.dirtySince is None:
+            self.dirtySince = time.monotonic()
+
+        if (
+            self.pending >= self.flushEvery
+            or time.monotonic() - self.dirtySince >= self.flushSeconds
+        ):
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered mutations to disk as one atomic snapshot.
+
+        Returns:
+            int: Number of mutations flushed (0 if nothing was pending)
+        """
+        flushed = self.pending
+        if flushed:
+            writeSnapshot(self.storagePath, self.data)
+            self.pending = 0
+            self.dirtySince = None
+        return flushed
+
+
 def jsonToCsv(jsonPath, csvPath):
     """
     Export successfully delivered messages from JSON to CSV format for archival.
@@ -229,15 +592,12 @@ def jsonToCsv(jsonPath, csvPath):
         validRow = []  # New deliveries not yet in CSV (after deduplication)
 
         fileCreation(csvPath, headers=["Name", "Status"])
-        with open(jsonPath, "r") as file:
-
-            data = json.load(file)
-            names = list(data.keys())
+        data = getJsonData(jsonPath)  # Snapshot plus journal
 
-            # Extract all messages with successful status code
-            for name in names:
-                if data[name]["Status"] == 201:  # HTTP 201 = successful creation
-                    deliveredList.append([name, "Delivered"])
+        # Extract all messages with successful status code
+        for name in data:
+            if data[name]["Status"] == 201:  # HTTP 201 = successful creation
+                deliveredList.append([name, "Delivered"])
 
         # Deduplication: compare against existing CSV records
         with open("docs/results/delivered.csv", "r", newline="") as csvFile:
@@ -14,110 +14,124 @@ Core Capabilities:
 CLI Usage Examples:
     $ python main.py display --filename "January, 2026 (1)"
     $ python main.py extract
+    $ python main.py extract --engine stream
+    $ python main.py extract --engine xml --incremental
+    $ python main.py batch --source "docs/source/*.xlsx" --engine xml --workers 4
+    $ python main.py import --filename "December, 2025"
+    $ python main.py export --filename "January, 2026"
     $ python main.py fill --filename "January, 2026 (1)"
+    $ python main.py fill --filename "January, 2026 (1)" --gsm7
     $ python main.py send --limit 10
+    $ python main.py send --limit 40 --rate 2 --burst 3 --concurrency 4
+    $ python main.py send --resume 20260130-101500-4242
+    $ python main.py send --resume 20260130-101500-4242 --resend-unknown
     $ python main.py delivery
+    $ python main.py compact
 
 Author: TNS Water Services
 API Provider: TextBee (https://textbee.dev)
 """
 
+from batch_extraction import batchExtract, sheetRecords
+from billing_store import *
 from data_extraction import *
+from incremental_extraction import incrementalExtract
 from tabulate import tabulate
-from templates import tempFilling, formatNumbers
+from number_format import formatNumbers
+from templates import tempFilling
 from jsonSt import *
+from membership import MembershipIndex
+from message_queue import UNKNOWN, MessageQueue
+from send_runs import SendRun
+from textbee import POOL_SIZE, TextBeeClient, recipientMessage
+from async_sender import (
+    AsyncSender,
+    RECIPIENT_BATCH,
+    SEND_BURST,
+    SEND_CONCURRENCY,
+    SEND_RATE,
+    groupRecipients,
+)
+from retry_queue import (
+    FATAL,
+    PERMANENT,
+    RETRY_ATTEMPTS,
+    RETRYABLE,
+    UNCERTAIN,
+    backoffDelay,
+    deadLetter,
+    errorClass,
+)
+from collections import deque
 import argparse
-import csv
+import asyncio
 import os
-import requests
-import time
 import sys
+import time
 
 
 def displayData(fileName, headers):
     """
-    Render customer billing data from CSV file with user-selectable display modes.
+    Render customer billing data from the billing store with user-selectable display modes.
 
     Provides two visualization modes:
     1. Full Mode: Complete tabular display of all customer records
     2. Summary Mode: Aggregated statistics including client counts by location,
-       financial totals, and segmented billing breakdowns
+       financial totals, and segmented billing breakdowns (computed in SQLite)
 
     Args:
-        fileName (str): CSV filename located in docs/results/ (e.g., "January, 2026.csv")
+        fileName (str): CSV filename located in docs/results/ (e.g., "January, 2026.csv").
+            Its stem is the billing period; a period missing from the store or
+            whose CSV changed since it was imported is (re)loaded from this CSV.
         headers (list[str]): Column names for table header row
 
     Returns:
         None: Outputs formatted table directly to console via tabulate
 
     Raises:
-        FileNotFoundError: If specified CSV file doesn't exist
+        FileNotFoundError: If the period is neither stored nor available as CSV
         ValueError: If CSV data contains invalid numeric values
     """
     try:
-        # Configure file path and initialize accumulator variables
-        dataPath = f"docs/results/{fileName}"
-        row = []
-        lumoCli = 0  # Lumo location client count
-        chnkCli = 0  # Chanika location client count
-        currCharges = 0  # Sum of current period charges
-        adjs = 0  # Sum of previous period adjustments/debts
-        sum = 0  # Grand total of all charges
-
-        with open(dataPath, "r") as csvFile:
-
-            reader = csv.reader(csvFile)
-            next(reader)  # Discard header row
-
-            # Parse each customer record and compute running totals
-            for rows in reader:
-                row.append(rows)
-
-                # Segment clients by service location
-                if rows[4] == "Lumo":
-                    lumoCli += 1
-                else:
-                    chnkCli += 1
-
-                # Accumulate financial metrics (columns: netCharge, adjustments, finalBill)
-                currCharges += int(rows[6])
-                adjs += int(rows[7])
-                sum += int(rows[8])
+        # Resolve the billing period and make sure the store matches its CSV
+        period = os.path.splitext(fileName)[0]
+        syncPeriod(period, f"docs/results/{fileName}")
 
-            parameter = input("What should be displayed? (full or summary): ")
-            print("")
+        parameter = input("What should be displayed? (full or summary): ")
+        print("")
 
-            if parameter == "full":
+        if parameter == "full":
 
-                table = tabulate(row, headers, tablefmt="grid")
-                print(table)
+            row = [record.toRow() for record in periodRecords(period)]
+            table = tabulate(row, headers, tablefmt="grid")
+            print(table)
 
-            elif parameter == "summary":
+        elif parameter == "summary":
 
-                clientNum = len(row)
-                headers = ["Details", "Amount"]
-                row = [
-                    ["Lumo clients", lumoCli],
-                    ["Chanika clients", chnkCli],
-                    ["Total clients", clientNum],
-                    ["Current Bills", formatNumbers(currCharges)],
-                    ["Previous debts", formatNumbers(adjs)],
-                    ["Total Bills", formatNumbers(sum)],
-                ]
+            totals = periodSummary(period)
+            headers = ["Details", "Amount"]
+            row = [
+                ["Lumo clients", totals["lumo"]],
+                ["Chanika clients", totals["chanika"]],
+                ["Total clients", totals["clients"]],
+                ["Current Bills", formatNumbers(totals["net"])],
+                ["Previous debts", formatNumbers(totals["adjustments"])],
+                ["Total Bills", formatNumbers(totals["final"])],
+            ]
 
-                table = tabulate(row, headers, tablefmt="grid")
-                print(table)
+            table = tabulate(row, headers, tablefmt="grid")
+            print(table)
 
-            else:
+        else:
 
-                print("Error: Invalid command!")
-                sys.exit(1)
+            print("Error: Invalid command!")
+            sys.exit(1)
 
     except Exception as Error:
         errorDisplay(Error)
 
 
-def extractData(sourcePath):
+def extractData(sourcePath, engine="openpyxl", useCache=True, incremental=False):
     """
     Parse customer billing information from Excel workbook and export to CSV format.
 
@@ -131,36 +145,38 @@ def extractData(sourcePath):
 
     Args:
         sourcePath (str): Absolute or relative path to source Excel file (.xlsx)
+        engine (str): Extraction engine to use:
+            - "openpyxl": Full workbook load with cell offset navigation (default)
+            - "stream": Single read-only pass into a row buffer (lower memory)
+            - "xml": Raw sheet XML parsed from the .xlsx zip, bypassing openpyxl
+        useCache (bool): Reuse records cached for an unchanged workbook and sheet
+            (skips loading the workbook entirely)
+        incremental (bool): Re-parse only boxes that changed since the previously
+            extracted sheet and write a "<Sheet> (diff).csv" of new, changed and
+            removed customers (see incremental_extraction)
 
     Returns:
-        None: Side effects include CSV file creation and JSON storage initialization
+        None: Side effects include billing store and CSV updates and JSON storage
+            initialization
 
     Raises:
         SystemExit: If source file path is invalid or inaccessible
     """
     if os.path.exists(sourcePath):
-        # Initialize extraction context: load workbook and get target worksheet reference
-        workSheet, fileName = envSetup(sourcePath)
-        cell = workSheet["A1"]  # Start iteration from top-left cell
-
-        customerInfo = iterateOnBoxes(cell)
-        fileCreation(
-            fileName,
-            headers=[
-                "Reading Date",
-                "Customer Name",
-                "Contacts",
-                "Communication App",
-                "Location",
-                "Liters Used",
-                "Net Charge",
-                "Adjustments",
-                "Final Bill",
-            ],
-        )
-        # Filter for billable clients: exclude empty records and bills ≤ 50 TZS
-        customerInfo = activeClients(customerInfo)
-        addRows(fileName, customerInfo)
+        if incremental:
+            # Fingerprint boxes against the previous sheet and write CSV + diff
+            incrementalExtract(sourcePath, engine=engine)
+
+        else:
+            # Load the target worksheet with the chosen engine and extract every box
+            customerInfo, fileName = sheetRecords(
+                sourcePath, engine=engine, useCache=useCache
+            )
+
+            # Filter for billable clients: exclude empty records and bills ≤ 50 TZS
+            customerInfo = activeClients(customerInfo)
+            # Store in one transaction and append to the CSV, keeping both in step
+            savePeriod(fileName, customerInfo)
 
         # Initialize persistent JSON storage for message queue and delivery tracking
         jsonCreate("json_storage/data.json")
@@ -172,95 +188,481 @@ def extractData(sourcePath):
         sys.exit(1)
 
 
-def sendMessage(limit):
+def sendMessage(
+    limit,
+    resume=None,
+    rate=SEND_RATE,
+    burst=SEND_BURST,
+    concurrency=SEND_CONCURRENCY,
+    maxRate=None,
+    resendUnknown=False,
+):
     """
     Transmit SMS billing notifications to customers via TextBee Gateway API.
 
     Implements batch message transmission with the following controls:
-    - Automatic rate limiting (1 second delay between requests)
+    - Token-bucket rate limiting (default 1 message per second) with several
+      requests open at once (AsyncSender), so request latency does not add to
+      the spacing between messages
+    - Adaptive rate (AIMD): 429/5xx answers and slow responses cut the rate and
+      throttled requests are resubmitted (Retry-After honoured); healthy
+      responses recover up to the starting rate, or probe up to maxRate when one
+      is given. The end-of-run table reports the final rate, backoff events and
+      effective throughput.
+    - Per-message retries: retryable failures (connection errors, connect
+      timeouts, 429/5xx) are resubmitted with capped, jittered exponential backoff;
+      permanent ones (e.g. an invalid number) go to json_storage/dead_letter.json,
+      which fill reads back. One bad message no longer stops the run. A read
+      timeout or an accepted answer without an smsBatchId is held as unknown
+      instead of being resent (see holdUnknown()).
     - Configurable message limit (default: 40, range: 1-40)
     - Success tracking via JSON persistence
     - Automatic cleanup of successfully sent messages from queue
+    - Safe concurrent senders: messages are leased from a shared MessageQueue
+      in batches of up to RECIPIENT_BATCH, so parallel runs never send the same SMS
+    - Recipient batching: messages with an identical body share one
+      multi-recipient request (still one rate-limit token per recipient)
+    - Checkpointed runs: every message's state is recorded in
+      json_storage/runs/<run>.json so a stopped run can be resumed
+    - One pooled keep-alive connection to the gateway (TextBeeClient) with
+      request timeouts, so a stalled gateway cannot hang the run
 
     Args:
         limit (int | None): Maximum messages to send in this batch.
             - None or invalid values default to 40
             - Values < 1 or > 40 are clamped to valid range
             - Cannot exceed total available recipients
+        resume (str | None): ID of a stopped run to continue. Its limit is
+            reused, in-flight messages are reconciled first (reconcileRun())
+            and only the remainder of the run is sent.
+        rate (float): Starting messages per second
+        burst (int): Messages that may be submitted back-to-back
+        concurrency (int): Maximum requests open at once
+        maxRate (float | None): Highest rate the adaptive controller may probe up
+            to (the starting rate when None)
+        resendUnknown (bool): With resume, send again the run's messages whose
+            outcome is unknown (see reconcileRun()) instead of holding them
 
     Returns:
         None: Updates sent.json with batch IDs and status codes,
               removes successful entries from data.json queue
 
     Raises:
-        HTTPError: If TextBee API returns non-2xx status code
-        KeyError: If environment variables (DEVICE_ID, API_KEY) are undefined
+        HTTPError: If TextBee API rejects the API key or device (401/403)
     """
-    load_dotenv()
-    store = "json_storage/sent.json"
-    storagePath = "json_storage/data.json"
+    run = None
+    # Endpoint URL and auth headers are built once; one pooled connection per request slot
+    client = TextBeeClient(poolSize=max(POOL_SIZE, concurrency))
 
     try:
-        # Construct TextBee REST API endpoint with device identifier
-        baseUrl = "https://api.textbee.dev/api/v1"
-        requestUrl = f"{baseUrl}/gateway/devices/{os.getenv("DEVICE_ID")}/send-sms"
-
-        # Configure authentication and content type headers
-        headers = {
-            "x-api-key": os.getenv("API_KEY"),  # API key for gateway authorization
-            "Content-Type": "application/json",  # JSON payload encoding
-        }
-
-        data = getJsonData(storagePath)
-        names = list(data.keys())
-
-        # Normalize and constrain message limit to acceptable range
-        if limit is not None:
-            # Enforce boundaries: min=1, max=40 or total_recipients (whichever is smaller)
-            if limit > 40 or limit < 1:
-                if limit > len(names):
-                    limit = len(names)
-                else:
-                    limit = 40
-        else:
-            limit = 40
+        if resume is None:
+
+            # Several send processes may share the queue: work is claimed in leased batches
+            available = MessageQueue().pending()
+
+            # Normalize and constrain message limit to acceptable range
+            if limit is not None:
+                # Enforce boundaries: min=1, max=40 or total_recipients (whichever is smaller)
+                if limit > 40 or limit < 1:
+                    if limit > available:
+                        limit = available
+                    else:
+                        limit = 40
+            else:
+                limit = 40
 
-        # Iterate through message queue and transmit each SMS
-        for i in range(limit):
+            run = SendRun.start(limit)
+            print(f"Send run {run.runId} started (resume with: send --resume {run.runId})")
 
-            name = names[i]
-            value = data[name]
-            # Debug output (disabled): print(f"Name: {name}, Contact: {value["Contact"]}, Body: {value["Body"]}")
+        else:
 
-            # Construct TextBee-compliant SMS payload
-            payload = {
-                "message": value["Body"],
-                # "recipients": ["+255773422381"],  # Reserved for testing - production disabled
-                "recipients": [value["Contact"]],  # TextBee API requires array format
-            }
+            run = SendRun.resume(resume)
+            limit = run.limit()
 
-            # Execute HTTP POST request to TextBee gateway
-            response = requests.post(
-                url=requestUrl, headers=headers, data=json.dumps(payload)
-            )
-            response.raise_for_status()  # Raise exception for HTTP errors (4xx/5xx)
-            time.sleep(1)  # Rate control: 1-second inter-request delay
+        # The run ID is the lease owner, so a resumed run takes back its own leases
+        queue = MessageQueue(workerId=run.runId)
+        if resume is not None:
+            reconcileRun(run, queue, client, resendUnknown)
 
-            # Persist transmission metadata for delivery tracking
-            status = {
-                "smsBatchId": response.json()["data"]["smsBatchId"],
-                "Contact": value["Contact"],
-                "Status": response.status_code,
-            }
-            addJsonData(store, name, status)
-            delJsonData(store, storagePath)
+        # Sent/failed customers as of the run start, keyed by name + contact
+        membership = MembershipIndex.load()
 
-            # return response.json()
-            print(f"Request for {name} is sent✅")
+        asyncio.run(
+            sendQueue(
+                run, queue, client, membership, limit, rate, burst, concurrency, maxRate
+            )
+        )
 
     except Exception as Error:
+        if run is not None:
+            print(f"Send run {run.runId} stopped; continue with: send --resume {run.runId}")
         errorDisplay(Error)
 
+    finally:
+        client.close()
+
+
+async def sendQueue(
+    run, queue, client, membership, limit, rate, burst, concurrency, maxRate
+):
+    """
+    Send queued messages through an AsyncSender until the run's limit is reached.
+
+    Claimed messages with an identical body are merged into one multi-recipient
+    request (groupRecipients()). Requests are submitted as soon as the sender
+    allows, while their results are recorded strictly in claim order: sent.json,
+    data.json and the run checkpoint see the same sequence as the serial sender
+    produced.
+
+    At most 2 * concurrency requests are submitted and not yet recorded. Claimed
+    requests beyond that wait their turn in claim order, and nothing new is
+    claimed until they are submitted. Every lease the run holds (waiting,
+    submitted or retrying) is renewed each leaseSeconds / 3, so a long backoff
+    never hands a live run's messages to another worker.
+
+    Failed requests are handled per error class (retry_queue.errorClass()):
+    retryable ones are resubmitted after a jittered exponential backoff (recorded
+    when they finish, out of claim order), permanent ones are moved to the
+    dead-letter store, and a shared request failing permanently is split into one
+    request per recipient first. Requests the gateway may have accepted (read
+    timeout, 2xx without an smsBatchId) are held as unknown rather than resent.
+    Only fatal errors (authentication, unexpected exceptions) stop the run.
+
+    Args:
+        run (SendRun): Run being sent (its accepted messages count towards limit)
+        queue (MessageQueue): Queue owned by the run
+        client (TextBeeClient): Gateway client
+        membership (MembershipIndex): Sent/failed customers as of the run start
+        limit (int): Messages the run should send
+        rate (float): Starting messages per second
+        burst (int): Messages that may be submitted back-to-back
+        concurrency (int): Maximum requests open at once
+        maxRate (float | None): Highest rate the adaptive controller may probe up
+            to (the starting rate when None)
+
+    Returns:
+        None: Prints the rate summary (AsyncSender.summary()) with retry,
+            dead-letter and held counts when the run ends
+
+    Raises:
+        Exception: The first fatal failure (requests.HTTPError 401/403 or an
+            unexpected error), re-raised once every request already submitted
+            has been recorded (their leases are handed back)
+    """
+    sender = AsyncSender(client, rate, burst, concurrency, maxRate)
+    window = 2 * concurrency  # Submitted requests awaiting their turn to be recorded
+    sentCount = len(run.messages("accepted"))
+    runSent = 0  # Accepted in this process (for the throughput summary)
+    retryCount = 0  # Resubmissions after a retryable failure
+    deadCount = 0  # Messages moved to the dead-letter store
+    heldCount = 0  # Messages held with an unknown outcome (holdUnknown())
+    inFlight = deque()  # (customers, task, attempt) per request, in claim order
+    waiting = deque()  # Claimed requests (customers) not submitted yet, in claim order
+    retrying = {}  # task -> (customers, attempt) for resubmitted requests
+    queuedCount = 0  # Customers in inFlight and retrying
+    drained = False
+    fatalError = None
+    renewEvery = queue.leaseSeconds / 3  # Seconds between lease renewals
+    renewedAt = time.monotonic()
+
+    while True:
+
+        # Keep the window full while the run still needs messages
+        while fatalError is None and len(inFlight) < window:
+
+            if waiting:
+                group = waiting.popleft()
+
+                # Debug output (disabled): print(f"Names: {[name for name, _value in group]}, Body: {group[0][1]['Body']}")
+
+                for name, value in group:
+                    run.mark(name, "in-flight", Contact=value["Contact"])
+
+                # Submit the HTTP POST to the TextBee gateway
+                inFlight.append((group, asyncio.create_task(sendGroup(sender, group)), 1))
+                queuedCount += len(group)
+                continue
+
+            if drained or sentCount + queuedCount >= limit:
+                break
+
+            active = [entry[0] for entry in inFlight] + [
+                entry[0] for entry in retrying.values()
+            ]
+
+            # Claim enough messages for identical bodies to share one request
+            batch = queue.claim(
+                min(RECIPIENT_BATCH, limit - sentCount - queuedCount),
+                exclude={name for group in active for name, _value in group},
+            )
+            if not batch:
+                drained = True  # Queue drained (or all remaining messages leased elsewhere)
+                break
+
+            sendable = []
+            for name, value in batch:
+                run.mark(name, "queued", Contact=value["Contact"])
+
+                # Stale entry for a customer already sent (and not failed): drop it
+                if not membership.shouldSend(value.get("Name", name), value["Contact"]):
+                    queue.drop(name)
+                    run.mark(name, "failed", Contact=value["Contact"], error="Already sent")
+                    print(f"{name} was already sent, removed from queue")
+                    continue
+
+                sendable.append((name, value))
+
+            # One request per body: identical messages go out with several recipients
+            waiting.extend(groupRecipients(sendable, RECIPIENT_BATCH))
+
+        if not inFlight and not retrying:
+            break
+
+        # Wait for the oldest request (recorded in claim order) or any resubmission,
+        # waking up in time to renew the run's leases
+        waitFor = set(retrying)
+        if inFlight:
+            waitFor.add(inFlight[0][1])
+        done, _pending = await asyncio.wait(
+            waitFor, timeout=renewEvery, return_when=asyncio.FIRST_COMPLETED
+        )
+
+        if time.monotonic() - renewedAt >= renewEvery:
+            held = [entry[0] for entry in inFlight] + list(waiting)
+            held += [entry[0] for entry in retrying.values()]
+            queue.renew(name for group in held for name, _value in group)
+            renewedAt = time.monotonic()
+
+        finished = []
+        if inFlight and inFlight[0][1] in done:
+            finished.append(inFlight.popleft())
+        for task in done:
+            if task in retrying:
+                group, attempt = retrying.pop(task)
+                finished.append((group, task, attempt))
+
+        for group, task, attempt in finished:
+            queuedCount -= len(group)
+            names = [name for name, _value in group]
+
+            Error = task.exception()
+            kind = errorClass(Error) if Error is not None else None
+            if Error is None:
+                response = task.result()
+                try:
+                    smsBatchId = response.json()["data"]["smsBatchId"]
+                except Exception as ParseError:
+                    # Accepted (2xx) without a batch ID: the SMS may be going out
+                    Error = ValueError(
+                        f"No smsBatchId in the {response.status_code} answer ({ParseError!r})"
+                    )
+                    kind = UNCERTAIN
+
+            if Error is not None:
+
+                if kind == FATAL:
+                    # Claimed requests not submitted yet stop with this one
+                    while waiting:
+                        group = group + waiting.popleft()
+                    names = [name for name, _value in group]
+                    for name, value in group:
+                        run.mark(name, "failed", Contact=value["Contact"], error=str(Error))
+                    queue.release(names)  # Leases back for a later run
+                    fatalError = fatalError or Error
+
+                elif kind == UNCERTAIN:
+                    # Resending could bill twice: hold until the operator checks
+                    for name, value in group:
+                        holdUnknown(run, queue, name, value["Contact"], str(Error))
+                        heldCount += 1
+                        print(f"{name} may have been sent, held as unknown ({Error})")
+
+                elif kind == RETRYABLE and attempt < RETRY_ATTEMPTS:
+                    delay = backoffDelay(attempt)
+                    for name, value in group:
+                        run.mark(
+                            name,
+                            "retrying",
+                            Contact=value["Contact"],
+                            error=str(Error),
+                            attempt=attempt,
+                        )
+                    retryTask = asyncio.create_task(sendGroup(sender, group, delay))
+                    retrying[retryTask] = (group, attempt + 1)
+                    queuedCount += len(group)
+                    retryCount += 1
+                    print(f"Retrying {', '.join(names)} in {delay:.1f}s ({Error})")
+
+                elif kind == PERMANENT and len(group) > 1:
+                    # One bad recipient may fail a shared request: retry each alone
+                    for member in group:
+                        retryTask = asyncio.create_task(sendGroup(sender, [member]))
+                        retrying[retryTask] = ([member], attempt)
+                        queuedCount += 1
+
+                else:
+                    # Permanent failure or retries exhausted: park it, keep sending
+                    for name, value in group:
+                        deadLetter(name, value, Error, attempt)
+                        queue.drop(name)
+                        run.mark(
+                            name, "dead-letter", Contact=value["Contact"], error=str(Error)
+                        )
+                        deadCount += 1
+                        print(f"{name} moved to the dead-letter store ({Error})")
+
+                continue
+
+            # Every customer of the request shares its batch ID (delivery looks up
+            # the customer's own recipient in the batch)
+            for name, value in group:
+
+                # Checkpoint the batch ID before anything else can fail
+                run.mark(name, "in-flight", Contact=value["Contact"], smsBatchId=smsBatchId)
+
+                # Persist transmission metadata for delivery tracking
+                status = {
+                    "smsBatchId": smsBatchId,
+                    "Name": value.get("Name", name),
+                    "Contact": value["Contact"],
+                    "Status": response.status_code,
+                }
+                queue.ack(name, status)  # sent.json + dequeue, under the queue lock
+                run.mark(name, "accepted", Contact=value["Contact"], smsBatchId=smsBatchId)
+                sentCount += 1
+                runSent += 1
+
+                print(f"Request for {name} is sent✅")
+
+    summary = sender.summary(runSent) + [
+        ["Retries", retryCount],
+        ["Dead-lettered", deadCount],
+        ["Held (Outcome Unknown)", heldCount],
+    ]
+    print(tabulate(summary, ["Details", "Amount"], tablefmt="grid"))
+
+    if fatalError is not None:
+        raise fatalError
+
+
+async def sendGroup(sender, group, delay=0.0):
+    """
+    Submit one request for a group of customers sharing a message body.
+
+    Args:
+        sender (AsyncSender): Rate-limited sender
+        group (list[tuple[str, dict]]): (queue key, message) pairs with one body
+        delay (float): Backoff in seconds before the request joins the sender
+            (no sender slot is held while waiting)
+
+    Returns:
+        requests.Response: Gateway response
+    """
+    if delay:
+        await asyncio.sleep(delay)
+    return await sender.send(
+        group[0][1]["Body"],
+        # ["+255773422381"],  # Reserved for testing - production disabled
+        [value["Contact"] for _name, value in group],  # TextBee API requires array format
+    )
+
+
+def reconcileRun(run, queue, client, resendUnknown=False):
+    """
+    Settle the in-flight messages of a stopped run before it is resumed.
+
+    Args:
+        run (SendRun): Run being resumed
+        queue (MessageQueue): Queue owned by the run
+        client (TextBeeClient): Gateway client of the run
+        resendUnknown (bool): Send messages with an unknown outcome again
+
+    Returns:
+        None: Each in-flight message ends up accepted (acknowledged in the queue),
+            failed (left in the queue to be sent again) or unknown (held)
+
+    Note:
+        A message with a checkpointed smsBatchId reached the gateway, so its batch
+        status decides: anything but "failed" is acknowledged without resending. A
+        message without one stopped during the POST itself: the gateway may have
+        accepted it, so it is held as unknown (holdUnknown()) rather than risking a
+        second bill. With resendUnknown it is sent again instead, together with
+        the messages held by earlier attempts of the run.
+    """
+    for name, entry in run.messages("in-flight").items():
+
+        if "smsBatchId" not in entry:
+            if resendUnknown:
+                run.mark(
+                    name,
+                    "failed",
+                    Contact=entry["Contact"],
+                    error="Stopped before the gateway answered; resent on request",
+                )
+            else:
+                holdUnknown(
+                    run, queue, name, entry["Contact"], "Stopped before the gateway answered"
+                )
+            continue
+
+        # Look up what the gateway did with the batch
+        batchID = entry["smsBatchId"]
+        messages = client.smsBatch(batchID)["messages"]
+        batchStatus = recipientMessage(messages, entry["Contact"])["status"]
+
+        if batchStatus == "failed":
+            run.mark(name, "failed", Contact=entry["Contact"], error="Batch failed")
+
+        else:
+            status = {"smsBatchId": batchID, "Contact": entry["Contact"], "Status": 201}
+            queue.ack(name, status)
+            run.mark(name, "accepted", Contact=entry["Contact"], smsBatchId=batchID)
+            print(f"Request for {name} was already sent✅")
+
+    held = run.messages("unknown")
+    if resendUnknown:
+        for name, entry in held.items():
+            value = {"Name": entry.get("Name", name), "Contact": entry["Contact"]}
+            queue.requeue(name, {**value, "Body": entry["Body"]})
+            run.mark(name, "failed", Contact=entry["Contact"], error="Resent on request")
+        if held:
+            print(f"{len(held)} messages with an unknown outcome queued again")
+
+    elif held:
+        print(
+            f"{len(held)} messages may or may not have reached the gateway and are held "
+            f"(not resent). Check the gateway, then resend them with: "
+            f"send --resume {run.runId} --resend-unknown"
+        )
+
+
+def holdUnknown(run, queue, name, contact, error):
+    """
+    Hold a message that may have been sent but has no smsBatchId.
+
+    Args:
+        run (SendRun): Run that sent the message
+        queue (MessageQueue): Queue owned by the run
+        name (str): Queue key
+        contact (str): Customer contact
+        error (str): Why the outcome is unknown
+
+    Returns:
+        None: The message leaves data.json with Status "unknown" in sent.json
+            (MessageQueue.hold()) and the run marks it "unknown" with its body, so
+            `send --resume <run> --resend-unknown` can queue it again
+    """
+    status = {"smsBatchId": None, "Contact": contact, "Status": UNKNOWN}
+    value = queue.hold(name, status) or {}
+    run.mark(
+        name,
+        "unknown",
+        Name=value.get("Name", name),
+        Contact=contact,
+        Body=value.get("Body"),
+        error=error,
+    )
+
 
 def deliveryMessage():
     """
@@ -286,15 +688,23 @@ def deliveryMessage():
     Side Effects:
         - Creates/updates delivery.json with status metadata
         - Creates/updates failed.csv with undelivered message records
+
+    Note:
+        All status queries share one pooled TextBeeClient session with timeouts.
+        Customers sent in one multi-recipient request share an smsBatchId; the
+        batch is fetched once and each customer's status is read from the
+        message addressed to their contact.
     """
+    client = TextBeeClient()
+
     try:
         # Configure storage paths and load transmission history
         sentPath = "json_storage/sent.json"
         deliveryPath = "json_storage/delivery.json"
         sentClients = getJsonData(sentPath)
+        membership = MembershipIndex.load()  # Already delivered customers are skipped
 
-        # Ensure tracking files exist
-        jsonCreate(deliveryPath)
+        # Ensure tracking files exist (Store creates delivery.json)
         fileCreation("failed", headers=["Name", "Status"])
 
         # Initialize status category counters
@@ -304,61 +714,67 @@ def deliveryMessage():
         deliveryCount = 0  # Successfully delivered to device
         pendingCount = 0  # Awaiting carrier processing
         unknownCount = 0  # Status unavailable
+        heldCount = 0  # Held by the sender: no batch to query (MessageQueue.hold())
         failedList = []  # Records requiring retry attention
+        batches = {}  # smsBatchId -> batch messages (multi-recipient batches are fetched once)
 
-        # Query TextBee API for each transmitted message batch
-        for clients in sentClients.keys():
+        with Store(deliveryPath) as delivery:  # Status writes flushed in batches
 
-            # Construct batch status query endpoint using stored batch ID
-            baseUrl = "https://api.textbee.dev/api/v1"
-            batchID = sentClients[clients]["smsBatchId"]
-            requestUrl = f"{baseUrl}/gateway/devices/{os.getenv("DEVICE_ID")}/sms-batch/{batchID}"
-            headers = {
-                "x-api-key": os.getenv("API_KEY"),  # Authentication token
-            }
+            # Query TextBee API for each transmitted message batch
+            for clients in sentClients.keys():
 
-            # Execute GET request to retrieve current message status
-            response = requests.get(url=requestUrl, headers=headers)
-            response.raise_for_status()  # Validate HTTP success
+                # Confirmed deliveries are final: count them without another API call
+                customer = sentClients[clients].get("Name", clients)
+                if membership.isDelivered(customer, sentClients[clients]["Contact"]):
+                    deliveryCount += 1
+                    totalCount += 1
+                    continue
 
-            deliveryStatus = response.json()
+                # Query the current message status using the stored batch ID
+                batchID = sentClients[clients]["smsBatchId"]
+                if batchID is None:
+                    heldCount += 1
+                    continue
 
-            # Parse status from response and update category counters
-            if deliveryStatus["data"]["messages"][0]["status"] == "sent":
-                sentCount += 1  # Carrier accepted but not yet delivered
+                if batchID not in batches:
+                    batches[batchID] = client.smsBatch(batchID)["messages"]
 
-            elif deliveryStatus["data"]["messages"][0]["status"] == "failed":
-                failedList.append(
-                    [clients, deliveryStatus["data"]["messages"][0]["status"]]
-                )
-                failedCount += 1
+                # The customer's own message within the (possibly shared) batch
+                message = recipientMessage(batches[batchID], sentClients[clients]["Contact"])
 
-            elif deliveryStatus["data"]["messages"][0]["status"] == "delivered":
-                deliveryCount += 1
+                # Parse status from response and update category counters
+                if message["status"] == "sent":
+                    sentCount += 1  # Carrier accepted but not yet delivered
 
-            elif deliveryStatus["data"]["messages"][0]["status"] == "pending":
-                pendingCount += 1
+                elif message["status"] == "failed":
+                    failedList.append([clients, message["status"]])
+                    failedCount += 1
 
-            elif deliveryStatus["data"]["messages"][0]["status"] == "unknown":
-                failedList.append(
-                    [clients, deliveryStatus["data"]["messages"][0]["status"]]
-                )
-                unknownCount += 1
+                elif message["status"] == "delivered":
+                    deliveryCount += 1
+
+                elif message["status"] == "pending":
+                    pendingCount += 1
 
-            totalCount += 1
+                elif message["status"] == "unknown":
+                    failedList.append([clients, message["status"]])
+                    unknownCount += 1
 
-            value = {
-                "type": deliveryStatus["data"]["messages"][0]["type"],
-                "status": deliveryStatus["data"]["messages"][0]["status"],
-            }
+                totalCount += 1
 
-            addJsonData(deliveryPath, clients, value)
-            print(f"{clients} checked ✅")
+                value = {
+                    "type": message["type"],
+                    "status": message["status"],
+                }
+
+                delivery[clients] = value
+                print(f"{clients} checked ✅")
 
         addRows("failed", failedList)  # Export failed messages for manual review
 
         # Compile delivery statistics with calculated success rates
         headers = ["Details", "Amount"]
+        checked = totalCount or 1  # Every entry held: report 0%, not divide by zero
         row = [
             ["Total Clients", totalCount],
             ["SMS Sent", sentCount + deliveryCount],
@@ -366,12 +782,13 @@ def deliveryMessage():
             ["SMS Failed", failedCount],
             ["SMS Pending", pendingCount],
             ["Unknown Status", unknownCount],
+            ["Held (Outcome Unknown)", heldCount],
             [
                 "Sent Percent",
-                round((((sentCount + deliveryCount) / totalCount) * 100), 2),
+                round((((sentCount + deliveryCount) / checked) * 100), 2),
             ],
-            ["Delivered Percent", round(((deliveryCount / totalCount) * 100), 2)],
-            ["Failed Percent", round(((failedCount / totalCount) * 100), 2)],
+            ["Delivered Percent", round(((deliveryCount / checked) * 100), 2)],
+            ["Failed Percent", round(((failedCount / checked) * 100), 2)],
         ]
 
         table = tabulate(row, headers, tablefmt="grid")
@@ -380,6 +797,9 @@ def deliveryMessage():
     except Exception as Error:
         errorDisplay(Error)
 
+    finally:
+        client.close()
+
 
 def main():
     """
@@ -388,9 +808,12 @@ def main():
     Handles command-line arguments and routes to appropriate functions for:
     - Displaying billing data
     - Extracting data from Excel
+    - Batch extracting many sheets/workbooks in parallel
+    - Importing/exporting billing CSVs to/from the billing store
     - Filling message templates
     - Sending SMS messages
     - Checking delivery status
+    - Compacting the JSON queue journals
     """
     # Configure CLI argument parser
     parser = argparse.ArgumentParser(
@@ -401,7 +824,7 @@ def main():
     parser.add_argument(
         "argument",
         type=str,
-        help="Action to for the program to do (display, extract, fill, send or deliver)",
+        help="Action to for the program to do (display, extract, batch, import, export, fill, send, deliver or compact)",
     )
     parser.add_argument(  # This is for display argument
         "--filename",
@@ -413,29 +836,129 @@ def main():
         type=int,
         help="A number to show amount required for the earlier argument",
     )
+    parser.add_argument(  # This is for extract argument
+        "--engine",
+        type=str,
+        choices=["openpyxl", "stream", "xml"],
+        default="openpyxl",
+        help="Excel extraction engine (openpyxl loads the full workbook, stream reads it once read-only, xml parses the sheet XML directly)",
+    )
+    parser.add_argument(  # This is for extract and batch arguments
+        "--no-cache",
+        action="store_true",
+        help="Re-parse the workbook even if its extracted records are cached",
+    )
+    parser.add_argument(  # This is for extract argument
+        "--incremental",
+        action="store_true",
+        help="Re-parse only boxes changed since the previous sheet and write a diff CSV",
+    )
+    parser.add_argument(  # This is for send argument
+        "--resume",
+        type=str,
+        help="Continue a stopped send run by its ID (printed when the run starts)",
+    )
+    parser.add_argument(  # This is for send argument
+        "--resend-unknown",
+        action="store_true",
+        help="With --resume: send again messages that may or may not have reached the gateway (held by default to avoid double billing)",
+    )
+    parser.add_argument(  # This is for send argument
+        "--rate",
+        type=float,
+        default=SEND_RATE,
+        help="Messages per second the sender starts at (token bucket refill rate; backs off on 429/5xx, recovers up to --max-rate)",
+    )
+    parser.add_argument(  # This is for send argument
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Highest rate the sender may probe up to while the gateway stays healthy (default: --rate, i.e. never faster than configured)",
+    )
+    parser.add_argument(  # This is for send argument
+        "--burst",
+        type=int,
+        default=SEND_BURST,
+        help="Messages the sender may submit back-to-back (token bucket size)",
+    )
+    parser.add_argument(  # This is for send argument
+        "--concurrency",
+        type=int,
+        default=SEND_CONCURRENCY,
+        help="Maximum TextBee requests open at the same time",
+    )
+    parser.add_argument(  # This is for batch argument
+        "--source",
+        type=str,
+        default="docs/source/*.xlsx",
+        help="Workbook path or glob pattern to extract in batch mode",
+    )
+    parser.add_argument(  # This is for batch argument
+        "--sheets",
+        type=str,
+        nargs="*",
+        help="Exact sheet names to extract in batch mode (all sheets if omitted)",
+    )
+    parser.add_argument(  # This is for fill argument
+        "--gsm7",
+        action="store_true",
+        help="Transliterate smart quotes, dashes and accents so messages stay in GSM-7 (fewer SMS segments)",
+    )
+    parser.add_argument(  # This is for batch and fill arguments
+        "--workers",
+        type=int,
+        help="Number of worker processes for batch extraction and fill rendering (defaults to CPU count)",
+    )
 
     args = parser.parse_args()
 
     # Route to appropriate function based on command argument
     if args.argument == "display":
 
-        headers = [
-            "Reading Date",
-            "Customer Name",
-            "Contacts",
-            "Communication App",
-            "Location",
-            "Liters Used",
-            "Net Charge",
-            "Adjustments",
-            "Final Bill",
-        ]
-
-        displayData(f"{args.filename}.csv", headers)
+        displayData(f"{args.filename}.csv", BILLING_HEADERS)
 
     elif args.argument == "extract":
 
-        extractData("docs/source/source_data.xlsx")
+        extractData(
+            "docs/source/source_data.xlsx",
+            args.engine,
+            not args.no_cache,
+            args.incremental,
+        )
+
+    elif args.argument == "batch":
+
+        batchExtract(
+            args.source, args.sheets, args.engine, args.workers, not args.no_cache
+        )
+        jsonCreate("json_storage/data.json")
+        jsonCreate("json_storage/sent.json")
+
+    elif args.argument == "import":
+
+        count = importCsv(f"docs/results/{args.filename}.csv")
+        print(f"Imported {count} new records of '{args.filename}' into the billing store✅")
+
+    elif args.argument == "export":
+
+        count = exportCsv(
+            args.filename, f"docs/results/{args.filename}.csv", BILLING_HEADERS
+        )
+        print(f"Exported {count} records of '{args.filename}' from the billing store✅")
+
+    elif args.argument == "compact":
+
+        # Queue stores compact under the queue lock, so running senders just wait
+        counts = MessageQueue().compact()
+        for storagePath in [
+            "json_storage/delivery.json",
+            "json_storage/dead_letter.json",
+        ]:
+            if os.path.exists(storagePath):
+                counts[storagePath] = jsonCompact(storagePath)
+
+        for storagePath, count in counts.items():
+            print(f"Compacted {count} journal entries into {storagePath}✅")
 
     elif args.argument == "fill":
 
@@ -443,11 +966,21 @@ def main():
             datetime.today(),
             f"docs/results/{args.filename}.csv",
             "docs/results/failed.csv",
+            args.workers,
+            gsm7=args.gsm7,
         )
 
     elif args.argument == "send":
 
-        sendMessage(args.limit)
+        sendMessage(
+            args.limit,
+            args.resume,
+            args.rate,
+            args.burst,
+            args.concurrency,
+            args.max_rate,
+            args.resend_unknown,
+        )
 
     elif args.argument == "delivery":
 
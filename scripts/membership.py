@@ -0,0 +1,172 @@
+"""Customer Membership Index for Skip and Retry Decisions.
+
+fill, send and delivery all need to know, per customer, whether a message was already
+sent, whether it failed and should be retried, and whether it was delivered. This
+module builds that answer once per run as hash sets keyed by a normalised customer key,
+so every decision is an O(1) lookup and two customers sharing a name are never
+confused.
+
+Customer Key:
+    customerKey(name, contact) = casefolded, whitespace-collapsed name + contact digits
+
+        customerKey("John  Doe", "+255 712-345-678") == customerKey("john doe", "+255712345678")
+
+Sources (read once by MembershipIndex.load()):
+    * sent.json: {queue key: {"Name", "Contact", "Status", ...}}. Status 201 marks the
+      customer as sent, and so does "unknown" (held by the sender, see
+      MessageQueue.hold()): fill must not queue a message that may have gone out.
+      Older entries without "Name" use the queue key as the name.
+    * delivery.json: {queue key: {"status"}}; "delivered" marks delivered,
+      "failed"/"unknown" marks failed
+    * failed.csv: Name,Status rows written by deliveryMessage(); marks failed
+    * dead_letter.json: {queue key: {"Name", "Contact", ...}} messages the sender
+      gave up on (see retry_queue); their customers were never sent, so fill
+      queues them again and clears the entries
+
+    delivery.json and failed.csv only carry the queue key, which is resolved to a
+    customer through sent.json.
+
+Queue Keys:
+    Messages are queued under the customer name. When one period has several
+    customers with the same name but different contacts, queueKey() adds the contact
+    ("John Doe (+255712345678)") so their messages do not overwrite each other.
+
+Decisions:
+    * shouldSend(): not yet sent, or failed and not delivered since (retry)
+    * isDelivered(): final "delivered" status already recorded
+    * deadLetterKey(): dead-letter entry of a customer, if any
+"""
+
+from jsonSt import getJsonData
+from message_queue import UNKNOWN
+import csv
+import os
+import re
+
+STORAGE_DIR = "json_storage"
+FAILED_CSV = "docs/results/failed.csv"
+
+
+def customerKey(name, contact):
+    """
+    Normalise a customer's identity.
+
+    Args:
+        name (str | None): Customer name as written in the workbook
+        contact (str | None): Phone number in any spacing/punctuation
+
+    Returns:
+        tuple[str, str]: (normalised name, "+" and digits of the contact)
+    """
+    name = " ".join((name or "").split()).casefold()
+    contact = re.sub(r"[^\d+]", "", contact or "")
+    return (name, contact)
+
+
+def queueKey(name, contact, repeatedNames):
+    """
+    Key under which a customer's message is queued in data.json.
+
+    Args:
+        name (str): Customer name
+        contact (str): Customer contact
+        repeatedNames (set[str]): Names shared by customers with different contacts
+
+    Returns:
+        str: The name, or "Name (contact)" for repeated names
+    """
+    return f"{name} ({contact})" if name in repeatedNames else name
+
+
+class MembershipIndex:
+    """Sent, failed and delivered customer sets built once per run."""
+
+    def __init__(self, sent=(), failed=(), delivered=(), deadLetters=None):
+        """
+        Args:
+            sent (Iterable[tuple]): Customer keys with an accepted message
+            failed (Iterable[tuple]): Customer keys with a failed delivery
+            delivered (Iterable[tuple]): Customer keys with a delivered message
+            deadLetters (dict[tuple, str] | None): Customer key -> dead-letter
+                queue key
+        """
+        self.sent = set(sent)
+        self.failed = set(failed)
+        self.delivered = set(delivered)
+        self.deadLetters = dict(deadLetters or {})
+
+    @classmethod
+    def load(cls, storageDir=STORAGE_DIR, failedCsv=FAILED_CSV):
+        """
+        Build the index from sent.json, delivery.json, failed.csv and
+        dead_letter.json.
+
+        Args:
+            storageDir (str): Folder containing the JSON stores
+            failedCsv (str): Failed delivery export
+
+        Returns:
+            MembershipIndex: Index over all four sources (missing files count
+                as empty)
+        """
+        index = cls()
+
+        sentPath = os.path.join(storageDir, "sent.json")
+        sentData = getJsonData(sentPath) if os.path.exists(sentPath) else {}
+
+        # Queue key -> customer key, to resolve delivery.json and failed.csv
+        customers = {}
+        for key, entry in sentData.items():
+            customers[key] = customerKey(entry.get("Name", key), entry.get("Contact"))
+            if entry.get("Status") in (201, UNKNOWN):
+                index.sent.add(customers[key])
+
+        deliveryPath = os.path.join(storageDir, "delivery.json")
+        if os.path.exists(deliveryPath):
+            for key, entry in getJsonData(deliveryPath).items():
+                if key not in customers:
+                    continue
+                if entry["status"] == "delivered":
+                    index.delivered.add(customers[key])
+                elif entry["status"] in ("failed", "unknown"):
+                    index.failed.add(customers[key])
+
+        if os.path.exists(failedCsv):
+            with open(failedCsv, "r", newline="") as csvFile:
+                reader = csv.reader(csvFile)
+                next(reader, None)  # Discard header row
+                for row in reader:
+                    if row and row[0] in customers:
+                        index.failed.add(customers[row[0]])
+
+        # A later delivery supersedes an earlier failure
+        index.failed -= index.delivered
+
+        deadLetterPath = os.path.join(storageDir, "dead_letter.json")
+        if os.path.exists(deadLetterPath):
+            for key, entry in getJsonData(deadLetterPath).items():
+                index.deadLetters[customerKey(entry["Name"], entry["Contact"])] = key
+
+        return index
+
+    def shouldSend(self, name, contact):
+        """
+        Whether a customer should get a message in this run.
+
+        Args:
+            name (str): Customer name
+            contact (str): Customer contact
+
+        Returns:
+            bool: True for customers never sent, or failed and not delivered since
+        """
+        key = customerKey(name, contact)
+        return key not in self.sent or key in self.failed
+
+    def isDelivered(self, name, contact):
+        """Whether delivery of this customer's message is already confirmed."""
+        return customerKey(name, contact) in self.delivered
+
+    def deadLetterKey(self, name, contact):
+        """Queue key of the customer's dead-letter entry, or None."""
+        return self.deadLetters.get(customerKey(name, contact))
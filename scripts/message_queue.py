@@ -0,0 +1,287 @@
+"""Lease-Based Message Queue Shared by Concurrent Senders.
+
+Lets several `main.py send` processes drain json_storage/data.json at the same time
+without sending anyone two SMS or losing a status write. Workers claim leases on
+batches of customers, send them, and acknowledge each one:
+
+    claim(n) --> [(name, message), ...] leased to this worker until expiry
+    ack(name, status) --> status recorded in sent.json; 201 also dequeues the message
+    release(names) --> give unsent leases back (e.g. after an error)
+    renew(names) --> extend leases of messages still being sent
+    enqueue(items) --> add prepared messages with one journal write
+    drop(*names) --> discard queued messages that must not be sent
+    hold(name, status) --> park a message whose outcome is unknown (see below)
+    requeue(name, value) --> put a held message back to be sent again
+    compact() --> fold the three stores' journals into their snapshots
+
+Storage (all under json_storage/, journaled via jsonSt):
+    * data.json: Pending messages {"Name": {"Contact", "Body"}}
+    * sent.json: Transmission log {"Name": {"smsBatchId", "Contact", "Status"}}
+    * leases.json: Active leases {"Name": {"worker": "host-pid", "expires": epoch}}
+    * queue.lock: Lock file; every claim/ack/release runs under an exclusive
+      fcntl.flock, so the three stores always change together. It is jsonSt's
+      store lock for these files (jsonSt.storeLock), so journal appends and
+      compactions by other code wait for it too
+
+Lease Expiry:
+    A worker that dies never acknowledges its batch. Its leases expire after
+    leaseSeconds and those customers become claimable again, so at worst a crashed
+    worker's in-flight message is sent twice, never silently dropped. A live worker
+    that holds messages for long (retry backoff, claimed messages waiting for a
+    free request slot) renews its leases well before they expire.
+
+Unknown Outcomes:
+    A request that may have reached the gateway without an answer to show for it
+    (the process stopped during the POST) must not be sent again automatically, or
+    the customer could be billed twice. hold() records it in sent.json with
+    Status "unknown" and takes it out of data.json, so neither this worker, another
+    worker after the lease expires, nor the next fill queues it again. An operator
+    who has checked the gateway resends it with `send --resume <run>
+    --resend-unknown`, which calls requeue().
+
+Note:
+    Each operation re-reads the stores under the lock instead of caching them,
+    because other workers change them between calls. Updates are single journal
+    appends, so an ack costs one small write per store.
+"""
+
+from jsonSt import (
+    addJsonBatch,
+    addJsonData,
+    getJsonData,
+    jsonCompact,
+    jsonCreate,
+    removeJsonData,
+    storeLock,
+)
+from contextlib import contextmanager
+import os
+import socket
+import time
+
+QUEUE_DIR = "json_storage"
+UNKNOWN = "unknown"  # sent.json Status of a held message (see hold())
+
+
+class MessageQueue:
+    """Message queue over data.json/sent.json with leases and an OS file lock."""
+
+    def __init__(self, directory=QUEUE_DIR, leaseSeconds=300, workerId=None):
+        """
+        Args:
+            directory (str): Folder containing data.json and sent.json
+            leaseSeconds (float): How long a claim stays exclusive to its worker
+            workerId (str | None): Lease owner name (defaults to "<host>-<pid>").
+                A worker may re-claim its own unexpired leases, so a resumed send
+                run reuses its run ID here.
+        """
+        self.dataPath = os.path.join(directory, "data.json")
+        self.sentPath = os.path.join(directory, "sent.json")
+        self.leasePath = os.path.join(directory, "leases.json")
+        self.lockPath = os.path.join(directory, "queue.lock")
+        self.leaseSeconds = leaseSeconds
+        self.workerId = workerId or f"{socket.gethostname()}-{os.getpid()}"
+
+        for storagePath in (self.dataPath, self.sentPath, self.leasePath):
+            jsonCreate(storagePath)
+
+    @contextmanager
+    def locked(self):
+        """Hold the queue's exclusive OS lock for the duration of the block."""
+        with storeLock(self.dataPath):  # queue.lock, shared with jsonSt's writes
+            yield
+
+    def claim(self, count, exclude=()):
+        """
+        Lease up to count unclaimed messages to this worker.
+
+        Args:
+            count (int): Maximum number of messages to lease
+            exclude (Container[str]): Names this worker already holds and is still
+                sending, so its own leases are not handed out twice
+
+        Returns:
+            list[tuple[str, dict]]: (customer name, {"Contact", "Body"}) pairs in
+                queue order; empty when nothing is claimable
+        """
+        with self.locked():
+            now = time.time()
+            queue = getJsonData(self.dataPath)
+            leases = getJsonData(self.leasePath)
+
+            batch = []
+            for name, value in queue.items():
+                if len(batch) >= count:
+                    break
+                if name in exclude:
+                    continue
+                lease = leases.get(name)
+                if (
+                    lease is not None
+                    and lease["expires"] > now
+                    and lease["worker"] != self.workerId
+                ):
+                    continue  # Held by another live worker
+                addJsonData(
+                    self.leasePath,
+                    name,
+                    {"worker": self.workerId, "expires": now + self.leaseSeconds},
+                )
+                batch.append((name, value))
+
+            return batch
+
+    def ack(self, name, status):
+        """
+        Record a transmission result and end the lease.
+
+        Args:
+            name (str): Customer name from claim()
+            status (dict): {"smsBatchId", "Contact", "Status"} entry for sent.json
+
+        Returns:
+            None: Writes sent.json; a 201 (accepted) status also removes the
+                message from data.json so it is never sent again
+        """
+        with self.locked():
+            addJsonData(self.sentPath, name, status)
+            if status["Status"] == 201:  # 201 = "Created" (successful API acceptance)
+                removeJsonData(self.dataPath, name)
+            removeJsonData(self.leasePath, name)
+
+    def enqueue(self, items):
+        """
+        Add prepared messages to data.json with a single journal write.
+
+        Args:
+            items (Iterable[tuple[str, dict]]): (queue key, message) pairs; a key
+                already queued is replaced
+
+        Returns:
+            None
+        """
+        with self.locked():
+            addJsonBatch(self.dataPath, items)
+
+    def drop(self, *names):
+        """
+        Remove messages from the queue without sending them.
+
+        Args:
+            *names (str): Queue keys (from claim() or found in data.json); keys no
+                longer queued are ignored
+
+        Returns:
+            None: Deletes the messages from data.json and ends their leases
+        """
+        with self.locked():
+            leases = getJsonData(self.leasePath)
+            for name in names:
+                removeJsonData(self.dataPath, name)
+                if name in leases:
+                    removeJsonData(self.leasePath, name)
+
+    def hold(self, name, status):
+        """
+        Park a leased message whose outcome is unknown.
+
+        Args:
+            name (str): Queue key from claim()
+            status (dict): sent.json entry ({"smsBatchId": None, "Contact",
+                "Status": UNKNOWN}); "Name" is taken from the queued message
+
+        Returns:
+            dict | None: The message removed from data.json ({"Contact", "Body",
+                ...}), or None if it was no longer queued
+        """
+        with self.locked():
+            value = getJsonData(self.dataPath).get(name)
+            if value is not None:
+                status = {"Name": value.get("Name", name), **status}
+            addJsonData(self.sentPath, name, status)
+            removeJsonData(self.dataPath, name)
+            removeJsonData(self.leasePath, name)
+            return value
+
+    def requeue(self, name, value):
+        """
+        Queue a held message again and forget its unknown status.
+
+        Args:
+            name (str): Queue key
+            value (dict): Message as returned by hold()
+
+        Returns:
+            None
+        """
+        with self.locked():
+            addJsonData(self.dataPath, name, value)
+            removeJsonData(self.sentPath, name)
+
+    def renew(self, names):
+        """
+        Extend this worker's leases on messages it is still sending.
+
+        Args:
+            names (Iterable[str]): Queue keys from claim()
+
+        Returns:
+            int: Number of leases extended; a lease that expired and was taken
+                over by another worker is left alone
+        """
+        with self.locked():
+            now = time.time()
+            leases = getJsonData(self.leasePath)
+            count = 0
+            for name in names:
+                lease = leases.get(name)
+                if lease is None or lease["worker"] != self.workerId:
+                    continue
+                addJsonData(
+                    self.leasePath,
+                    name,
+                    {"worker": self.workerId, "expires": now + self.leaseSeconds},
+                )
+                count += 1
+            return count
+
+    def release(self, names):
+        """
+        Return leased messages to the queue without sending them.
+
+        Args:
+            names (Iterable[str]): Customer names leased by this worker
+
+        Returns:
+            None
+        """
+        with self.locked():
+            leases = getJsonData(self.leasePath)
+            for name in names:
+                lease = leases.get(name)
+                if lease is not None and lease["worker"] == self.workerId:
+                    removeJsonData(self.leasePath, name)
+
+    def compact(self):
+        """
+        Fold the journals of data.json, sent.json and leases.json into their snapshots.
+
+        Returns:
+            dict[str, int]: Journal entries folded in, keyed by store path. All three
+                are compacted under one lock, so no worker sees them half-compacted
+        """
+        with self.locked():
+            return {
+                storagePath: jsonCompact(storagePath)
+                for storagePath in (self.dataPath, self.sentPath, self.leasePath)
+            }
+
+    def pending(self):
+        """
+        Count messages still queued (leased or not).
+
+        Returns:
+            int: Number of entries in data.json
+        """
+        with self.locked():
+            return len(getJsonData(self.dataPath))
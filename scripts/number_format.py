@@ -0,0 +1,49 @@
+"""Locale-Free Number Formatting for SMS Messages.
+
+Formats billing amounts and water usage with British English conventions (comma as
+thousands separator, period as decimal point) without touching the process locale:
+
+    * float: "1,234.6" (1 decimal place)
+    * int: "5,000" (no decimal places)
+
+Why Not locale:
+    locale.setlocale() changes process-global state, is not thread-safe, is slow
+    enough to show up once per number, and raises locale.Error on hosts where
+    en_GB.UTF-8 is not installed. Python's "," format option produces the same
+    grouping for en_GB, so no locale is needed.
+
+Memoization:
+    Bills repeat a lot (fixed charges, zero adjustments), so results are cached per
+    (value, type). typed=True keeps 5000 and 5000.0 apart, since they format
+    differently. functools.lru_cache is thread-safe, and every process simply has
+    its own cache.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096, typed=True)
+def formatNumbers(num):
+    """
+    Apply thousands separators to numeric values for SMS display.
+
+    Args:
+        num (int | float): Numeric value to format (billing amounts or usage metrics)
+
+    Returns:
+        str: Formatted number string:
+            - float: "1,234.5" (exactly 1 decimal place)
+            - int: "5,000" (no decimal places)
+
+    Examples:
+        >>> formatNumbers(5000)
+        "5,000"
+        >>> formatNumbers(1234.567)
+        "1,234.6"
+        >>> formatNumbers(-1857)
+        "-1,857"
+    """
+    if isinstance(num, float):
+        return f"{num:,.1f}"
+    else:
+        return f"{int(num):,d}"
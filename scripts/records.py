@@ -0,0 +1,148 @@
+"""Typed Customer Billing Record.
+
+Defines CustomerRecord, the single in-memory representation of one customer's billing
+data shared by every stage of the pipeline (extraction, filtering, display, templating).
+
+Extraction builds records with native types, and text conversion happens only at the
+CSV boundary:
+
+    Excel box --boxRecord()--> CustomerRecord --toRow()--> docs/results/<Sheet>.csv
+    docs/results/<Sheet>.csv --fromRow()--> CustomerRecord --> display / fill
+
+Fields (in CSV column order):
+    * date (datetime): Reading date (CSV: "DD-Mon-YYYY")
+    * name (str | None): Customer name
+    * contact (str | None): E.164 phone number ("+255...")
+    * app (str): Communication preference ("s m s" when unspecified)
+    * location (str): "Lumo" or "Chanika"
+    * liters (int | float): Water usage rounded to 1 decimal place
+    * net (int): Current period charges
+    * adjustments (int): Previous balance/adjustments
+    * final (int): Total amount due
+
+Design Notes:
+    - __slots__ keeps each record to a fixed set of attribute slots (no per-instance
+      dict), and a misspelled field is an AttributeError instead of a silent
+      wrong column as with positional list indexing.
+    - liters keeps int vs float so toRow() reproduces the historical CSV text
+      exactly ("15959" vs "1234.5"), which keeps CSV deduplication stable.
+"""
+
+from datetime import datetime
+
+DATE_FORMAT = "%d-%b-%Y"
+
+
+class CustomerRecord:
+    """One customer's billing data for a single period."""
+
+    __slots__ = (
+        "date",
+        "name",
+        "contact",
+        "app",
+        "location",
+        "liters",
+        "net",
+        "adjustments",
+        "final",
+    )
+
+    def __init__(
+        self, date, name, contact, app, location, liters, net, adjustments, final
+    ):
+        self.date = date
+        self.name = name
+        self.contact = contact
+        self.app = app
+        self.location = location
+        self.liters = liters
+        self.net = net
+        self.adjustments = adjustments
+        self.final = final
+
+    @classmethod
+    def fromRow(cls, row):
+        """
+        Parse a billing CSV row into a typed record.
+
+        Args:
+            row (list[str]): Nine CSV fields in BILLING_HEADERS order
+
+        Returns:
+            CustomerRecord: Record with native field types
+        """
+        liters = row[5]
+        return cls(
+            datetime.strptime(row[0], DATE_FORMAT),
+            row[1],
+            row[2],
+            row[3],
+            row[4],
+            float(liters) if "." in liters else int(liters),
+            int(row[6]),
+            int(row[7]),
+            int(row[8]),
+        )
+
+    def toRow(self):
+        """
+        Format the record as a billing CSV row.
+
+        Returns:
+            list[str]: Nine CSV fields in BILLING_HEADERS order
+        """
+        return [
+            self.date.strftime(DATE_FORMAT),
+            self.name,
+            self.contact,
+            self.app,
+            self.location,
+            str(self.liters),
+            str(self.net),
+            str(self.adjustments),
+            str(self.final),
+        ]
+
+    def pack(self):
+        """
+        Serialize to a tuple of primitives (for marshal/JSON caches).
+
+        Returns:
+            tuple: Field values with the date as an ISO 8601 string
+        """
+        return (
+            self.date.isoformat(),
+            self.name,
+            self.contact,
+            self.app,
+            self.location,
+            self.liters,
+            self.net,
+            self.adjustments,
+            self.final,
+        )
+
+    @classmethod
+    def unpack(cls, values):
+        """
+        Rebuild a record from pack() output.
+
+        Args:
+            values (Sequence): Tuple (or JSON list) produced by pack()
+
+        Returns:
+            CustomerRecord: Equivalent record
+        """
+        return cls(datetime.fromisoformat(values[0]), *values[1:])
+
+    def __eq__(self, other):
+        if not isinstance(other, CustomerRecord):
+            return NotImplemented
+        return self.pack() == other.pack()
+
+    def __hash__(self):
+        return hash(self.pack())
+
+    def __repr__(self):
+        return f"CustomerRecord({self.name!r}, {self.location}, final={self.final})"
@@ -0,0 +1,163 @@
+"""Send Retry Policy and Dead-Letter Store.
+
+A failed request no longer stops the send run. Each failure is sorted by error class
+and handled on its own, so one bad number or one transient 502 costs only that
+message a retry, not the rest of the run:
+
+    errorClass(Error)
+        retryable --> resubmitted after backoffDelay(attempt), up to RETRY_ATTEMPTS
+        uncertain --> held with status "unknown", not resent (MessageQueue.hold())
+        permanent --> dead-letter store, removed from the queue
+        fatal     --> the run stops (resume later with `send --resume`)
+
+Error Classes:
+    * retryable: the request never reached the gateway (connection errors,
+      connect timeouts), or the gateway refused it with HTTP 408/425/429 or 5xx
+    * uncertain: read timeouts. The POST was sent but no answer came back, so the
+      gateway may have accepted it and a resend could bill the customer twice.
+      main.sendQueue() treats a 2xx answer without an smsBatchId the same way.
+    * fatal: HTTP 401/403 (bad API key or device) and unexpected exceptions,
+      which every other message would hit too
+    * permanent: any other 4xx (e.g. invalid number)
+
+Backoff:
+    Capped exponential backoff with full jitter: attempt n waits a random time
+    between 0 and min(RETRY_CAP, RETRY_BASE * 2 ** (n - 1)) seconds. The jitter
+    spreads retries of many failed messages apart so they do not hit the gateway
+    together. Waiting retries hold no sender slot, so other messages keep going
+    at full rate.
+
+Dead-Letter Store (json_storage/dead_letter.json, journaled via jsonSt):
+    {"John Doe": {"Name", "Contact", "Body", "Error", "Status", "Attempts", "Failed"}}
+
+    Entries keep the message and why it failed. fill reads them back
+    (MembershipIndex.deadLetterKey()): dead-lettered customers were never sent, so
+    they are queued again and their dead-letter entries are cleared. An entry
+    that fails again on the next send is dead-lettered again. Writes and clears run
+    under the queue lock (jsonSt.storeLock() maps dead_letter.json to
+    json_storage/queue.lock), so concurrent senders and a fill do not race.
+"""
+
+from datetime import datetime
+from jsonSt import addJsonData, getJsonData, jsonCreate, removeJsonData, storeLock
+import os
+import random
+import requests
+
+DEAD_LETTER_PATH = "json_storage/dead_letter.json"
+
+RETRY_ATTEMPTS = 5  # Submissions of a message before it is dead-lettered
+RETRY_BASE = 1.0  # Seconds; backoff ceiling of the first retry
+RETRY_CAP = 60.0  # Seconds; highest backoff ceiling
+
+RETRYABLE = "retryable"
+UNCERTAIN = "uncertain"
+PERMANENT = "permanent"
+FATAL = "fatal"
+
+
+def errorClass(Error):
+    """
+    Classify a send failure.
+
+    Args:
+        Error (Exception): Exception raised by the request
+
+    Returns:
+        str: RETRYABLE, UNCERTAIN, PERMANENT or FATAL (see module docstring)
+    """
+    if isinstance(Error, requests.HTTPError):
+        status = getattr(Error.response, "status_code", None)
+        if status in (401, 403):
+            return FATAL
+        if status is None or status in (408, 425, 429) or status >= 500:
+            return RETRYABLE
+        return PERMANENT
+
+    if isinstance(Error, requests.ConnectionError):  # ConnectTimeout included
+        return RETRYABLE
+
+    if isinstance(Error, requests.Timeout):  # ReadTimeout: the POST went out
+        return UNCERTAIN
+
+    return FATAL
+
+
+def backoffDelay(attempt, base=RETRY_BASE, cap=RETRY_CAP):
+    """
+    Jittered wait before a retry.
+
+    Args:
+        attempt (int): Number of the failed submission (1 for the first)
+        base (float): Ceiling of the first retry in seconds
+        cap (float): Highest ceiling in seconds
+
+    Returns:
+        float: Seconds, uniformly drawn from [0, min(cap, base * 2 ** (attempt - 1))]
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def deadLetter(name, value, Error, attempts, storagePath=DEAD_LETTER_PATH):
+    """
+    Record a message that will not be sent in this run.
+
+    Args:
+        name (str): Queue key
+        value (dict): Queued message ({"Name", "Contact", "Body"})
+        Error (Exception): Last failure
+        attempts (int): Submissions made
+        storagePath (str): Dead-letter store
+
+    Returns:
+        None: Creates the store if needed and adds the entry, under the queue lock
+    """
+    with storeLock(storagePath):
+        jsonCreate(storagePath)
+        addJsonData(
+            storagePath,
+            name,
+            {
+                "Name": value.get("Name", name),
+                "Contact": value["Contact"],
+                "Body": value["Body"],
+                "Error": str(Error),
+                "Status": getattr(getattr(Error, "response", None), "status_code", None),
+                "Attempts": attempts,
+                "Failed": datetime.now().isoformat(timespec="seconds"),
+            },
+        )
+
+
+def deadLetters(storagePath=DEAD_LETTER_PATH):
+    """
+    Read the dead-letter store.
+
+    Args:
+        storagePath (str): Dead-letter store
+
+    Returns:
+        dict[str, dict]: Queue key -> entry (empty when the store does not exist)
+    """
+    return getJsonData(storagePath) if os.path.exists(storagePath) else {}
+
+
+def clearDeadLetters(names, storagePath=DEAD_LETTER_PATH):
+    """
+    Remove entries whose messages were queued again.
+
+    Args:
+        names (Iterable[str]): Queue keys to remove
+        storagePath (str): Dead-letter store
+
+    Returns:
+        int: Number of entries removed; names no longer in the store are skipped
+    """
+    count = 0
+    with storeLock(storagePath):
+        present = deadLetters(storagePath)
+        for name in names:
+            if name in present:
+                removeJsonData(storagePath, name)
+                count += 1
+    return count
@@ -0,0 +1,136 @@
+"""Checkpointed Send Runs.
+
+Every `main.py send` is a run with an ID and a checkpoint file recording the state of
+each message it touched, so a run that stops part-way (network error, errorDisplay()
+exit, killed process) can be resumed with `send --resume <run>` instead of being
+restarted from scratch.
+
+Message States:
+    * queued: Claimed from the MessageQueue by this run
+    * in-flight: POST issued; "smsBatchId" is added as soon as the gateway answers
+    * accepted: Gateway accepted the message and the queue acknowledged it
+    * retrying: A retryable request failed; it is resubmitted after a backoff
+      ("attempt" counts the failed submissions)
+    * dead-letter: Failed permanently (or ran out of retries); moved from the
+      queue to json_storage/dead_letter.json
+    * failed: Not sent by this run (already sent, or stopped by a fatal error);
+      a message that stopped the run stays in the queue
+    * unknown: The request may have reached the gateway but no smsBatchId came
+      back. The message is held out of the queue (MessageQueue.hold()) and only
+      sent again with `send --resume <run> --resend-unknown`; "Body" is kept here
+      for that
+
+Checkpoint File (json_storage/runs/<run>.json, journaled via jsonSt):
+    {"__run__": {"limit": 40, "started": "2026-01-30T10:00:00"},
+     "John Doe": {"state": "accepted", "Contact": "+255...", "smsBatchId": "..."}}
+
+Resuming:
+    The run ID doubles as the MessageQueue worker ID, so the resumed run takes back
+    the leases of the stopped one immediately. in-flight messages are reconciled
+    before sending continues (see main.reconcileRun()):
+    * with an smsBatchId: the batch status is looked up; anything but "failed"
+      counts as accepted and is acknowledged without sending again
+    * without one: the crash happened during the POST itself, so the gateway may
+      or may not have accepted it. It is marked unknown and held instead of being
+      sent again; --resend-unknown resends it (and earlier unknown messages of
+      the run) once the operator has checked the gateway
+"""
+
+from datetime import datetime
+from jsonSt import addJsonData, getJsonData, jsonCreate
+import os
+
+RUN_DIR = "json_storage/runs"
+RUN_META = "__run__"  # Checkpoint key holding the run's own settings
+
+
+class SendRun:
+    """Checkpoint of one send run."""
+
+    def __init__(self, runId, directory=RUN_DIR):
+        """
+        Args:
+            runId (str): Run identifier (file name of the checkpoint)
+            directory (str): Folder holding run checkpoints
+        """
+        self.runId = runId
+        self.checkpointPath = os.path.join(directory, f"{runId}.json")
+
+    @classmethod
+    def start(cls, limit, directory=RUN_DIR):
+        """
+        Create a new run with an empty checkpoint.
+
+        Args:
+            limit (int): Number of messages the run should send
+            directory (str): Folder holding run checkpoints
+
+        Returns:
+            SendRun: The new run, with an ID like "20260130-101500-4242"
+        """
+        os.makedirs(directory, exist_ok=True)
+        runId = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        run = cls(runId, directory)
+        jsonCreate(run.checkpointPath)
+        addJsonData(
+            run.checkpointPath,
+            RUN_META,
+            {"limit": limit, "started": datetime.now().isoformat(timespec="seconds")},
+        )
+        return run
+
+    @classmethod
+    def resume(cls, runId, directory=RUN_DIR):
+        """
+        Reopen an existing run.
+
+        Args:
+            runId (str): ID printed when the run started
+            directory (str): Folder holding run checkpoints
+
+        Returns:
+            SendRun: The stored run
+
+        Raises:
+            FileNotFoundError: If no checkpoint exists for runId
+        """
+        run = cls(runId, directory)
+        if not os.path.exists(run.checkpointPath):
+            raise FileNotFoundError(f"No send run '{runId}' in {directory}")
+        return run
+
+    def limit(self):
+        """Number of messages the run was started to send."""
+        return getJsonData(self.checkpointPath)[RUN_META]["limit"]
+
+    def mark(self, name, state, **fields):
+        """
+        Record a message's new state (one journal append).
+
+        Args:
+            name (str): Customer name
+            state (str): "queued", "in-flight", "retrying", "accepted",
+                "dead-letter", "unknown" or "failed"
+            **fields: Extra details kept with the state (Contact, smsBatchId, error,
+                attempt, Body)
+
+        Returns:
+            None
+        """
+        addJsonData(self.checkpointPath, name, {"state": state, **fields})
+
+    def messages(self, state=None):
+        """
+        List the run's messages, optionally only those in one state.
+
+        Args:
+            state (str | None): State to filter on
+
+        Returns:
+            dict[str, dict]: Customer name -> checkpoint entry
+        """
+        entries = getJsonData(self.checkpointPath)
+        entries.pop(RUN_META, None)
+        if state is None:
+            return entries
+        return {name: entry for name, entry in entries.items() if entry["state"] == state}
@@ -0,0 +1,226 @@
+"""SMS Encoding and Segment Accounting.
+
+The gateway splits long messages into segments, and every segment costs send time and
+carrier throughput. How many segments a body needs depends on its encoding:
+
+    GSM-7 (default alphabet): 160 septets in one SMS, 153 per segment when split
+    UCS-2 (any other character): 70 UTF-16 units in one SMS, 67 per segment when split
+
+A single character outside the GSM-7 alphabet, such as a smart quote pasted from Excel
+into a customer name, switches the whole message to UCS-2 and can double its segment
+count. Characters of the GSM-7 extension table (^ { } [ ] ~ | € \\ and form feed) fit
+GSM-7 but take two septets each.
+
+Transliteration:
+    transliterate() replaces common non-GSM characters with GSM-7 equivalents (smart
+    quotes, dashes, ellipsis, non-breaking spaces, accented letters without a GSM-7
+    form) so messages stay in GSM-7. Characters with no sensible equivalent are left
+    untouched and still reported.
+
+Report:
+    SegmentReport totals messages, encodings and segments per location for one fill
+    run and lists the customers whose messages need UCS-2. fill writes it to
+    docs/results/<period> (segments).csv to size send batches before sending.
+"""
+
+from tabulate import tabulate
+import csv
+import math
+import os
+import unicodedata
+
+# GSM 03.38 default alphabet (one septet each)
+GSM7_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# GSM 03.38 extension table (escape + character: two septets each)
+GSM7_EXTENDED = set("^{}\\[~]|€\f")
+
+GSM7_SINGLE, GSM7_MULTI = 160, 153
+UCS2_SINGLE, UCS2_MULTI = 70, 67
+
+TRANSLITERATIONS = {
+    "‘": "'",  # Left single quotation mark
+    "’": "'",  # Right single quotation mark / apostrophe
+    "‚": "'",
+    "‛": "'",
+    "′": "'",
+    "“": '"',  # Left double quotation mark
+    "”": '"',  # Right double quotation mark
+    "„": '"',
+    "″": '"',
+    "«": '"',
+    "»": '"',
+    "–": "-",  # En dash
+    "—": "-",  # Em dash
+    "−": "-",  # Minus sign
+    "‐": "-",
+    "‑": "-",
+    "…": "...",  # Ellipsis
+    "\u00a0": " ",  # Non-breaking space
+    "\u2007": " ",  # Figure space
+    "\u202f": " ",  # Narrow non-breaking space
+    "\u200b": "",  # Zero-width space
+    "\ufeff": "",  # Byte order mark
+    "\t": " ",
+    "•": "*",  # Bullet
+    "`": "'",
+    "´": "'",
+}
+
+
+def isGsm7(character):
+    """Whether a character can be sent in the GSM-7 alphabet (basic or extension)."""
+    return character in GSM7_BASIC or character in GSM7_EXTENDED
+
+
+def nonGsmCharacters(body):
+    """
+    Characters that force a message into UCS-2.
+
+    Args:
+        body (str): Message text
+
+    Returns:
+        list[str]: Offending characters in order of first appearance
+    """
+    return list(dict.fromkeys(c for c in body if not isGsm7(c)))
+
+
+def segmentInfo(body):
+    """
+    Work out a message's encoding and segment count.
+
+    Args:
+        body (str): Message text
+
+    Returns:
+        tuple[str, int, int]: (encoding, segments, length in encoding units):
+            - "GSM-7" with length in septets (extension characters count 2)
+            - "UCS-2" with length in UTF-16 code units
+    """
+    if all(isGsm7(c) for c in body):
+        encoding = "GSM-7"
+        length = sum(2 if c in GSM7_EXTENDED else 1 for c in body)
+        single, multi = GSM7_SINGLE, GSM7_MULTI
+    else:
+        encoding = "UCS-2"
+        length = len(body.encode("utf-16-le")) // 2
+        single, multi = UCS2_SINGLE, UCS2_MULTI
+
+    segments = 1 if length <= single else math.ceil(length / multi)
+    return encoding, segments, length
+
+
+def transliterate(text):
+    """
+    Replace non-GSM characters with GSM-7 equivalents where one exists.
+
+    Args:
+        text (str): Message text or a single field (e.g. customer name)
+
+    Returns:
+        str: Text with known substitutions applied; accented letters missing from
+            GSM-7 lose their accent ("ó" -> "o"). Other characters are kept.
+    """
+    result = []
+    for c in text:
+        if isGsm7(c):
+            result.append(c)
+        elif c in TRANSLITERATIONS:
+            result.append(TRANSLITERATIONS[c])
+        else:
+            # Strip combining marks: "ó" (o + acute) -> "o"
+            base = "".join(
+                d for d in unicodedata.normalize("NFKD", c) if not unicodedata.combining(d)
+            )
+            result.append(base if base and all(isGsm7(d) for d in base) else c)
+    return "".join(result)
+
+
+class SegmentReport:
+    """Per-location segment totals and UCS-2 customers of one fill run."""
+
+    HEADERS = ["Location", "Messages", "GSM-7", "UCS-2", "Segments", "Max Segments"]
+
+    def __init__(self):
+        self.locations = {}  # location -> [messages, gsm7, ucs2, segments, max]
+        self.flagged = []  # (name, contact, characters, segments)
+
+    def add(self, location, name, contact, encoding, segments, characters):
+        """
+        Count one rendered message.
+
+        Args:
+            location (str): Customer's location
+            name (str): Customer name
+            contact (str): Customer contact
+            encoding (str): "GSM-7" or "UCS-2" (see segmentInfo())
+            segments (int): Segments the message needs
+            characters (list[str]): Characters forcing UCS-2 (see nonGsmCharacters())
+
+        Returns:
+            None
+        """
+        totals = self.locations.setdefault(location, [0, 0, 0, 0, 0])
+        totals[0] += 1
+        totals[1 if encoding == "GSM-7" else 2] += 1
+        totals[3] += segments
+        totals[4] = max(totals[4], segments)
+        if characters:
+            self.flagged.append((name, contact, characters, segments))
+
+    def rows(self):
+        """Report rows per location (sorted) followed by a Total row."""
+        rows = [[location, *totals] for location, totals in sorted(self.locations.items())]
+        rows.append(
+            ["Total"]
+            + [sum(row[i] for row in rows) for i in range(1, 5)]
+            + [max((row[5] for row in rows), default=0)]
+        )
+        return rows
+
+    def save(self, reportPath):
+        """
+        Write the location report as CSV, replacing the file.
+
+        Args:
+            reportPath (str): Destination CSV (e.g. docs/results/<period> (segments).csv)
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(reportPath) or ".", exist_ok=True)
+        with open(reportPath, "w", newline="") as csvFile:
+            writer = csv.writer(csvFile)
+            writer.writerow(self.HEADERS)
+            writer.writerows(self.rows())
+
+    def show(self, flaggedLimit=20):
+        """
+        Print the location report and the customers whose messages need UCS-2.
+
+        Args:
+            flaggedLimit (int): Maximum number of flagged customers listed
+
+        Returns:
+            None
+        """
+        print(tabulate(self.rows(), self.HEADERS, tablefmt="grid"))
+
+        if self.flagged:
+            row = [
+                [name, contact, " ".join(characterLabel(c) for c in chars), segments]
+                for name, contact, chars, segments in self.flagged[:flaggedLimit]
+            ]
+            headers = ["Name", "Contact", "UCS-2 Characters", "Segments"]
+            print(tabulate(row, headers, tablefmt="grid"))
+            if len(self.flagged) > flaggedLimit:
+                print(f"...and {len(self.flagged) - flaggedLimit} more UCS-2 messages")
+            print("Use 'fill --gsm7' to transliterate these characters to GSM-7")
+
+
+def characterLabel(character):
+    """Readable label for a flagged character, e.g. "’ (U+2019)"."""
+    return f"{character.strip() or repr(character)} (U+{ord(character):04X})"
@@ -5,12 +5,18 @@ Implements location-aware template selection (Lumo vs. Chanika) with variable su
 number localization, and intelligent duplicate prevention.
 
 Workflow:
-    1. Load customer billing records from CSV export
-    2. Check against sent/failed message history to avoid duplicates
+    1. Load customer billing records from the billing store (CSV imported on first use)
+    2. Check against sent/failed message history to avoid duplicates (dead-lettered
+       messages from the sender's retry queue are queued again)
     3. Select location-specific template (message_templates/{location}/smart_text.txt)
     4. Substitute template variables with formatted customer data
     5. Persist prepared messages to JSON queue for batch transmission
 
+Pipeline:
+    Records stream lazily from the billing store, are filtered against the sent and
+    failed name sets, rendered in chunks on a process pool and appended to the queue
+    with one write per chunk (see tempFilling()).
+
 Template Variables Supported:
     * {Month, year}: Billing period (e.g., "Jan, 2026")
     * {Customer Name}: Full name of customer
@@ -22,83 +28,340 @@ Template Variables Supported:
     * {AZAMPESA}, {LIPA_NAMBA}, {TigoPesa}: Payment account identifiers
     * {RECIEVER_NAME}: Payee name for mobile money transfers
 
-Number Formatting:
-    - Uses British English locale (en_GB.UTF-8) for comma separators
+Template Registry:
+    TemplateRegistry loads every message_templates/<location>/smart_text.txt once per
+    run, splits it into literal text and placeholder slots, and binds the per-run
+    values (month, deadline, payment numbers) into the literals right away. Rendering a
+    customer then only fills the five customer slots. Unknown placeholders are
+    reported when the templates load, before any message is queued.
+
+SMS Segments (see sms_segments):
+    Every rendered body is checked for its encoding (GSM-7 or UCS-2) and segment count.
+    Characters forcing UCS-2 (e.g. smart quotes in names pasted from Excel) are
+    flagged per customer, and with gsm7=True (`fill --gsm7`) they are transliterated
+    so the message stays in GSM-7. Totals per location are written to
+    docs/results/<period> (segments).csv.
+
+Number Formatting (number_format.formatNumbers, no locale required):
+    - British English conventions: comma thousands separator, period decimal point
     - Floats: "1,234.5" (1 decimal place)
     - Integers: "5,000" (no decimals)
 """
 
+from billing_store import repeatedNames, streamPeriod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from extracted_csv import *
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from jsonSt import *
+from membership import MembershipIndex, queueKey
+from message_queue import MessageQueue
+from number_format import formatNumbers
+from records import CustomerRecord
+from retry_queue import clearDeadLetters
+from sms_segments import SegmentReport, nonGsmCharacters, segmentInfo, transliterate
 import calendar
-import locale
+import glob
 import os
+import string
 
 load_dotenv()
 
+TEMPLATE_DIR = "message_templates"
+FILL_CHUNK = 500  # Customers rendered per worker task and queued per write
+
+# Placeholders filled per customer; everything else is bound once per run
+CUSTOMER_FIELDS = (
+    "Customer Name",
+    "Liters Used",
+    "Net Charge",
+    "Adjustments",
+    "Final Bill",
+)
+RUN_FIELDS = (
+    "Month, year",
+    "Deadline Date",
+    "AZAMPESA",
+    "LIPA_NAMBA",
+    "TigoPesa",
+    "RECIEVER_NAME",
+)
+
+
+def runValues(startDate):
+    """
+    Compute the template values shared by every message of a run.
+
+    Args:
+        startDate (datetime): Billing period start date
+
+    Returns:
+        dict[str, str]: Values for RUN_FIELDS
+    """
+    return {
+        "Month, year": f"{calendar.month_abbr[startDate.month]}, {startDate.year}",
+        # Compute payment deadline: billing date + 7 days
+        "Deadline Date": datetime.strftime((startDate + timedelta(7)), "%d-%m-%Y"),
+        "AZAMPESA": os.getenv("AZAMPESA"),  # Payment account numbers
+        "LIPA_NAMBA": os.getenv("LIPA_NAMBA"),
+        "TigoPesa": os.getenv("TIGOPESA"),
+        "RECIEVER_NAME": os.getenv("RECIEVER_NAME"),  # Payee name
+    }
+
+
+def fieldText(value, spec, conversion):
+    """Format one placeholder value exactly as str.format() would."""
+    if conversion == "r":
+        value = repr(value)
+    elif conversion == "a":
+        value = ascii(value)
+    elif conversion == "s":
+        value = str(value)
+    return format(value, spec)
+
+
+class CompiledTemplate:
+    """A message template with run values bound and customer slots left open."""
+
+    __slots__ = ("literals", "slots")
+
+    def __init__(self, text, boundValues, sourcePath):
+        """
+        Args:
+            text (str): Template in str.format() syntax
+            boundValues (dict[str, str]): Per-run values to bind now
+            sourcePath (str): Template file, for error messages
+
+        Raises:
+            ValueError: If the template uses a placeholder that is neither a
+                customer field nor a run field
+        """
+        # literals[i] precedes slots[i]; the final literal has no slot after it
+        self.literals = [""]
+        self.slots = []
+
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            self.literals[-1] += literal
+            if field is None:
+                continue
+
+            if field in boundValues:
+                self.literals[-1] += fieldText(boundValues[field], spec, conversion)
+            elif field in CUSTOMER_FIELDS:
+                self.slots.append((field, spec, conversion))
+                self.literals.append("")
+            else:
+                raise ValueError(f"Unknown placeholder {{{field}}} in {sourcePath}")
+
+    def render(self, customerValues):
+        """
+        Fill the customer slots.
+
+        Args:
+            customerValues (dict[str, str]): Values for CUSTOMER_FIELDS
+
+        Returns:
+            str: Complete message body
+        """
+        parts = [self.literals[0]]
+        for (field, spec, conversion), literal in zip(self.slots, self.literals[1:]):
+            parts.append(fieldText(customerValues[field], spec, conversion))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    """Compiled smart_text.txt template of every location, loaded once."""
+
+    def __init__(self, boundValues, templateDir=TEMPLATE_DIR):
+        """
+        Load and compile all location templates.
+
+        Args:
+            boundValues (dict[str, str]): Per-run values (see runValues())
+            templateDir (str): Folder with one sub-folder per location
+
+        Raises:
+            ValueError: If any template has an unknown placeholder
+        """
+        self.templates = {}
+        for templatePath in sorted(glob.glob(f"{templateDir}/*/smart_text.txt")):
+            location = os.path.basename(os.path.dirname(templatePath))
+            with open(templatePath, "r") as f:
+                self.templates[location] = CompiledTemplate(
+                    f.read(), boundValues, templatePath
+                )
+
+    def render(self, location, customerValues):
+        """
+        Render the message for one customer.
+
+        Args:
+            location (str): Customer's location ("Lumo" or "Chanika")
+            customerValues (dict[str, str]): Values for CUSTOMER_FIELDS
+
+        Returns:
+            str: Message body
+
+        Raises:
+            FileNotFoundError: If no template exists for the location
+        """
+        template = self.templates.get(location)
+        if template is None:
+            raise FileNotFoundError(
+                f"No template message_templates/{location}/smart_text.txt"
+            )
+        return template.render(customerValues)
+
+
+def initRenderer(boundValues, gsm7=False):
+    """
+    Build the worker's template registry (pool initializer).
+
+    Args:
+        boundValues (dict[str, str]): Per-run values (see runValues())
+        gsm7 (bool): Transliterate rendered bodies to GSM-7 where possible
 
-def formatNumbers(num):
+    Returns:
+        None: Sets the module-level workerRegistry and workerGsm7 used by
+            renderChunk()
     """
-    Apply locale-aware thousands separators to numeric values for SMS display.
+    global workerRegistry, workerGsm7
+    workerRegistry = TemplateRegistry(boundValues)
+    workerGsm7 = gsm7
+
 
-    Formats numbers using British English conventions (comma as thousands separator,
-    period as decimal point). Essential for customer-facing message readability.
+workerRegistry = None  # Per-process registry, built once by initRenderer()
+workerGsm7 = False  # Per-process transliteration switch, set by initRenderer()
+
+
+def renderChunk(chunk):
+    """
+    Render the messages of a chunk of customers.
 
     Args:
-        num (int | float): Numeric value to format (billing amounts or usage metrics)
+        chunk (list[tuple]): CustomerRecord.pack() tuples (cheap to pickle)
 
     Returns:
-        str: Formatted number string:
-            - float: "1,234.5" (exactly 1 decimal place)
-            - int: "5,000" (no decimal places)
-
-    Examples:
-        >>> formatNumbers(5000)
-        "5,000"
-        >>> formatNumbers(1234.567)
-        "1,234.6"
-        >>> formatNumbers(42)
-        "42"
+        tuple[list[dict], list[tuple]]:
+            - {"Name", "Contact", "Body"} messages in chunk order
+            - (location, encoding, segments, UCS-2 characters) per message
+    """
+    messages, segments = [], []
+    for packed in chunk:
+        row = CustomerRecord.unpack(packed)
+
+        # Only the customer slots are filled; run values are already bound
+        var = {  # Dictionary for template variable substitution
+            "Customer Name": row.name,
+            "Liters Used": formatNumbers(float(row.liters)),  # Water consumption
+            "Net Charge": formatNumbers(row.net),  # Current charges
+            "Adjustments": formatNumbers(row.adjustments),  # Previous balance
+            "Final Bill": formatNumbers(row.final),  # Total due
+        }
 
-    Note:
-        Requires locale 'en_GB.UTF-8' to be available on system. Falls back
-        to system default if unavailable.
+        # Template specific to customer's service location (Lumo/Chanika)
+        filledTemp = workerRegistry.render(row.location, var)
+        if workerGsm7:
+            filledTemp = transliterate(filledTemp)  # e.g. smart quotes -> ASCII quotes
+
+        messages.append({"Name": row.name, "Contact": row.contact, "Body": filledTemp})
+        encoding, count, _ = segmentInfo(filledTemp)
+        segments.append((row.location, encoding, count, nonGsmCharacters(filledTemp)))
+
+    return messages, segments
+
+
+def chunked(records, size):
     """
-    locale.setlocale(locale.LC_ALL, "en_GB.UTF-8")
-    if isinstance(num, float):
-        return locale.format_string("%.1f", num, grouping=True)
-    else:
-        return locale.format_string("%d", num, grouping=True)
+    Group a stream of records into lists of packed tuples.
 
+    Args:
+        records (Iterable[CustomerRecord]): Records to group
+        size (int): Records per chunk
 
-def tempFilling(startDate, filePath, failedCsv):
+    Yields:
+        list[tuple]: Up to size CustomerRecord.pack() tuples
     """
-    Generate personalized SMS messages from billing CSV and queue for transmission.
+    chunk = []
+    for record in records:
+        chunk.append(record.pack())
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 
-    Orchestrates the complete message preparation pipeline:
-    1. Load failed message history to enable selective retry
-    2. Parse customer billing records from CSV
-    3. Skip customers already processed (in sent.json) or explicitly failed
-    4. Load location-specific template (Lumo or Chanika)
-    5. Calculate payment deadline (startDate + 7 days)
-    6. Substitute template variables with formatted customer data
-    7. Queue prepared message in data.json for sendMessage() consumption
+def orderedMap(pool, function, items, window):
+    """
+    Map over a stream on a pool, in order, with at most window tasks in flight.
+
+    Unlike Executor.map(), the input is consumed only as results are taken, so a
+    long customer list never sits in memory all at once.
+
+    Args:
+        pool (Executor): Worker pool
+        function (Callable): Task function
+        items (Iterable): Task arguments
+        window (int): Maximum number of submitted, unfinished tasks
+
+    Yields:
+        Any: function(item) results in input order
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def tempFilling(
+    startDate, filePath, failedCsv, workers=None, chunkSize=FILL_CHUNK, gsm7=False
+):
+    """
+    Generate personalized SMS messages from billing records and queue for transmission.
+
+    Orchestrates the streaming message preparation pipeline:
+    1. Load failed and dead-lettered message history to enable selective retry
+    2. Stream the period's billing records from the billing store
+    3. Skip customers already sent unless their delivery failed (MembershipIndex,
+       keyed by name + contact)
+    4. Compile location templates once with run values bound (deadline =
+       startDate + 7 days, month, payment numbers)
+    5. Render chunks of customers on a process pool, filling the per-customer
+       template slots with formatted customer data
+    6. Count each body's encoding and SMS segments, flagging characters that
+       force UCS-2 (transliterated to GSM-7 first when gsm7 is set)
+    7. Queue each rendered chunk in data.json with one journal write for
+       sendMessage() consumption (MessageQueue.enqueue(), under the queue lock
+       senders hold, so a fill can run next to a send)
+    8. Write the per-location segment report to docs/results/<period> (segments).csv
 
     Args:
         startDate (datetime): Billing period start date. Used for:
             - Month/year display ("Jan, 2026")
             - Deadline calculation (startDate + timedelta(7))
-        filePath (str): Path to billing CSV containing customer records
+        filePath (str): Path to billing CSV; its file name is the billing period
+            looked up in the store, and the CSV is imported if the store lacks it
         failedCsv (str): Path to failed.csv containing retry candidates
+        workers (int | None): Rendering processes (CPU count when None). With 1,
+            rendering runs in this process without a pool.
+        chunkSize (int): Customers per rendering task and per queue write
+        gsm7 (bool): Transliterate non-GSM characters (smart quotes, dashes,
+            accents) so messages are sent as GSM-7 instead of UCS-2
 
     Returns:
         None: Side effect is population of json_storage/data.json with message queue
+            and of the segment report CSV
 
     Message Queue Format (data.json):
         {
             "Customer Name": {
+                "Name": "Customer Name",
                 "Contact": "+255773422381",
                 "Body": "Dear John, your Jan 2026 bill..."
             },
@@ -107,78 +370,141 @@ def tempFilling(startDate, filePath, failedCsv):
 
     Raises:
         FileNotFoundError: If template file doesn't exist for customer's location
-        KeyError: If required environment variables are missing
+        ValueError: If a template contains an unknown placeholder (raised before
+            any message is queued)
+
+    Note:
+        Memory stays flat in the number of customers: records are streamed from
+        SQLite and at most a few chunks per worker are in flight. Only the
+        membership sets are held in full.
     """
     try:
-        failedClients = []  # Customers from previous failed delivery attempts
-
-        # Load failed delivery records for selective retry inclusion
-        with open(failedCsv, "r") as csvFile:
-            reader = csv.reader(csvFile)
-            next(reader)  # Discard header row
-
-            for row in reader:
-                failedClients.append(row[0])  # Extract customer name
-
-        # Parse billing records and generate messages
-        with open(filePath, "r") as csvFile:
-
-            reader = csv.reader(csvFile)
-
-            presentData = []
-            next(reader)  # Discard header row
-
-            # Process each customer billing record
-            for row in reader:
-
-                presentData.append(row)
-
-                # Skip customers already successfully sent (avoid duplicate messages)
-                sentClients = getJsonData("json_storage/sent.json")
-
-                if row[1] in failedClients:  # Include failed customers for retry
-                    pass
-                elif row[1] in sentClients:  # Skip already-sent customers
-                    continue
-
-                # Load template specific to customer's service location
-                filePath = f"message_templates/{row[4]}/smart_text.txt"  # row[4] = Lumo/Chanika
-                with open(filePath, "r") as f:
-
-                    file = f.read()
-                    # Compute payment deadline: billing date + 7 days
-                    newDate = datetime.strftime((startDate + timedelta(7)), "%d-%m-%Y")
-
-                    # Map template placeholders to actual customer data
-                    var = {  # Dictionary for template variable substitution
-                        "Month, year": f"{calendar.month_abbr[startDate.month]}, {startDate.year}",
-                        "Customer Name": row[1],
-                        "Liters Used": formatNumbers(
-                            float(row[5])
-                        ),  # Water consumption
-                        "Net Charge": formatNumbers(int(row[6])),  # Current charges
-                        "Adjustments": formatNumbers(int(row[7])),  # Previous balance
-                        "Final Bill": formatNumbers(int(row[8])),  # Total due
-                        "Deadline Date": newDate,
-                        "AZAMPESA": os.getenv("AZAMPESA"),  # Payment account numbers
-                        "LIPA_NAMBA": os.getenv("LIPA_NAMBA"),
-                        "TigoPesa": os.getenv("TIGOPESA"),
-                        "RECIEVER_NAME": os.getenv("RECIEVER_NAME"),  # Payee name
-                    }
-
-                    # Perform variable substitution using str.format()
-                    filledTemp = file.format(**var)
-                    value = {"Contact": row[2], "Body": filledTemp}
-                    addJsonData(
-                        "json_storage/data.json", row[1], value
-                    )  # Queue message
-
-        print("Storage 'data.json' updated!✅")
+        # Sent/failed/delivered customers, keyed by name + contact (O(1) lookups)
+        membership = MembershipIndex.load(failedCsv=failedCsv)
+        queue = MessageQueue()  # Creates data.json if needed
+
+        # Stream the billing period from the store (synced with its CSV first), then
+        # look up repeated names, which needs the period stored
+        period = os.path.splitext(os.path.basename(filePath))[0]
+        records = streamPeriod(period, filePath)
+        repeated = repeatedNames(period)  # Same name, different customers
+        dropStaleKeys(repeated, queue)
+        pending = (
+            row
+            for row in records
+            # Skip already-sent customers; failed, undelivered ones are retried
+            if membership.shouldSend(row.name, row.contact)
+        )
+
+        # Templates are loaded, checked and bound to the run values once
+        boundValues = runValues(startDate)
+        initRenderer(boundValues, gsm7)  # Also validates templates before any work starts
+        chunks = chunked(pending, chunkSize)
+        report = SegmentReport()
+
+        if workers == 1:
+            rendered = map(renderChunk, chunks)
+            queued, retried = queueChunks(rendered, repeated, report, membership, queue)
+
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=initRenderer,
+                initargs=(boundValues, gsm7),
+            ) as pool:
+                window = 2 * (workers or os.cpu_count() or 1)
+                rendered = orderedMap(pool, renderChunk, chunks, window)
+                queued, retried = queueChunks(
+                    rendered, repeated, report, membership, queue
+                )
+
+        print(f"Storage 'data.json' updated with {queued} messages!✅")
+        if retried:
+            print(f"{retried} dead-lettered messages queued for another attempt✅")
+
+        reportPath = f"docs/results/{period} (segments).csv"
+        report.save(reportPath)
+        report.show()
+        print(f"Segment report saved to '{reportPath}'✅")
 
     except Exception as Error:
         errorDisplay(Error)
 
 
+def dropStaleKeys(repeated, queue):
+    """
+    Remove bare-name queue entries of names that need the contact in their key.
+
+    A message queued under "John Doe" belongs to one of the customers now queued as
+    "John Doe (<contact>)"; left in place it would be sent next to the new one.
+
+    Args:
+        repeated (set[str]): Names shared by several customers of the period
+        queue (MessageQueue): Message queue; stale keys are found and dropped
+            under its lock
+
+    Returns:
+        int: Number of entries removed
+    """
+    if not repeated:
+        return 0
+    with queue.locked():
+        stale = [name for name in getJsonData(queue.dataPath) if name in repeated]
+        queue.drop(*stale)
+    return len(stale)
+
+
+def queueChunks(rendered, repeated, report, membership, queue):
+    """
+    Queue rendered chunks as they arrive and clear re-queued dead letters.
+
+    Args:
+        rendered (Iterable[tuple]): renderChunk() outputs in order
+        repeated (set[str]): Names needing the contact in their queue key
+        report (SegmentReport): Run report the segments are added to
+        membership (MembershipIndex): Index holding the dead-letter entries
+        queue (MessageQueue): Queue the messages are added to
+
+    Returns:
+        tuple[int, int]: (messages queued, dead-letter entries cleared)
+    """
+    queued = retried = 0
+    for chunk in rendered:
+        queued += addMessages(chunk, repeated, report, queue)
+
+        # Dead-lettered customers get a fresh message; their old entry goes
+        deadKeys = [membership.deadLetterKey(m["Name"], m["Contact"]) for m in chunk[0]]
+        retried += clearDeadLetters(key for key in deadKeys if key is not None)
+
+    return queued, retried
+
+
+def addMessages(chunk, repeated, report, queue):
+    """
+    Queue one rendered chunk with a single journal write and count its segments.
+
+    Args:
+        chunk (tuple[list[dict], list[tuple]]): renderChunk() output
+        repeated (set[str]): Names needing the contact in their queue key
+        report (SegmentReport): Run report the chunk's segments are added to
+        queue (MessageQueue): Queue the messages are added to
+
+    Returns:
+        int: Number of queued messages
+    """
+    messages, segments = chunk
+    for message, (location, encoding, count, characters) in zip(messages, segments):
+        report.add(
+            location, message["Name"], message["Contact"], encoding, count, characters
+        )
+
+    queue.enqueue(
+        (queueKey(message["Name"], message["Contact"], repeated), message)
+        for message in messages
+    )
+    return len(messages)
+
+
 if __name__ == "__main__":
 
     tempFilling(
@@ -0,0 +1,170 @@
+"""TextBee Gateway Client.
+
+One pooled HTTP session for every TextBee call made by send, resume reconciliation and
+delivery. Reusing the session keeps TCP/TLS connections to api.textbee.dev alive
+between requests instead of opening a new one per SMS, and every request carries a
+timeout so a stalled gateway cannot hang a run.
+
+Endpoints (relative to BASE_URL):
+    * POST gateway/devices/<DEVICE_ID>/send-sms: {"message", "recipients"} ->
+      {"data": {"smsBatchId", ...}}
+    * GET gateway/devices/<DEVICE_ID>/sms-batch/<smsBatchId> ->
+      {"data": {"messages": [{"recipient", "type", "status", ...}]}}, one message
+      per recipient of the batch (see recipientMessage())
+
+Configuration (.env):
+    API_KEY: Gateway API key, sent as the x-api-key header
+    DEVICE_ID: Registered Android gateway device
+"""
+
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+import json
+import os
+import re
+import requests
+
+BASE_URL = "https://api.textbee.dev/api/v1"
+TIMEOUT = (5, 30)  # Seconds to connect, seconds to wait for a response
+POOL_SIZE = 10  # Kept-alive connections to the gateway host
+
+
+class TextBeeClient:
+    """TextBee API client over a pooled keep-alive requests.Session."""
+
+    def __init__(
+        self,
+        apiKey=None,
+        deviceId=None,
+        baseUrl=BASE_URL,
+        timeout=TIMEOUT,
+        poolSize=POOL_SIZE,
+    ):
+        """
+        Args:
+            apiKey (str | None): Gateway API key (API_KEY from .env when None)
+            deviceId (str | None): Gateway device (DEVICE_ID from .env when None)
+            baseUrl (str): API root URL
+            timeout (float | tuple[float, float]): requests timeout per call
+            poolSize (int): Maximum connections kept open to the gateway
+        """
+        load_dotenv()
+        apiKey = apiKey or os.getenv("API_KEY")
+        deviceId = deviceId or os.getenv("DEVICE_ID")
+
+        # URLs and headers are built once, not per message
+        self.deviceUrl = f"{baseUrl}/gateway/devices/{deviceId}"
+        self.sendUrl = f"{self.deviceUrl}/send-sms"
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "x-api-key": apiKey,  # API key for gateway authorization
+                "Content-Type": "application/json",  # JSON payload encoding
+            }
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def sendSms(self, message, recipients):
+        """
+        Submit one SMS batch to the gateway.
+
+        Args:
+            message (str): Message body
+            recipients (list[str]): Phone numbers (TextBee requires an array)
+
+        Returns:
+            requests.Response: Accepted response; .json()["data"]["smsBatchId"]
+                identifies the batch
+
+        Raises:
+            requests.HTTPError: If the gateway answers with a 4xx/5xx status
+            requests.Timeout: If the gateway does not answer within the timeout
+        """
+        payload = {"message": message, "recipients": recipients}
+        response = self.session.post(
+            url=self.sendUrl, data=json.dumps(payload), timeout=self.timeout
+        )
+        response.raise_for_status()  # Raise exception for HTTP errors (4xx/5xx)
+        return response
+
+    def smsBatch(self, smsBatchId):
+        """
+        Look up the messages of a submitted batch.
+
+        Args:
+            smsBatchId (str): Batch ID returned by sendSms()
+
+        Returns:
+            dict: The response "data" object ({"messages": [{"type", "status", ...}]})
+
+        Raises:
+            requests.HTTPError: If the gateway answers with a 4xx/5xx status
+            requests.Timeout: If the gateway does not answer within the timeout
+        """
+        response = self.session.get(
+            url=f"{self.deviceUrl}/sms-batch/{smsBatchId}", timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["data"]
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def recipientMessage(messages, contact):
+    """
+    Pick one recipient's message out of a batch status.
+
+    Args:
+        messages (list[dict]): smsBatch()["messages"]
+        contact (str): The customer's phone number, in any formatting
+
+    Returns:
+        dict: The message addressed to contact. A single-recipient batch returns its
+            only message, as does a batch without a matching "recipient" field.
+    """
+    digits = re.sub(r"\D", "", contact or "")
+    for message in messages:
+        if re.sub(r"\D", "", message.get("recipient") or "") == digits:
+            return message
+    return messages[0]
+
+
+def retryAfterSeconds(response):
+    """
+    Read a response's Retry-After header.
+
+    Args:
+        response (requests.Response | None): Gateway response (e.g. a 429)
+
+    Returns:
+        float | None: Seconds to wait, from either header form ("120" or an HTTP
+            date); None when the header is missing or unreadable
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retryAt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retryAt.tzinfo is None:  # "-0000" dates carry no zone; HTTP dates are UTC
+        retryAt = retryAt.replace(tzinfo=timezone.utc)
+    return max(0.0, (retryAt - datetime.now(timezone.utc)).total_seconds())
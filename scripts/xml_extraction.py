@@ -0,0 +1,402 @@
+"""Direct XLSX XML Extraction Engine.
+
+Alternative extraction backend that reads the source workbook as a plain zip archive
+instead of going through openpyxl.load_workbook(). Only the parts needed for billing
+extraction are parsed:
+
+    * xl/workbook.xml (+ its .rels): Resolve the target sheet name to its XML part
+    * xl/sharedStrings.xml: String table referenced by "s"-typed cells
+    * xl/styles.xml: Border colours (location) and number formats (dates)
+    * xl/worksheets/sheetN.xml: Streamed row by row with iterparse
+
+Every other part of the package (drawings, other sheets, themes, defined names,
+fonts, fills...) is never opened, so cost grows with the target sheet's cell count
+rather than with the workbook's formatting.
+
+Output Contract:
+    xmlSetup() returns the same (rowBuffer, boxes, sheetName) triple as
+    data_extraction.streamSetup(), so records are produced by the shared
+    iterateOnRows() / extractFromRows() code and are identical to both other engines.
+
+Value Decoding (mirrors openpyxl with data_only=True):
+    * t="s": Shared string lookup
+    * t="inlineStr": Concatenated <is> text runs
+    * t="str" / t="e": Cached formula string or error text ("#REF!")
+    * t="b": Boolean
+    * t="n" (default): int or float; converted to datetime when the cell's
+      style uses a date number format
+    * Formulas contribute only their cached <v> value
+
+Note:
+    Small pure helpers from openpyxl (Excel serial date conversion and number
+    format classification) are reused so that date handling matches exactly.
+"""
+
+from data_extraction import colourLocation, rowMarkers, styleLocation
+from miscallenous import errorDisplay
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    CALENDAR_WINDOWS_1900,
+    from_excel,
+    from_ISO8601,
+)
+from xml.etree.ElementTree import fromstring, iterparse
+import posixpath
+import zipfile
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def textContent(element):
+    """
+    Join the plain text runs of a shared or inline string element.
+
+    Phonetic runs (<rPh>) are skipped, matching openpyxl's Text.content.
+
+    Args:
+        element (xml.etree.ElementTree.Element): <si> or <is> element
+
+    Returns:
+        str: Unformatted string content
+    """
+    snippets = []
+    for child in element:
+        if child.tag == f"{NS}t":
+            snippets.append(child.text or "")
+        elif child.tag == f"{NS}r":
+            snippets.append(child.findtext(f"{NS}t") or "")
+    return "".join(snippets)
+
+
+def columnIndex(reference):
+    """
+    Convert the column letters of an A1 reference to a 0-based index.
+
+    Args:
+        reference (str): Cell reference such as "M204"
+
+    Returns:
+        int: 0-based column index (A -> 0, M -> 12)
+    """
+    index = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        index = index * 26 + (ord(char.upper()) - 64)
+    return index - 1
+
+
+def sheetPaths(archive):
+    """
+    Map worksheet names to their XML part inside the archive.
+
+    Args:
+        archive (zipfile.ZipFile): Open workbook archive
+
+    Returns:
+        dict[str, str]: {"January, 2026": "xl/worksheets/sheet1.xml", ...}
+    """
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    relations = fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for relation in relations.iter(f"{PKG_REL_NS}Relationship"):
+        target = relation.get("Target")
+        if target.startswith("/"):  # Absolute package path
+            targets[relation.get("Id")] = target.lstrip("/")
+        else:  # Relative to the workbook part
+            targets[relation.get("Id")] = posixpath.normpath(f"xl/{target}")
+
+    return {
+        sheet.get("name"): targets[sheet.get(f"{REL_NS}id")]
+        for sheet in workbook.iter(f"{NS}sheet")
+    }
+
+
+def readEpoch(archive):
+    """
+    Determine the workbook's date system (1900 or 1904).
+
+    Args:
+        archive (zipfile.ZipFile): Open workbook archive
+
+    Returns:
+        datetime: Epoch used to convert serial dates
+    """
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    properties = workbook.find(f"{NS}workbookPr")
+    if properties is not None and properties.get("date1904") in ("1", "true"):
+        return CALENDAR_MAC_1904
+    return CALENDAR_WINDOWS_1900
+
+
+def readSharedStrings(archive):
+    """
+    Load the shared string table with a streaming parser.
+
+    Args:
+        archive (zipfile.ZipFile): Open workbook archive
+
+    Returns:
+        list[str]: Strings indexed by their shared string ID (empty if the
+            workbook has no shared string part)
+    """
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as source:
+        for _event, element in iterparse(source):
+            if element.tag == f"{NS}si":
+                strings.append(textContent(element).replace("x005F_", ""))
+                element.clear()
+    return strings
+
+
+def readStyles(archive):
+    """
+    Derive per-style location and date handling from styles.xml.
+
+    Args:
+        archive (zipfile.ZipFile): Open workbook archive
+
+    Returns:
+        tuple[list[str], set[int], set[int]]: Three-element tuple:
+            - locations: Style ID -> "Chanika"/"Lumo" (same shape as
+              data_extraction.locationTable())
+            - dateStyles: Style IDs whose number format is a date
+            - timedeltaStyles: Style IDs whose number format is a duration
+    """
+    if "xl/styles.xml" not in archive.namelist():
+        return [], set(), set()
+
+    styles = fromstring(archive.read("xl/styles.xml"))
+
+    customFormats = {
+        int(numFmt.get("numFmtId")): numFmt.get("formatCode")
+        for numFmt in styles.iter(f"{NS}numFmt")
+    }
+
+    # Top border colour of each <border>, in stylesheet order
+    borderLocations = []
+    borders = styles.find(f"{NS}borders")
+    for border in borders if borders is not None else []:
+        color = border.find(f"{NS}top/{NS}color")
+        borderLocations.append(colourLocation(None if color is None else color.get("rgb")))
+
+    locations = []
+    dateStyles = set()
+    timedeltaStyles = set()
+    cellXfs = styles.find(f"{NS}cellXfs")
+    for styleId, xf in enumerate(cellXfs if cellXfs is not None else []):
+
+        borderId = int(xf.get("borderId", 0))
+        locations.append(
+            borderLocations[borderId] if borderId < len(borderLocations) else "Lumo"
+        )
+
+        numFmtId = int(xf.get("numFmtId", 0))
+        formatCode = customFormats.get(numFmtId, BUILTIN_FORMATS.get(numFmtId))
+        if formatCode and is_date_format(formatCode):
+            dateStyles.add(styleId)
+        if formatCode and is_timedelta_format(formatCode):
+            timedeltaStyles.add(styleId)
+
+    return locations, dateStyles, timedeltaStyles
+
+
+def xmlSetup(sourcePath, sheetName=None):
+    """
+    Stream the target worksheet's XML into a row buffer without openpyxl.
+
+    Drop-in replacement for data_extraction.streamSetup(): the returned buffer and
+    box list feed iterateOnRows() unchanged.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str | None): Worksheet to extract. Prompted for when None.
+
+    Returns:
+        tuple[list[tuple], list[tuple[int, int, str]], str]: Three-element tuple:
+            - rowBuffer: Cell values per row, 0-based (rowBuffer[0][0] is A1)
+            - boxes: (row, column, location) of every "Name/Tel:" marker,
+              ordered column-major
+            - sheetName: Worksheet name for filenaming
+
+    Raises:
+        KeyError: If the worksheet name doesn't exist in the workbook
+        zipfile.BadZipFile: If the source is not an .xlsx package
+    """
+    try:
+
+        if sheetName is None:
+            sheetName = input("Exact name of the sheet: ")
+
+        with zipfile.ZipFile(sourcePath) as archive:
+
+            sheetPath = sheetPaths(archive)[sheetName]
+            epoch = readEpoch(archive)
+            sharedStrings = readSharedStrings(archive)
+            locations, dateStyles, timedeltaStyles = readStyles(archive)
+
+            def cellValue(cell, styleId):
+                """Decode a <c> element to the value openpyxl would return."""
+                dataType = cell.get("t", "n")
+
+                if dataType == "inlineStr":
+                    inline = cell.find(f"{NS}is")
+                    return None if inline is None else textContent(inline)
+
+                value = cell.findtext(f"{NS}v") or None
+                if value is None:
+                    return None
+
+                if dataType == "n":
+                    if "." in value or "E" in value or "e" in value:
+                        value = float(value)
+                    else:
+                        value = int(value)
+                    if styleId in dateStyles:
+                        value = from_excel(
+                            value, epoch, timedelta=styleId in timedeltaStyles
+                        )
+                    return value
+                if dataType == "s":
+                    return sharedStrings[int(value)]
+                if dataType == "b":
+                    return bool(int(value))
+                if dataType == "d":
+                    return from_ISO8601(value)
+                return value  # "str" (formula result) and "e" (error text)
+
+            rowBuffer = []
+            boxes = []
+            previousStyles = {}  # Column -> style ID of the row above
+            sheetData = None
+
+            with archive.open(sheetPath) as source:
+                for event, element in iterparse(source, events=("start", "end")):
+
+                    if event == "start":
+                        if element.tag == f"{NS}sheetData":
+                            sheetData = element
+                        continue
+
+                    if element.tag != f"{NS}row":
+                        continue
+
+                    rowIdx = int(element.get("r", len(rowBuffer) + 1)) - 1
+
+                    # Rows absent from the XML are empty
+                    while len(rowBuffer) < rowIdx:
+                        rowBuffer.append(())
+                        previousStyles = {}
+
+                    values = {}
+                    styles = {}
+                    colIdx = -1
+                    for cell in element.iter(f"{NS}c"):
+                        reference = cell.get("r")
+                        colIdx = colIdx + 1 if reference is None else columnIndex(reference)
+                        styleId = int(cell.get("s", 0))
+                        styles[colIdx] = styleId
+                        values[colIdx] = cellValue(cell, styleId)
+
+                    width = max(values) + 1 if values else 0
+                    row = tuple(values.get(col) for col in range(width))
+
+                    for col in rowMarkers(row):
+                        styleId = previousStyles.get(col)
+                        boxes.append((rowIdx, col, styleLocation(styleId, locations)))
+
+                    rowBuffer.append(row)
+                    previousStyles = styles
+
+                    # Drop parsed rows so memory stays bounded by the buffer
+                    element.clear()
+                    if sheetData is not None:
+                        sheetData.clear()
+
+        boxes.sort(key=lambda box: (box[1], box[0]))  # Column-major, like the grid scan
+        return (
+            rowBuffer,
+            boxes,
+            sheetName,
+        )
+
+    except Exception as Error:
+        errorDisplay(Error)
+
+
+def compareEngines(sourcePath, sheetName):
+    """
+    Check the XML engine against the openpyxl engine and measure both.
+
+    Runs every extraction engine on the same worksheet, verifies that they
+    produce identical records and reports wall time and peak traced memory.
+
+    Args:
+        sourcePath (str): Path to Excel workbook file (.xlsx format)
+        sheetName (str): Worksheet to extract
+
+    Returns:
+        list[list]: One [engine, records, seconds, peak MiB, matches openpyxl]
+            row per engine, ready for tabulate
+    """
+    from data_extraction import envSetup, iterateOnBoxes, iterateOnRows, streamSetup
+    import time
+    import tracemalloc
+
+    def openpyxlEngine():
+        workSheet, _name = envSetup(sourcePath, sheetName)
+        return iterateOnBoxes(workSheet["A1"])
+
+    def streamEngine():
+        return iterateOnRows(*streamSetup(sourcePath, sheetName)[:2])
+
+    def xmlEngine():
+        return iterateOnRows(*xmlSetup(sourcePath, sheetName)[:2])
+
+    report = []
+    reference = None
+    for engine, run in (
+        ("openpyxl", openpyxlEngine),
+        ("stream", streamEngine),
+        ("xml", xmlEngine),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        records = run()
+        elapsed = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if reference is None:
+            reference = records
+        report.append(
+            [engine, len(records), round(elapsed, 3), round(peak / 2**20, 1), records == reference]
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+
+    from tabulate import tabulate
+
+    sheet = input("Exact name of the sheet: ")
+    rows = compareEngines("docs/source/source_data.xlsx", sheet)
+    print(
+        tabulate(
+            rows,
+            ["Engine", "Records", "Seconds", "Peak MiB", "Matches openpyxl"],
+            tablefmt="grid",
+        )
+    )
@@ -0,0 +1,11 @@
+"""Shared pytest setup: the application modules live in scripts/ and import each
+other by bare name, so scripts/ goes on sys.path like `python scripts/main.py` does."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(ROOT, "scripts")
+for path in (ROOT, SCRIPTS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
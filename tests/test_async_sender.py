@@ -0,0 +1,116 @@
+"""Token bucket (simulated clock) and recipient grouping of the concurrent sender."""
+
+from async_sender import AdaptiveRate, TokenBucket, groupRecipients
+import async_sender
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+
+    async def sleep(seconds):
+        now[0] += max(seconds, 0)
+
+    monkeypatch.setattr(async_sender.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(async_sender.asyncio, "sleep", sleep)
+    return now
+
+
+def acquireTimes(bucket, clock, count):
+    async def run():
+        times = []
+        for _ in range(count):
+            await bucket.acquire()
+            times.append(clock[0])
+        return times
+
+    return asyncio.run(run())
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    times = acquireTimes(bucket, clock, 6)
+
+    assert times[:3] == [0.0, 0.0, 0.0]
+    assert times[3:] == pytest.approx([0.5, 1.0, 1.5])
+
+
+def test_invalid_bucket():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_batch_spends_one_token_per_recipient(clock):
+    bucket = TokenBucket(rate=2.0, burst=1)
+
+    async def run():
+        times = []
+        for recipients in (4, 1):
+            await bucket.acquire(recipients)
+            times.append(clock[0])
+        return times
+
+    # The 4-recipient batch goes out on a full bucket and leaves 3 tokens owed
+    assert asyncio.run(run()) == pytest.approx([0.0, 2.0])
+
+
+def test_pause_holds_tokens_until_retry_after(clock):
+    bucket = TokenBucket(rate=1.0, burst=5)
+
+    bucket.pause(10)
+    times = acquireTimes(bucket, clock, 2)
+
+    assert times == pytest.approx([10.0, 11.0])  # Nothing earned while paused: no burst after it
+
+
+def test_aimd_backs_off_once_per_episode_and_probes_up(clock):
+    bucket = TokenBucket(rate=2.0)
+    control = AdaptiveRate(bucket, minRate=0.5, maxRate=2.5, rateStep=0.5, probeEvery=2)
+
+    clock[0] = 1.0
+    control.throttled(startedAt=0.5)
+    control.throttled(startedAt=0.6)  # Same episode: started before the cut
+    assert bucket.rate == 1.0
+    assert (control.throttles, control.backoffs) == (2, 1)
+
+    for _ in range(6):
+        control.healthy(startedAt=2.0, latency=0.1)
+    assert bucket.rate == 2.5  # Capped at maxRate
+
+
+def test_aimd_recovers_only_to_starting_rate_by_default(clock):
+    bucket = TokenBucket(rate=2.0)
+    control = AdaptiveRate(bucket, rateStep=0.5, probeEvery=1)
+
+    control.throttled(startedAt=0.0)
+    for _ in range(10):
+        control.healthy(startedAt=1.0, latency=0.1)
+
+    assert bucket.rate == control.maxRate == 2.0
+
+
+def test_group_recipients_merges_identical_bodies_in_claim_order():
+    notice = "Maji yatakatika kesho."  # Same body for everyone
+    messages = [
+        ("A", {"Contact": "+255700000001", "Body": notice}),
+        ("B", {"Contact": "+255700000002", "Body": "Mpendwa B, Sh 500"}),
+        ("C", {"Contact": "+255700000003", "Body": notice}),
+        ("D", {"Contact": "+255700000004", "Body": "Mpendwa D, Sh 900"}),
+        ("E", {"Contact": "+255700000005", "Body": notice}),
+        ("F", {"Contact": "+255700000006", "Body": "Mpendwa F, Sh 700"}),
+    ]
+
+    groups = groupRecipients(messages, size=2)
+
+    assert [[name for name, _value in group] for group in groups] == [
+        ["A", "C"],  # Full at size 2
+        ["B"],  # Personalised bodies each get their own request
+        ["D"],
+        ["E"],  # Overflow of the first group, placed where E was claimed
+        ["F"],
+    ]
+    assert all(len({value["Body"] for _name, value in group}) == 1 for group in groups)
+    assert sorted(name for group in groups for name, _value in group) == list("ABCDEF")
@@ -0,0 +1,97 @@
+"""Billing store schema versioning and CSV synchronisation."""
+
+from billing_store import (
+    SCHEMA_VERSION,
+    loadPeriod,
+    savePeriod,
+    storeConnect,
+    syncPeriod,
+)
+from contextlib import closing
+from extracted_csv import BILLING_HEADERS
+from records import CustomerRecord
+import csv
+import os
+import pytest
+
+PERIOD = "January, 2026"
+ROWS = [
+    ["05-Jan-2026", "Jane Doe", "+255700000001", "s m s", "Lumo", "12", "2400", "0", "2400"],
+    ["06-Jan-2026", "John Doe", "+255700000002", "s m s", "Chanika", "8.5", "1700", "0", "1700"],
+]
+
+
+def writeCsv(path, rows, mtime=None):
+    with open(path, "w", newline="") as csvFile:
+        writer = csv.writer(csvFile)
+        writer.writerow(BILLING_HEADERS)
+        writer.writerows(rows)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / f"{PERIOD}.csv"), str(tmp_path / "billing.db")
+
+
+def test_schema_is_versioned(paths):
+    _csvPath, storePath = paths
+
+    with closing(storeConnect(storePath)) as connection:
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        tables = {
+            name for (name,) in connection.execute("SELECT name FROM sqlite_master")
+        }
+
+    assert version == SCHEMA_VERSION
+    assert {"billing", "sources"} <= tables
+
+
+def test_sync_imports_once_then_reimports_edited_csv(paths):
+    csvPath, storePath = paths
+    writeCsv(csvPath, ROWS, mtime=1_000_000_000)
+
+    assert syncPeriod(PERIOD, csvPath, storePath) == 2
+    assert syncPeriod(PERIOD, csvPath, storePath) is None  # Unchanged CSV
+
+    corrected = [ROWS[0][:8] + ["2000"], ROWS[1]]  # Same length, later mtime
+    writeCsv(csvPath, corrected, mtime=2_000_000_000)
+
+    assert syncPeriod(PERIOD, csvPath, storePath) == 2
+    records = loadPeriod(PERIOD, csvPath, storePath)
+    assert [(record.name, record.final) for record in records] == [
+        ("Jane Doe", 2000),
+        ("John Doe", 1700),
+    ]
+
+
+def test_missing_csv_keeps_stored_period(paths):
+    csvPath, storePath = paths
+    writeCsv(csvPath, ROWS)
+    syncPeriod(PERIOD, csvPath, storePath)
+    os.remove(csvPath)
+
+    assert syncPeriod(PERIOD, csvPath, storePath) is None
+    assert len(loadPeriod(PERIOD, csvPath, storePath)) == 2
+    with pytest.raises(FileNotFoundError):
+        syncPeriod("February, 2026", csvPath, storePath)
+
+
+def test_reextracting_after_deleting_the_csv_keeps_the_period(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # savePeriod() writes docs/results/<period>.csv
+    os.makedirs("docs/results")
+    csvPath = f"docs/results/{PERIOD}.csv"
+    records = [CustomerRecord.fromRow(row) for row in ROWS]
+
+    assert len(savePeriod(PERIOD, records)) == 2
+    assert syncPeriod(PERIOD) is None  # Extraction recorded the CSV it wrote
+
+    os.remove(csvPath)
+    os.remove(f"{csvPath}.idx")
+    assert savePeriod(PERIOD, records) == []  # Known to the store, CSV rebuilt
+
+    assert syncPeriod(PERIOD) is None
+    assert len(loadPeriod(PERIOD)) == 2
+    with open(csvPath, newline="") as csvFile:
+        assert list(csv.reader(csvFile))[1:] == ROWS
@@ -0,0 +1,58 @@
+"""Result CSV deduplication through the sidecar digest index."""
+
+from csv_index import loadIndex, rowDigest
+from extracted_csv import addRows, fileCreation
+import csv
+import os
+import pytest
+
+ROWS = [["01-Jan-2026", "Jane", "+255700000001"], ["01-Jan-2026", "John", None]]
+
+
+@pytest.fixture
+def csvPath(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # addRows() writes to docs/results/
+    os.makedirs("docs/results")
+    fileCreation("January", headers=["Reading Date", "Customer Name", "Contacts"])
+    return os.path.join("docs", "results", "January.csv")
+
+
+def readRows(csvPath):
+    with open(csvPath, newline="") as csvFile:
+        return list(csv.reader(csvFile))[1:]
+
+
+def test_repeated_appends_write_each_row_once(csvPath):
+    addRows("January", ROWS + ROWS[:1])
+    addRows("January", ROWS)
+    addRows("January", [["02-Jan-2026", "Jane", "+255700000001"]])
+
+    assert readRows(csvPath) == [
+        ["01-Jan-2026", "Jane", "+255700000001"],
+        ["01-Jan-2026", "John", ""],
+        ["02-Jan-2026", "Jane", "+255700000001"],
+    ]
+
+
+def test_index_is_read_once_per_process(csvPath):
+    addRows("January", ROWS)
+    digests = loadIndex(csvPath)
+
+    addRows("January", [["02-Jan-2026", "Jane", "+255700000001"]])
+
+    assert loadIndex(csvPath) is digests  # Appended to in memory, not reloaded
+    assert rowDigest(["02-Jan-2026", "Jane", "+255700000001"]) in digests
+
+
+def test_same_size_edit_rebuilds_index(csvPath):
+    addRows("January", ROWS)
+    with open(csvPath) as csvFile:
+        text = csvFile.read()
+    with open(csvPath, "w") as csvFile:
+        csvFile.write(text.replace("Jane", "Jean"))  # Same length
+    stat = os.stat(csvPath)
+    os.utime(csvPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    addRows("January", ROWS)
+
+    assert [row[1] for row in readRows(csvPath)] == ["Jean", "John", "Jane"]
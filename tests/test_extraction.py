@@ -0,0 +1,55 @@
+"""Extraction engines agree with each other, and incremental extraction with both."""
+
+from benchmarks.workbook import SHEET_NAME, generateWorkbook
+from data_extraction import envSetup, iterateOnBoxes, iterateOnRows, streamSetup
+from incremental_extraction import diffBoxes, loadState, saveState
+from xml_extraction import xmlSetup
+import pytest
+
+BOXES = 50  # Not a multiple of BOX_COLUMNS, so the last band is partial
+
+
+@pytest.fixture(scope="module")
+def workbookPath(tmp_path_factory):
+    return generateWorkbook(str(tmp_path_factory.mktemp("wb") / "tns.xlsx"), BOXES)
+
+
+@pytest.fixture(scope="module")
+def reference(workbookPath):
+    workSheet, _name = envSetup(workbookPath, SHEET_NAME)
+    return iterateOnBoxes(workSheet["A1"])
+
+
+def test_openpyxl_finds_every_box(reference):
+    assert len(reference) == BOXES
+    assert {record.location for record in reference} == {"Lumo", "Chanika"}
+
+
+@pytest.mark.parametrize("setup", [streamSetup, xmlSetup], ids=["stream", "xml"])
+def test_engine_matches_openpyxl(workbookPath, reference, setup):
+    rowBuffer, boxes, sheetName = setup(workbookPath, SHEET_NAME)
+
+    assert sheetName == SHEET_NAME
+    assert iterateOnRows(rowBuffer, boxes) == reference
+
+
+def test_incremental_reextracts_only_changed_amounts(workbookPath, reference, tmp_path):
+    rowBuffer, boxes, _name = xmlSetup(workbookPath, SHEET_NAME)
+    _records, state, _changes, _parsed, _updated = diffBoxes(rowBuffer, boxes, {})
+    statePath = str(tmp_path / "state.json")
+    saveState(statePath, {"sheet": SHEET_NAME, "boxes": state})
+    previous = loadState(statePath)["boxes"]
+
+    # Next period: every final bill moves, one customer changes number
+    rowBuffer = [list(row) for row in rowBuffer]
+    for rowIdx, colIdx, _location in boxes:
+        rowBuffer[rowIdx + 10][colIdx + 1] += 1000
+    rowIdx, colIdx, _location = boxes[0]
+    rowBuffer[rowIdx - 1][colIdx + 1] = "0799000000"
+
+    records, _state, changes, parsed, updated = diffBoxes(rowBuffer, boxes, previous)
+
+    assert records == iterateOnRows(rowBuffer, boxes)
+    assert [change[0] for change in changes] == ["changed"]
+    assert parsed == 1 + sum(record.name is None for record in reference)
+    assert parsed + updated == BOXES
@@ -0,0 +1,120 @@
+"""JSON journal storage: replay, recovery from an interrupted append, Store."""
+
+from jsonSt import (
+    Store,
+    addJsonData,
+    getJsonData,
+    journalPath,
+    jsonCompact,
+    jsonCreate,
+    readJournal,
+    storeLock,
+)
+import json
+import jsonSt
+import multiprocessing
+import os
+import pytest
+
+
+@pytest.fixture
+def storePath(tmp_path):
+    path = str(tmp_path / "delivery.json")
+    jsonCreate(path)
+    return path
+
+
+def test_journal_replays_over_snapshot(storePath):
+    addJsonData(storePath, "Jane", {"Body": "old"})
+    addJsonData(storePath, "Jane", {"Body": "new"})
+
+    assert getJsonData(storePath) == {"Jane": {"Body": "new"}}
+    assert jsonCompact(storePath) == 2
+    with open(storePath) as snapshot:
+        assert json.load(snapshot) == {"Jane": {"Body": "new"}}
+    with open(journalPath(storePath)) as journal:
+        assert journal.read() == ""
+
+
+def test_torn_final_line_is_dropped_and_truncated(storePath):
+    addJsonData(storePath, "Jane", {"Body": "kept"})
+    with open(journalPath(storePath), "ab") as journal:
+        journal.write(b'{"set": "John", "value": {"Bo')  # Killed mid-append
+
+    assert getJsonData(storePath) == {"Jane": {"Body": "kept"}}
+    with open(journalPath(storePath), "rb") as journal:
+        assert journal.read().endswith(b"}\n")
+
+
+def test_unlocked_read_ignores_torn_line_without_truncating(storePath):
+    addJsonData(storePath, "Jane", {"Body": "kept"})
+    with open(journalPath(storePath), "ab") as journal:
+        journal.write(b'{"set": "John", "value": {"Bo')  # Possibly still being written
+
+    assert readJournal(storePath) == [{"set": "Jane", "value": {"Body": "kept"}}]
+    with open(journalPath(storePath), "rb") as journal:
+        assert journal.read().endswith(b'{"Bo')
+
+    with storeLock(storePath):
+        readJournal(storePath)
+    with open(journalPath(storePath), "rb") as journal:
+        assert journal.read().endswith(b"}\n")
+
+
+def test_store_lock_is_reentrant(storePath):
+    with storeLock(storePath):
+        with storeLock(storePath):
+            addJsonData(storePath, "Jane", {"Body": "nested"})  # Locks a third time
+        assert getJsonData(storePath) == {"Jane": {"Body": "nested"}}
+
+
+def appendKeys(storePath, worker):
+    for index in range(150):
+        addJsonData(storePath, f"{worker}-{index}", {"Body": "x" * 40})
+
+
+def test_concurrent_appends_survive_compaction(storePath, monkeypatch):
+    monkeypatch.setattr(jsonSt, "COMPACT_BYTES", 2**11)  # Compact every few appends
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=appendKeys, args=(storePath, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert len(getJsonData(storePath)) == 4 * 150
+
+
+def test_append_after_torn_line_stays_parseable(storePath):
+    with open(journalPath(storePath), "ab") as journal:
+        journal.write(b'{"set": "John"')
+
+    addJsonData(storePath, "Jane", {"Body": "after crash"})
+
+    assert getJsonData(storePath) == {"Jane": {"Body": "after crash"}}
+
+
+def test_corrupt_complete_line_is_an_error(storePath):
+    with open(journalPath(storePath), "ab") as journal:
+        journal.write(b"not json\n")
+
+    with pytest.raises(SystemExit):
+        getJsonData(storePath)
+
+
+def test_store_flushes_snapshot_and_clears_journal(storePath):
+    addJsonData(storePath, "Jane", {"Body": "journaled"})
+
+    with Store(storePath, flushEvery=2) as store:
+        store["John"] = {"Body": "first"}
+        assert os.path.getsize(journalPath(storePath)) > 0  # Not flushed yet
+        store["Juma"] = {"Body": "second"}
+        assert os.path.getsize(journalPath(storePath)) == 0
+
+    assert list(getJsonData(storePath)) == ["Jane", "John", "Juma"]
+
+
+def test_store_refuses_send_queue_files(tmp_path):
+    with pytest.raises(ValueError):
+        Store(str(tmp_path / "data.json"))
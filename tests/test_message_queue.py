@@ -0,0 +1,103 @@
+"""Lease-based message queue shared by concurrent senders."""
+
+from jsonSt import addJsonBatch, getJsonData
+from message_queue import UNKNOWN, MessageQueue
+import message_queue
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(message_queue.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def directory(tmp_path):
+    MessageQueue(str(tmp_path))  # Creates the stores
+    addJsonBatch(
+        str(tmp_path / "data.json"),
+        [(name, {"Contact": "+255700000000", "Body": name}) for name in "ABC"],
+    )
+    return str(tmp_path)
+
+
+def test_leases_are_exclusive_until_they_expire(directory, clock):
+    first = MessageQueue(directory, leaseSeconds=300, workerId="first")
+    second = MessageQueue(directory, leaseSeconds=300, workerId="second")
+
+    assert [name for name, _value in first.claim(2)] == ["A", "B"]
+    assert [name for name, _value in second.claim(5)] == ["C"]
+
+    clock[0] += 301  # first died without acknowledging A and B
+    assert [name for name, _value in second.claim(5)] == ["A", "B", "C"]
+
+
+def test_ack_dequeues_and_release_frees(directory, clock):
+    first = MessageQueue(directory, workerId="first")
+    second = MessageQueue(directory, workerId="second")
+
+    first.claim(2)
+    first.ack("A", {"smsBatchId": "b1", "Contact": "+255700000000", "Status": 201})
+    first.release(["B"])
+
+    assert [name for name, _value in second.claim(5)] == ["B", "C"]
+    assert "A" not in getJsonData(second.dataPath)
+    assert getJsonData(second.sentPath)["A"]["smsBatchId"] == "b1"
+
+
+def test_claim_skips_excluded_own_leases(directory, clock):
+    worker = MessageQueue(directory, workerId="run")
+
+    worker.claim(1)
+    assert [name for name, _value in worker.claim(5, exclude={"A"})] == ["B", "C"]
+
+
+def test_held_message_stays_out_until_requeued(directory, clock):
+    worker = MessageQueue(directory, workerId="run")
+    other = MessageQueue(directory, workerId="other")
+
+    worker.claim(1)
+    value = worker.hold("A", {"smsBatchId": None, "Contact": "+255700000000", "Status": UNKNOWN})
+
+    assert value["Body"] == "A"
+    assert getJsonData(worker.sentPath)["A"]["Status"] == UNKNOWN
+    clock[0] += 10_000  # No lease left to expire: the message is not claimable
+    assert [name for name, _value in other.claim(5)] == ["B", "C"]
+
+    worker.requeue("A", value)
+    assert "A" not in getJsonData(worker.sentPath)
+    assert [name for name, _value in worker.claim(5)] == ["A"]
+
+
+def test_renew_extends_only_own_leases(directory, clock):
+    first = MessageQueue(directory, leaseSeconds=300, workerId="first")
+    second = MessageQueue(directory, leaseSeconds=300, workerId="second")
+    first.claim(2)
+
+    clock[0] += 200
+    assert first.renew(["A", "B", "C"]) == 2  # C was never claimed by first
+    clock[0] += 200  # Past the original expiry, within the renewed one
+    assert [name for name, _value in second.claim(5)] == ["C"]
+
+
+def test_compact_folds_queue_journals(directory, clock):
+    queue = MessageQueue(directory, workerId="first")
+    queue.claim(1)
+    queue.ack("A", {"smsBatchId": "b1", "Contact": "+255700000000", "Status": 201})
+
+    counts = queue.compact()
+    assert counts == {queue.dataPath: 4, queue.sentPath: 1, queue.leasePath: 2}
+    assert queue.compact() == dict.fromkeys(counts, 0)
+    assert [name for name, _value in queue.claim(5)] == ["B", "C"]
+
+
+def test_enqueue_and_drop_several(directory, clock):
+    queue = MessageQueue(directory, workerId="first")
+    queue.enqueue([("D", {"Contact": "+255700000000", "Body": "D"})])
+    queue.claim(1)
+
+    queue.drop("A", "C", "Z")  # A is leased, Z was never queued
+    assert [name for name, _value in queue.claim(5)] == ["B", "D"]
+    assert set(getJsonData(queue.leasePath)) == {"B", "D"}
@@ -0,0 +1,38 @@
+"""Locale-free number formatting: same strings as the old en_GB locale output."""
+
+from number_format import formatNumbers
+import locale
+import pytest
+
+CASES = [
+    (0, "0"),
+    (999, "999"),
+    (5000, "5,000"),
+    (-1857, "-1,857"),
+    (1234567890, "1,234,567,890"),
+    (0.0, "0.0"),
+    (5000.0, "5,000.0"),  # Floats keep their decimal even when whole
+    (1234.56, "1,234.6"),
+    (-1234.56, "-1,234.6"),
+    (999.96, "1,000.0"),  # Rounding carries into a new group
+    (9876543.21, "9,876,543.2"),
+]
+
+
+@pytest.mark.parametrize("num, expected", CASES, ids=[repr(num) for num, _ in CASES])
+def test_matches_en_gb_strings(num, expected):
+    assert formatNumbers(num) == expected
+
+
+def test_matches_en_gb_locale_where_installed():
+    previous = locale.setlocale(locale.LC_NUMERIC)
+    try:
+        locale.setlocale(locale.LC_NUMERIC, "en_GB.UTF-8")
+    except locale.Error:
+        pytest.skip("en_GB.UTF-8 locale not installed")
+    try:
+        for num, _expected in CASES:
+            pattern = "%.1f" if isinstance(num, float) else "%d"
+            assert formatNumbers(num) == locale.format_string(pattern, num, grouping=True)
+    finally:
+        locale.setlocale(locale.LC_NUMERIC, previous)
@@ -0,0 +1,45 @@
+"""Resuming a stopped send run whose last request got no answer."""
+
+from jsonSt import addJsonData, getJsonData
+from main import reconcileRun
+from membership import MembershipIndex
+from message_queue import UNKNOWN, MessageQueue
+from send_runs import SendRun
+import pytest
+
+CONTACT = "+255700000001"
+
+
+@pytest.fixture
+def stopped(tmp_path):
+    """A run that stopped during the POST for Jane (in flight, no smsBatchId)."""
+    queue = MessageQueue(str(tmp_path), workerId="run-1")
+    addJsonData(queue.dataPath, "Jane", {"Name": "Jane", "Contact": CONTACT, "Body": "Bill"})
+    queue.claim(1)
+
+    run = SendRun.start(1, str(tmp_path / "runs"))
+    run.mark("Jane", "in-flight", Contact=CONTACT)
+    return run, queue, str(tmp_path)
+
+
+def test_unanswered_request_is_held_not_resent(stopped):
+    run, queue, directory = stopped
+
+    reconcileRun(run, queue, client=None)
+
+    assert run.messages("unknown")["Jane"]["Body"] == "Bill"
+    assert getJsonData(queue.sentPath)["Jane"]["Status"] == UNKNOWN
+    assert "Jane" not in getJsonData(queue.dataPath)
+    index = MembershipIndex.load(directory, failedCsv=f"{directory}/failed.csv")
+    assert not index.shouldSend("Jane", CONTACT)  # fill does not queue her again
+
+
+def test_resend_unknown_queues_held_message_again(stopped):
+    run, queue, _directory = stopped
+    reconcileRun(run, queue, client=None)
+
+    reconcileRun(run, queue, client=None, resendUnknown=True)
+
+    assert getJsonData(queue.dataPath)["Jane"]["Body"] == "Bill"
+    assert "Jane" not in getJsonData(queue.sentPath)
+    assert run.messages("failed")["Jane"]["error"] == "Resent on request"
@@ -0,0 +1,69 @@
+"""Error classes of the send retry policy and the dead-letter store."""
+
+from retry_queue import (
+    FATAL,
+    PERMANENT,
+    RETRYABLE,
+    UNCERTAIN,
+    backoffDelay,
+    clearDeadLetters,
+    deadLetter,
+    deadLetters,
+    errorClass,
+)
+import jsonSt
+import multiprocessing
+import pytest
+import requests
+
+
+def httpError(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(str(status), response=response)
+
+
+@pytest.mark.parametrize(
+    "Error, kind",
+    [
+        (requests.ConnectionError("refused"), RETRYABLE),
+        (requests.ConnectTimeout("connect"), RETRYABLE),  # Never reached the gateway
+        (requests.ReadTimeout("read"), UNCERTAIN),  # POST sent, no answer
+        (httpError(429), RETRYABLE),
+        (httpError(502), RETRYABLE),
+        (httpError(401), FATAL),
+        (httpError(400), PERMANENT),
+        (KeyError("smsBatchId"), FATAL),  # Unexpected: would hit every message
+    ],
+    ids=["connection", "connect-timeout", "read-timeout", "429", "502", "401", "400", "bug"],
+)
+def test_error_class(Error, kind):
+    assert errorClass(Error) == kind
+
+
+def test_backoff_is_capped():
+    assert all(0 <= backoffDelay(attempt, base=1, cap=4) <= 4 for attempt in range(1, 10))
+
+
+def writeDeadLetters(storagePath, worker):
+    for index in range(100):
+        value = {"Contact": "+255700000000", "Body": "x" * 40}
+        deadLetter(f"{worker}-{index}", value, httpError(400), 1, storagePath)
+
+
+def test_concurrent_dead_letters_and_clears(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonSt, "COMPACT_BYTES", 2**12)  # Compact every few writes
+    storagePath = str(tmp_path / "dead_letter.json")
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=writeDeadLetters, args=(storagePath, w)) for w in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert len(deadLetters(storagePath)) == 4 * 100
+    assert clearDeadLetters(["0-0", "0-1", "missing"], storagePath) == 2
+    assert len(deadLetters(storagePath)) == 4 * 100 - 2
@@ -0,0 +1,94 @@
+"""fill: compiled templates and queue keys of customers sharing a name."""
+
+from conftest import ROOT
+from datetime import datetime
+from extracted_csv import BILLING_HEADERS
+from jsonSt import addJsonData, getJsonData
+from templates import TemplateRegistry, runValues, tempFilling
+import csv
+import glob
+import os
+import pytest
+
+PERIOD = "January, 2026"
+TEMPLATE_PATHS = sorted(glob.glob(os.path.join(ROOT, "message_templates/*/smart_text.txt")))
+RUN = {
+    **runValues(datetime(2026, 1, 1)),
+    "AZAMPESA": "123456",  # Fixed instead of the .env payment numbers
+    "LIPA_NAMBA": "654321",
+    "TigoPesa": "0712000000",
+    "RECIEVER_NAME": "TNS Water Services",
+}
+CUSTOMER = {
+    "Customer Name": "Jane Doe",
+    "Liters Used": "12,500",
+    "Net Charge": "2,400.5",
+    "Adjustments": "0",
+    "Final Bill": "2,400.5",
+}
+
+
+@pytest.fixture
+def workDir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # fill uses paths relative to the repository root
+    os.makedirs("docs/results")
+    os.makedirs("json_storage")
+    os.symlink(os.path.join(ROOT, "message_templates"), "message_templates")
+
+    rows = [
+        ["05-Jan-2026", "Jane", "+255700000001", "s m s", "Lumo", "10", "500", "0", "500"],
+        ["05-Jan-2026", "John", "+255700000002", "s m s", "Lumo", "20", "900", "0", "900"],
+        ["05-Jan-2026", "Jane", "+255700000003", "s m s", "Chanika", "30", "700", "0", "700"],
+    ]
+    with open(f"docs/results/{PERIOD}.csv", "w", newline="") as csvFile:
+        writer = csv.writer(csvFile)
+        writer.writerow(BILLING_HEADERS)
+        writer.writerows(rows)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "templatePath", TEMPLATE_PATHS, ids=lambda path: os.path.basename(os.path.dirname(path))
+)
+def test_compiled_template_matches_str_format(templatePath):
+    location = os.path.basename(os.path.dirname(templatePath))
+    with open(templatePath) as f:
+        expected = f.read().format(**RUN, **CUSTOMER)
+
+    registry = TemplateRegistry(RUN, os.path.join(ROOT, "message_templates"))
+    assert registry.render(location, CUSTOMER).encode() == expected.encode()
+
+
+def test_unknown_placeholder_fails_at_load(tmp_path):
+    os.makedirs(tmp_path / "Lumo")
+    with open(TEMPLATE_PATHS[0]) as f:
+        text = f.read()
+    with open(tmp_path / "Lumo" / "smart_text.txt", "w") as f:
+        f.write(text + "\nSalio: {Balance}")  # Not a customer or run field
+
+    with pytest.raises(ValueError, match="Balance"):
+        TemplateRegistry(RUN, str(tmp_path))
+
+
+def fill():
+    tempFilling(
+        datetime(2026, 1, 1), f"docs/results/{PERIOD}.csv", "docs/results/failed.csv", 1
+    )
+    return getJsonData("json_storage/data.json")
+
+
+def test_first_fill_keys_repeated_names_by_contact(workDir):
+    queue = fill()
+
+    assert sorted(queue) == ["Jane (+255700000001)", "Jane (+255700000003)", "John"]
+    assert queue["Jane (+255700000003)"]["Contact"] == "+255700000003"
+
+
+def test_refill_drops_stale_bare_name_entries(workDir):
+    addJsonData("json_storage/data.json", "Jane", {"Name": "Jane", "Contact": "+255700000003"})
+
+    assert sorted(fill()) == sorted(fill()) == [
+        "Jane (+255700000001)",
+        "Jane (+255700000003)",
+        "John",
+    ]